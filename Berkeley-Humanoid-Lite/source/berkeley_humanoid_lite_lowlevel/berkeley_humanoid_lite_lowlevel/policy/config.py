@@ -8,6 +8,8 @@ class Cfg(DictConfig):
 
     # === Policy configurations ===
     policy_checkpoint_path: str
+    # checkpoints to cycle through on SIGUSR1 (optional)
+    policy_checkpoint_paths: list[str]
 
     # === Networking configurations ===
     ip_robot_addr: str
@@ -43,6 +45,32 @@ class Cfg(DictConfig):
     action_scale: float
     action_limit_lower: float
     action_limit_upper: float
+    # "none", "hold", "linear" or "cubic" upsampling of the actions to control_dt (optional)
+    action_interpolation: str
+
+    # === Sensor configurations (optional) ===
+    imu_type: str
+    # age of the IMU samples in the observations in seconds, defaults to one IMU sample period plus the transfer time
+    imu_sample_delay: float
+
+    # === Logging configurations (optional) ===
+    telemetry_path: str
+    telemetry_compress: bool
+
+    # === Multiprocess configurations (optional) ===
+    io_cpu: int
+    policy_cpu: int
+
+    # === Inference configurations (optional) ===
+    policy_backend: str
+    policy_num_threads: int
+    policy_use_quantized: bool
+    # run the policy on a worker thread, overlapped with the joint I/O, with one policy_dt of extra action delay
+    pipelined_inference: bool
+    # inference time budget per policy tick in seconds, and the action used when it is exceeded
+    inference_budget: float
+    inference_fallback: str
+    inference_watchdog: bool
 
     @staticmethod
     def from_arguments() -> DictConfig | ListConfig:
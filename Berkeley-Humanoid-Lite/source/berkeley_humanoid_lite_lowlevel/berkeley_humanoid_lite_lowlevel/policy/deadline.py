@@ -0,0 +1,177 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Inference Deadline Monitor
+
+Runs the policy under a per-tick time budget. When the inference does not finish within
+the budget, a fallback action is used for the tick instead, so a slow inference (page
+faults, thermal throttling, a background process) cannot hold the control loop.
+
+Fallback actions:
+    "hold": keep the last actions
+    "default": move the actions towards the default joint positions a bit on every missed tick
+    "extrapolate": continue the last change of the actions for a few ticks, then hold
+"""
+
+import time
+
+import numpy as np
+
+from berkeley_humanoid_lite_lowlevel.policy.inference_worker import InferenceWorker
+from berkeley_humanoid_lite_lowlevel.policy.rl_controller import RlController
+
+
+class FallbackMode:
+    HOLD = "hold"
+    DEFAULT = "default"
+    EXTRAPOLATE = "extrapolate"
+
+
+class DeadlineMonitor:
+    """
+    Policy runner with an inference time budget and a fallback action.
+
+    With the watchdog, the inference runs on an InferenceWorker and the control thread
+    waits for it at most `budget` seconds, so the tick time stays bounded. An inference
+    that overruns keeps running in the background, its result is dropped, and new
+    observations are only submitted once it has finished. Without the watchdog, the
+    inference runs on the calling thread and cannot be interrupted: overruns are counted
+    and the late actions are still used.
+
+    The fallback actions are committed to the controller before the next inference, so
+    the policy observes the actions that were sent as its previous actions.
+
+    Args:
+        controller (RlController): Controller with a loaded policy
+        n_observations (int): Size of the lowlevel state vector
+        budget (float): Inference time budget, in seconds
+        fallback (str): Fallback action, see FallbackMode
+        use_watchdog (bool): Run the inference on a supervised worker thread
+        blend_rate (float): Fraction of the distance to the default joint positions covered on every missed tick
+        max_extrapolation_steps (int): Number of consecutive missed ticks the actions are extrapolated for
+        stall_timeout (float): Time after which a running inference is reported as stalled, in seconds
+    """
+    def __init__(
+        self,
+        controller: RlController,
+        n_observations: int,
+        budget: float,
+        fallback: str = FallbackMode.HOLD,
+        use_watchdog: bool = True,
+        blend_rate: float = 0.05,
+        max_extrapolation_steps: int = 2,
+        stall_timeout: float = 0.5,
+    ):
+        if fallback not in (FallbackMode.HOLD, FallbackMode.DEFAULT, FallbackMode.EXTRAPOLATE):
+            raise ValueError(f"Unknown fallback action: {fallback}")
+
+        self.controller = controller
+        self.budget = budget
+        self.fallback = fallback
+        self.blend_rate = np.float32(blend_rate)
+        self.max_extrapolation_steps = max_extrapolation_steps
+        self.stall_timeout = stall_timeout
+
+        n_actions = controller.n_actions
+        self.default_actions = controller.default_joint_positions
+
+        # actions of the current tick, and the change from the previous tick
+        self.actions = self.default_actions.copy()
+        self.action_deltas = np.zeros((n_actions, ), dtype=np.float32)
+        self._new_actions = np.zeros((n_actions, ), dtype=np.float32)
+        self._scratch = np.zeros((n_actions, ), dtype=np.float32)
+
+        self.worker = None
+        if use_watchdog:
+            self.worker = InferenceWorker(controller, n_observations, n_actions)
+            self.worker.start()
+        # time.perf_counter() when the running inference was submitted
+        self._submit_time = 0.0
+        self._is_stall_reported = False
+
+        self.n_updates: int = 0
+        self.n_deadline_misses: int = 0
+        self.n_consecutive_misses: int = 0
+        self.max_inference_time: float = 0.0
+
+    def stop(self, timeout: float | None = None) -> None:
+        if self.worker:
+            self.worker.stop(timeout)
+
+    def _infer(self, observations: np.ndarray) -> bool:
+        """
+        Run the policy into `_new_actions`.
+
+        Returns:
+            bool: True if the actions were computed within the budget
+        """
+        if self.worker is None:
+            self._commit_fallback()
+            start_time = time.perf_counter()
+            self._new_actions[:] = self.controller.update(observations)
+            inference_time = time.perf_counter() - start_time
+            self.max_inference_time = max(self.max_inference_time, inference_time)
+            # the late actions are still the newest ones
+            if inference_time > self.budget:
+                self.n_deadline_misses += 1
+            return True
+
+        if self.worker.is_busy:
+            # an overrunning inference from an earlier tick is still running
+            stalled_time = time.perf_counter() - self._submit_time
+            if stalled_time > self.stall_timeout and not self._is_stall_reported:
+                print(f"Warning: policy inference stalled for {stalled_time:.2f} s")
+                self._is_stall_reported = True
+            return False
+
+        self._is_stall_reported = False
+        # the worker is idle, so an overrunning inference can no longer overwrite the committed actions
+        self._commit_fallback()
+        self._submit_time = time.perf_counter()
+        self.worker.submit(observations)
+        is_done = self.worker.wait(self._new_actions, timeout=self.budget)
+        if is_done:
+            self.max_inference_time = max(self.max_inference_time, self.worker.inference_time)
+        return is_done
+
+    def _commit_fallback(self) -> None:
+        """
+        Feed the fallback actions sent on the last tick back to the policy as its previous actions.
+        """
+        if self.n_consecutive_misses > 0:
+            self.controller.commit_actions(self.actions)
+
+    def _apply_fallback(self) -> None:
+        match self.fallback:
+            case FallbackMode.HOLD:
+                pass
+            case FallbackMode.DEFAULT:
+                np.subtract(self.default_actions, self.actions, out=self._scratch)
+                self._scratch *= self.blend_rate
+                self.actions += self._scratch
+            case FallbackMode.EXTRAPOLATE:
+                if self.n_consecutive_misses <= self.max_extrapolation_steps:
+                    self.actions += self.action_deltas
+
+    def update(self, robot_observations: np.ndarray) -> np.ndarray:
+        """
+        Run the policy within the budget, or fall back.
+
+        Args:
+            robot_observations (np.ndarray): Observations from the robot low-level controller
+
+        Returns:
+            np.ndarray: Actions to send to the robot, overwritten by the next update
+        """
+        self.n_updates += 1
+
+        if self._infer(robot_observations):
+            np.subtract(self._new_actions, self.actions, out=self.action_deltas)
+            self.actions[:] = self._new_actions
+            self.n_consecutive_misses = 0
+        else:
+            self.n_deadline_misses += 1
+            self.n_consecutive_misses += 1
+            self._apply_fallback()
+
+        return self.actions
@@ -0,0 +1,129 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Inference Worker
+
+Runs the policy on a worker thread, so that the inference of one tick overlaps with the
+CAN and IMU I/O of the control loop.
+
+In the pipelined control loop, the observations of tick k are submitted to the worker,
+the actions computed from the observations of tick k - 1 are sent to the joints while
+the worker runs, and the actions of tick k are collected at the start of tick k + 1.
+Every action is therefore applied one policy period later than in the sequential loop.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from berkeley_humanoid_lite_lowlevel.policy.rl_controller import RlController
+
+
+class InferenceWorker:
+    """
+    Thread that runs `RlController.update` on submitted observations.
+
+    ONNX Runtime and the CAN sockets release the interpreter lock while they wait, so the
+    inference and the I/O of the control thread run concurrently.
+
+    Args:
+        controller (RlController): Controller with a loaded policy
+        n_observations (int): Size of the lowlevel state vector
+        n_actions (int): Size of the action vector
+    """
+    def __init__(self, controller: RlController, n_observations: int, n_actions: int):
+        self.controller = controller
+
+        self.observations = np.zeros((n_observations, ), dtype=np.float32)
+        self.actions = np.zeros((n_actions, ), dtype=np.float32)
+
+        self._request = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self.is_stopped = threading.Event()
+
+        # duration of the last inference, in seconds
+        self.inference_time: float = 0.0
+        self.n_inferences: int = 0
+        # exception raised by the policy, which ends the worker
+        self.exception: Exception | None = None
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def is_busy(self) -> bool:
+        return not self._done.is_set()
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop the worker after the running inference.
+
+        Args:
+            timeout (float | None): Time to wait for the running inference, in seconds. None to wait until it finishes.
+        """
+        self.is_stopped.set()
+        self._request.set()
+        self.thread.join(timeout)
+
+    def submit(self, observations: np.ndarray) -> None:
+        """
+        Start the inference on a copy of the observations.
+
+        Args:
+            observations (np.ndarray): Lowlevel states of shape (n_observations, )
+
+        Raises:
+            RuntimeError: If the previous inference has not finished, or the worker has failed
+        """
+        if self.exception is not None:
+            raise RuntimeError("the inference worker has failed") from self.exception
+        if self.is_busy:
+            raise RuntimeError("the previous inference has not finished")
+        self.observations[:] = observations
+        self._done.clear()
+        self._request.set()
+
+    def wait(self, out: np.ndarray, timeout: float | None = None) -> bool:
+        """
+        Wait for the submitted inference and copy its actions.
+
+        Args:
+            out (np.ndarray): Actions of shape (n_actions, )
+            timeout (float | None): Time to wait, in seconds. None to wait until the inference finishes.
+
+        Returns:
+            bool: False if the inference did not finish in time, `out` is left unchanged
+
+        Raises:
+            Exception: The exception raised by the policy, if the inference failed
+        """
+        if not self._done.wait(timeout):
+            return False
+        if self.exception is not None:
+            raise self.exception
+        out[:] = self.actions
+        return True
+
+    def _run(self) -> None:
+        while not self.is_stopped.is_set():
+            self._request.wait()
+            self._request.clear()
+            if self.is_stopped.is_set():
+                break
+
+            start_time = time.perf_counter()
+            try:
+                self.actions[:] = self.controller.update(self.observations)
+            except Exception as e:
+                # hand the exception to the control thread instead of leaving it waiting
+                self.exception = e
+                self._done.set()
+                break
+            self.inference_time = time.perf_counter() - start_time
+            self.n_inferences += 1
+
+            self._done.set()
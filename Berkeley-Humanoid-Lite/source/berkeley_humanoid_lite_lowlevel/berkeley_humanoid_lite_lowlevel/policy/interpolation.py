@@ -0,0 +1,135 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Action Interpolation
+
+Upsamples the policy actions from `policy_dt` to `control_dt`, so that the actuators get
+a new, smoothly changing setpoint on every control tick instead of a step change on
+every policy tick.
+
+After every policy action, the setpoint moves from the previous action to the new one
+over one policy period, and reaches it on the last control tick of the period. This
+adds up to one policy period of delay to the actions.
+"""
+
+import math
+
+import numpy as np
+
+
+class ActionInterpolator:
+    """
+    Interpolates and low-pass filters the policy actions at the control rate.
+
+    Every setpoint is a weighted sum of the last three actions, so sampling runs without
+    allocating:
+        "hold": the last action
+        "linear": a straight line from the previous action to the last action
+        "cubic": a Catmull-Rom segment from the previous action to the last action, with
+            the tangent at the previous action taken from the action before it
+
+    Args:
+        n_actions (int): Size of the action vector
+        policy_dt (float): Policy period, in seconds
+        control_dt (float): Control period, in seconds
+        mode (str): "hold", "linear" or "cubic"
+        cutoff_freq (float | None): Cutoff frequency of the first-order low-pass filter, in Hz. None to disable.
+    """
+    def __init__(
+        self,
+        n_actions: int,
+        policy_dt: float,
+        control_dt: float,
+        mode: str = "linear",
+        cutoff_freq: float | None = None,
+    ):
+        if mode not in ("hold", "linear", "cubic"):
+            raise ValueError(f"Unknown interpolation mode: {mode}")
+
+        self.mode = mode
+        # number of control ticks per policy tick
+        self.decimation = max(1, round(policy_dt / control_dt))
+
+        if cutoff_freq:
+            self.alpha = np.float32(control_dt / (control_dt + 1.0 / (2.0 * math.pi * cutoff_freq)))
+        else:
+            self.alpha = np.float32(1.0)
+
+        # the last three actions, from the oldest to the newest
+        self.knots = np.zeros((3, n_actions), dtype=np.float32)
+        self.coefficients = np.zeros((3, ), dtype=np.float32)
+        self.filtered = np.zeros((n_actions, ), dtype=np.float32)
+        self._scratch = np.zeros((n_actions, ), dtype=np.float32)
+
+        # control ticks since the last action
+        self.phase = 0
+        self.is_initialized = False
+
+    def reset(self, actions: np.ndarray) -> None:
+        """
+        Hold the given actions, without any transition.
+
+        Args:
+            actions (np.ndarray): Actions of shape (n_actions, )
+        """
+        self.knots[:] = actions
+        self.filtered[:] = actions
+        self.phase = 0
+        self.is_initialized = True
+
+    def push(self, actions: np.ndarray) -> None:
+        """
+        Start the transition to a new policy action.
+
+        Args:
+            actions (np.ndarray): Actions of shape (n_actions, )
+        """
+        if not self.is_initialized:
+            self.reset(actions)
+            return
+
+        self.knots[0] = self.knots[1]
+        self.knots[1] = self.knots[2]
+        self.knots[2] = actions
+        self.phase = 0
+
+    def sample(self, out: np.ndarray) -> np.ndarray:
+        """
+        Compute the setpoint of the next control tick.
+
+        Args:
+            out (np.ndarray): Setpoint of shape (n_actions, ), float32
+
+        Returns:
+            np.ndarray: Setpoint
+        """
+        self.phase = min(self.phase + 1, self.decimation)
+        t = self.phase / self.decimation
+
+        match self.mode:
+            case "hold":
+                c0, c1, c2 = 0.0, 0.0, 1.0
+            case "linear":
+                c0, c1, c2 = 0.0, 1.0 - t, t
+            case "cubic":
+                # Hermite basis with tangents (p2 - p0) / 2 at p1 and (p2 - p1) at p2
+                t2 = t * t
+                t3 = t2 * t
+                h00 = 2.0 * t3 - 3.0 * t2 + 1.0
+                h10 = t3 - 2.0 * t2 + t
+                h01 = -2.0 * t3 + 3.0 * t2
+                h11 = t3 - t2
+                c0, c1, c2 = -0.5 * h10, h00 - h11, h01 + 0.5 * h10 + h11
+
+        self.coefficients[0] = c0
+        self.coefficients[1] = c1
+        self.coefficients[2] = c2
+        np.dot(self.coefficients, self.knots, out=out)
+
+        if self.alpha < 1.0:
+            np.subtract(out, self.filtered, out=self._scratch)
+            self._scratch *= self.alpha
+            self.filtered += self._scratch
+            out[:] = self.filtered
+
+        return out
@@ -0,0 +1,197 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Multi-process Transport
+
+This module implements the shared-memory transport used to run the policy inference
+and the hardware I/O in separate processes. Each direction of the exchange is a
+single-producer single-consumer ring of fixed-size float32 vectors, paired with an
+eventfd doorbell so that the consumer can sleep in the kernel until new data arrives.
+"""
+
+import os
+import select
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def set_cpu_affinity(cpu: int | None) -> None:
+    """
+    Pin the calling process to a single CPU core.
+
+    Args:
+        cpu (int | None): Index of the core to run on. None keeps the current affinity.
+    """
+    if cpu is None:
+        return
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except (AttributeError, OSError) as e:
+        print(f"Warning: Could not pin process {os.getpid()} to CPU {cpu}: {e}")
+
+
+class Doorbell:
+    """
+    Cross-process wake-up signal backed by a Linux eventfd.
+
+    The file descriptor is inherited by processes forked after construction.
+    """
+    def __init__(self):
+        self.fd: int = os.eventfd(0, os.EFD_NONBLOCK)
+
+    def ring(self) -> None:
+        os.eventfd_write(self.fd, 1)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until the doorbell is rung.
+
+        Args:
+            timeout (float | None): Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            bool: True if the doorbell was rung, False on timeout
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            os.eventfd_read(self.fd)
+        except BlockingIOError:
+            # another waiter has consumed the event
+            return False
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SharedRing:
+    """
+    Single-producer single-consumer ring of float32 vectors in shared memory.
+
+    Every slot is guarded by a sequence number which is odd while the slot is being
+    written and even once the write is complete, so the consumer can detect a slot
+    that was overwritten while it was being copied and retry. The consumer always
+    reads the most recent vector; older vectors that were not consumed are skipped.
+
+    Every vector carries a tag, which the policy process sets to the sequence number of
+    the observation it answers, so that a late answer is not taken for the current one.
+
+    Layout of the shared memory block:
+        [write_sequence, closed] uint64 header
+        [capacity] uint64 slot sequence numbers
+        [capacity] uint64 slot tags
+        [capacity, vector_size] float32 payload
+    """
+    HEADER_LENGTH = 2
+
+    def __init__(self, vector_size: int, capacity: int = 4):
+        """
+        Args:
+            vector_size (int): Number of float32 elements in each vector
+            capacity (int): Number of slots in the ring
+        """
+        self.vector_size = vector_size
+        self.capacity = capacity
+
+        header_size = (self.HEADER_LENGTH + 2 * self.capacity) * np.dtype(np.uint64).itemsize
+        payload_size = self.capacity * self.vector_size * np.dtype(np.float32).itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=header_size + payload_size)
+
+        self._header = np.ndarray((self.HEADER_LENGTH,), dtype=np.uint64, buffer=self.shm.buf, offset=0)
+        self._slot_sequences = np.ndarray((self.capacity,), dtype=np.uint64, buffer=self.shm.buf,
+                                          offset=self.HEADER_LENGTH * np.dtype(np.uint64).itemsize)
+        self._slot_tags = np.ndarray((self.capacity,), dtype=np.uint64, buffer=self.shm.buf,
+                                     offset=(self.HEADER_LENGTH + self.capacity) * np.dtype(np.uint64).itemsize)
+        self._slots = np.ndarray((self.capacity, self.vector_size), dtype=np.float32, buffer=self.shm.buf,
+                                 offset=header_size)
+        self._header[:] = 0
+        self._slot_sequences[:] = 0
+        self._slot_tags[:] = 0
+
+        self.doorbell = Doorbell()
+
+        # consumer-side state, private to the reading process
+        self._last_read_sequence = 0
+        self.last_read_tag = 0
+
+    @property
+    def last_read_sequence(self) -> int:
+        return self._last_read_sequence
+
+    def write(self, vector: np.ndarray, tag: int = 0) -> int:
+        """
+        Publish a vector and ring the doorbell.
+
+        Args:
+            vector (np.ndarray): Vector of shape (vector_size, )
+            tag (int): Tag stored with the vector
+
+        Returns:
+            int: Sequence number of the vector, starting from 1
+        """
+        sequence = int(self._header[0]) + 1
+        slot = sequence % self.capacity
+
+        self._slot_sequences[slot] = 2 * sequence - 1
+        self._slots[slot, :] = vector
+        self._slot_tags[slot] = tag
+        self._slot_sequences[slot] = 2 * sequence
+        self._header[0] = sequence
+
+        self.doorbell.ring()
+        return sequence
+
+    def read_latest(self, out: np.ndarray) -> bool:
+        """
+        Copy the most recent vector into the output buffer.
+
+        Args:
+            out (np.ndarray): Preallocated float32 buffer of shape (vector_size, )
+
+        Returns:
+            bool: True if a vector newer than the last read one was copied
+        """
+        while True:
+            sequence = int(self._header[0])
+            if sequence == self._last_read_sequence:
+                return False
+
+            slot = sequence % self.capacity
+            slot_sequence = self._slot_sequences[slot]
+            out[:] = self._slots[slot, :]
+            tag = int(self._slot_tags[slot])
+
+            # the slot is consistent only if no write started on it during the copy
+            if slot_sequence == 2 * sequence and self._slot_sequences[slot] == slot_sequence:
+                self._last_read_sequence = sequence
+                self.last_read_tag = tag
+                return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.doorbell.wait(timeout)
+
+    def close_writer(self) -> None:
+        """
+        Mark the ring as closed and wake up the consumer.
+        """
+        self._header[1] = 1
+        self.doorbell.ring()
+
+    def is_closed(self) -> bool:
+        return bool(self._header[1])
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Release the shared memory mapping.
+
+        Args:
+            unlink (bool): Also destroy the shared memory block. Only the creating process should do this.
+        """
+        del self._header, self._slot_sequences, self._slot_tags, self._slots
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+            self.doorbell.close()
@@ -0,0 +1,259 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Policy Quantization
+
+Produces int8 and fp16 variants of an ONNX policy, and compares their actions against
+the float32 policy so that a variant is only kept when it behaves like the original.
+
+Quantized models are written next to the float model as `<name>.int8.onnx` and
+`<name>.fp16.onnx`, with the SHA-256 of the float model in their metadata.
+`RlController.load_policy` picks up the int8 model automatically when that hash matches
+the checkpoint it loads. The fp16 model is for benchmarking only, and is never loaded
+for control.
+"""
+
+import os
+import time
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+from omegaconf import DictConfig, ListConfig
+
+from berkeley_humanoid_lite_lowlevel.policy.rl_controller import (
+    QUANTIZED_SOURCE_HASH_KEY,
+    OnnxPolicy,
+    RlController,
+    checkpoint_sha256,
+)
+
+
+def quantized_checkpoint_path(checkpoint_path: str, precision: str) -> str:
+    """
+    Path of the quantized variant of a policy.
+
+    Args:
+        checkpoint_path (str): Path of the float32 ONNX policy
+        precision (str): "int8" or "fp16"
+
+    Returns:
+        str: Path of the quantized policy
+    """
+    return f"{os.path.splitext(checkpoint_path)[0]}.{precision}.onnx"
+
+
+def simulate_lowlevel_states(cfg: DictConfig | ListConfig, n_samples: int, seed: int = 0) -> np.ndarray:
+    """
+    Generate lowlevel states around the default standing pose, for calibration without a recording.
+
+    Args:
+        cfg (DictConfig | ListConfig): Policy configuration
+        n_samples (int): Number of states
+        seed (int): Random seed
+
+    Returns:
+        np.ndarray: States of shape (n_samples, 7 + 2 * num_actions + 4)
+    """
+    rng = np.random.default_rng(seed)
+    n_actions = cfg.num_actions
+    default_joint_positions = np.array(cfg.default_joint_positions, dtype=np.float32)[-n_actions:]
+
+    states = np.zeros((n_samples, 7 + 2 * n_actions + 4), dtype=np.float32)
+
+    # base tilted by up to about 15 degrees
+    tilt = rng.normal(0.0, 0.08, size=(n_samples, 3))
+    states[:, 0] = 1.0
+    states[:, 1:4] = tilt
+    states[:, 0:4] /= np.linalg.norm(states[:, 0:4], axis=1, keepdims=True)
+
+    states[:, 4:7] = rng.normal(0.0, 0.5, size=(n_samples, 3))
+    states[:, 7:7 + n_actions] = default_joint_positions + rng.normal(0.0, 0.2, size=(n_samples, n_actions))
+    states[:, 7 + n_actions:7 + 2 * n_actions] = rng.normal(0.0, 1.5, size=(n_samples, n_actions))
+    states[:, 7 + 2 * n_actions + 1:] = rng.uniform(-0.5, 0.5, size=(n_samples, 3))
+    return states
+
+
+def collect_observations(cfg: DictConfig | ListConfig, lowlevel_states: np.ndarray) -> np.ndarray:
+    """
+    Run the float32 policy over a trace of lowlevel states and collect the policy observations.
+
+    Args:
+        cfg (DictConfig | ListConfig): Policy configuration
+        lowlevel_states (np.ndarray): States of shape (n_samples, n_lowlevel_states), e.g. from a telemetry log
+
+    Returns:
+        np.ndarray: Policy observations of shape (n_samples, policy observation size)
+    """
+    controller = RlController(cfg)
+    controller.policy = OnnxPolicy(cfg.policy_checkpoint_path)
+
+    observations = np.zeros((len(lowlevel_states), controller.policy_observations.shape[1]), dtype=np.float32)
+    for i, states in enumerate(lowlevel_states):
+        controller.update(np.asarray(states, dtype=np.float32))
+        observations[i] = controller.policy_observations[0]
+    return observations
+
+
+class ObservationReader(CalibrationDataReader):
+    """
+    Feeds recorded policy observations to the static quantization calibration.
+
+    Args:
+        input_name (str): Name of the model input
+        observations (np.ndarray): Observations of shape (n_samples, policy observation size)
+    """
+    def __init__(self, input_name: str, observations: np.ndarray):
+        self.input_name = input_name
+        self.observations = observations
+        self.index = 0
+
+    def get_next(self) -> dict[str, np.ndarray] | None:
+        if self.index >= len(self.observations):
+            return None
+        observation = self.observations[self.index:self.index + 1]
+        self.index += 1
+        return {self.input_name: observation}
+
+    def rewind(self) -> None:
+        self.index = 0
+
+
+def convert_to_float16(model: onnx.ModelProto) -> onnx.ModelProto:
+    """
+    Convert the float32 weights and constants of a model to float16.
+
+    The model keeps float32 inputs and outputs, with casts inserted after the input and
+    before the output, so that it is a drop-in replacement of the float32 model.
+
+    Args:
+        model (onnx.ModelProto): Float32 model, modified in place
+
+    Returns:
+        onnx.ModelProto: Float16 model
+    """
+    graph = model.graph
+
+    for tensor in graph.initializer:
+        if tensor.data_type == TensorProto.FLOAT:
+            tensor.CopyFrom(numpy_helper.from_array(numpy_helper.to_array(tensor).astype(np.float16), tensor.name))
+
+    for node in graph.node:
+        for attribute in node.attribute:
+            if attribute.type == onnx.AttributeProto.TENSOR and attribute.t.data_type == TensorProto.FLOAT:
+                attribute.t.CopyFrom(numpy_helper.from_array(numpy_helper.to_array(attribute.t).astype(np.float16)))
+            elif node.op_type == "Cast" and attribute.name == "to" and attribute.i == TensorProto.FLOAT:
+                attribute.i = TensorProto.FLOAT16
+
+    # the shapes inferred for float32 no longer hold
+    del graph.value_info[:]
+
+    renames = {}
+    for value in (*graph.input, *graph.output):
+        renames[value.name] = f"{value.name}_fp16"
+    for node in graph.node:
+        for i, name in enumerate(node.input):
+            node.input[i] = renames.get(name, name)
+        for i, name in enumerate(node.output):
+            node.output[i] = renames.get(name, name)
+
+    casts_in = [helper.make_node("Cast", [value.name], [renames[value.name]], to=TensorProto.FLOAT16) for value in graph.input]
+    casts_out = [helper.make_node("Cast", [renames[value.name]], [value.name], to=TensorProto.FLOAT) for value in graph.output]
+    nodes = [*casts_in, *graph.node, *casts_out]
+    del graph.node[:]
+    graph.node.extend(nodes)
+
+    onnx.checker.check_model(model)
+    return model
+
+
+def quantize_policy(
+    checkpoint_path: str,
+    output_path: str,
+    precision: str = "int8",
+    calibration_observations: np.ndarray | None = None,
+    per_channel: bool = False,
+) -> None:
+    """
+    Write a quantized variant of an ONNX policy.
+
+    int8 models are quantized statically when calibration observations are given, and
+    dynamically otherwise. The SHA-256 of the float32 policy is stored in the metadata of
+    the quantized policy, see `RlController.load_policy`.
+
+    Args:
+        checkpoint_path (str): Path of the float32 ONNX policy
+        output_path (str): Path of the quantized policy
+        precision (str): "int8" or "fp16"
+        calibration_observations (np.ndarray | None): Observations to calibrate the activation ranges with
+        per_channel (bool): Quantize the weights per output channel
+    """
+    match precision:
+        case "int8":
+            if calibration_observations is None:
+                quantize_dynamic(checkpoint_path, output_path, weight_type=QuantType.QInt8, per_channel=per_channel)
+            else:
+                input_name = onnx.load(checkpoint_path).graph.input[0].name
+                quantize_static(
+                    checkpoint_path,
+                    output_path,
+                    ObservationReader(input_name, calibration_observations),
+                    quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QInt8,
+                    weight_type=QuantType.QInt8,
+                    per_channel=per_channel,
+                )
+        case "fp16":
+            onnx.save(convert_to_float16(onnx.load(checkpoint_path)), output_path)
+        case _:
+            raise ValueError(f"Unknown precision: {precision}")
+
+    model = onnx.load(output_path)
+    metadata = {entry.key: entry.value for entry in model.metadata_props}
+    metadata[QUANTIZED_SOURCE_HASH_KEY] = checkpoint_sha256(checkpoint_path)
+    helper.set_model_props(model, metadata)
+    onnx.save(model, output_path)
+
+
+def compare_policies(
+    reference_path: str,
+    candidate_path: str,
+    observations: np.ndarray,
+    action_limit_lower: float,
+    action_limit_upper: float,
+) -> dict[str, float | int]:
+    """
+    Compare the clipped actions of two policies on the same observations.
+
+    Args:
+        reference_path (str): Path of the float32 policy
+        candidate_path (str): Path of the quantized policy
+        observations (np.ndarray): Observations of shape (n_samples, policy observation size)
+        action_limit_lower (float): Lower action limit
+        action_limit_upper (float): Upper action limit
+
+    Returns:
+        dict[str, float | int]: Maximum and mean absolute action error, the joint with the
+            largest error, and the mean inference time of both policies in seconds
+    """
+    results = {}
+    actions = []
+    for name, path in (("reference", reference_path), ("candidate", candidate_path)):
+        policy = OnnxPolicy(path)
+        outputs = np.zeros((len(observations), policy.actions.shape[-1]), dtype=np.float32)
+
+        start_time = time.perf_counter()
+        for i in range(len(observations)):
+            outputs[i] = policy.forward(observations[i:i + 1])[0]
+        results[f"{name}_inference_time"] = (time.perf_counter() - start_time) / len(observations)
+
+        actions.append(np.clip(outputs, action_limit_lower, action_limit_upper))
+
+    errors = np.abs(actions[1] - actions[0])
+    joint_errors = errors.max(axis=0)
+    results["max_error"] = float(errors.max())
+    results["mean_error"] = float(errors.mean())
+    results["worst_joint"] = int(joint_errors.argmax())
+    results["worst_joint_mean_error"] = float(errors[:, results["worst_joint"]].mean())
+    return results
@@ -8,6 +8,9 @@ for controlling the Berkeley Humanoid Lite robot. It handles UDP communication f
 receiving observations and sending actions to the robot.
 """
 
+import hashlib
+import os
+import threading
 from typing import Union
 from abc import ABC, abstractmethod
 
@@ -16,6 +19,43 @@ from omegaconf import DictConfig, ListConfig
 import torch
 import onnxruntime as ort
 
+try:
+    import onnx
+    from onnx import numpy_helper
+except ImportError:
+    onnx = None
+
+
+# metadata key of a quantized policy, holding the SHA-256 of the float32 checkpoint it was made from
+QUANTIZED_SOURCE_HASH_KEY = "source_checkpoint_sha256"
+
+
+def checkpoint_sha256(checkpoint_path: str) -> str:
+    """
+    Args:
+        checkpoint_path (str): Path of a checkpoint
+
+    Returns:
+        str: Hex SHA-256 digest of the checkpoint file
+    """
+    with open(checkpoint_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_source_hash(checkpoint_path: str) -> str | None:
+    """
+    Args:
+        checkpoint_path (str): Path of a quantized ONNX policy
+
+    Returns:
+        str | None: SHA-256 of the float32 checkpoint the policy was made from, None if it is not recorded
+    """
+    # read through ONNX Runtime, which does not need the onnx package
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    session = ort.InferenceSession(checkpoint_path, sess_options=options, providers=["CPUExecutionProvider"])
+    return session.get_modelmeta().custom_metadata_map.get(QUANTIZED_SOURCE_HASH_KEY)
+
 
 class Policy(ABC):
     """
@@ -34,16 +74,91 @@ class TorchPolicy(Policy):
     PyTorch policy inference runner.
 
     Loads and executes PyTorch models for robot control policies.
+
+    TorchScript checkpoints are loaded directly. Pickled modules are traced on load when
+    the observation size is known, and the scripted model is frozen for inference. The
+    forward pass runs under `torch.inference_mode()`, reads C-contiguous float32
+    observations through tensors that share memory with the caller's arrays, and copies
+    the actions into a preallocated array.
+
+    The number of intra-op threads is a process-wide setting, set by `RlController`.
+
+    Args:
+        checkpoint_path (str): Path to the TorchScript or pickled model
+        device (str): Device to run the model on
+        input_size (int | None): Size of the observation vector, to trace pickled modules
     """
-    def __init__(self, checkpoint_path: str, device: str = "cpu"):
-        self.device = device
-        self.model: torch.nn.Module = torch.load(checkpoint_path, map_location=self.device)
+    def __init__(self, checkpoint_path: str, device: str = "cpu", input_size: int | None = None):
+        self.device = torch.device(device)
+
+        try:
+            self.model = torch.jit.load(checkpoint_path, map_location=self.device)
+        except RuntimeError:
+            # not a TorchScript archive, load the pickled module
+            model: torch.nn.Module = torch.load(checkpoint_path, map_location=self.device, weights_only=False)
+            model.eval()
+            self.model = model
+            if input_size is not None:
+                with torch.no_grad():
+                    self.model = torch.jit.trace(model, torch.zeros((1, input_size), device=self.device))
         self.model.eval()
 
+        if isinstance(self.model, torch.jit.ScriptModule):
+            try:
+                self.model = torch.jit.optimize_for_inference(self.model)
+            except RuntimeError as e:
+                print(f"Warning: cannot freeze the policy ({e})")
+
+        # observation tensors sharing memory with the arrays they were created from, by address and shape
+        self._observation_tensors: dict[tuple[int, tuple[int, ...]], torch.Tensor] = {}
+        # float32 copy of observations of other types or layouts, refreshed on every call
+        self._observation_buffer = np.zeros((0, 0), dtype=np.float32)
+        self._observation_buffer_tensor = torch.from_numpy(self._observation_buffer)
+
+        self.actions = np.zeros((0, 0), dtype=np.float32)
+        self._actions_tensor = torch.from_numpy(self.actions)
+
+    def _observation_tensor(self, observations: np.ndarray) -> torch.Tensor:
+        if observations.dtype != np.float32 or not observations.flags.c_contiguous:
+            # a tensor over a converted copy would keep the values of the first call
+            if self._observation_buffer.shape != observations.shape:
+                self._observation_buffer = np.zeros(observations.shape, dtype=np.float32)
+                self._observation_buffer_tensor = torch.from_numpy(self._observation_buffer)
+            np.copyto(self._observation_buffer, observations)
+            return self._observation_buffer_tensor
+
+        key = (observations.ctypes.data, observations.shape)
+        tensor = self._observation_tensors.get(key)
+        if tensor is None:
+            if len(self._observation_tensors) >= 64:
+                self._observation_tensors.clear()
+            # keeps the array alive as long as the tensor is cached
+            tensor = torch.from_numpy(observations)
+            self._observation_tensors[key] = tensor
+        return tensor
+
     def forward(self, observations: np.ndarray) -> np.ndarray:
-        observations_tensor = torch.from_numpy(observations).unsqueeze(0).to(self.device)
-        actions_tensor = self.model(observations_tensor)
-        return actions_tensor.detach().cpu().squeeze(0).numpy()
+        """
+        Run the policy on the observations.
+
+        Args:
+            observations (np.ndarray): float32 observations of shape (batch_size, num_observations)
+
+        Returns:
+            np.ndarray: Actions, overwritten by the next forward pass
+        """
+        observations_tensor = self._observation_tensor(observations)
+
+        with torch.inference_mode():
+            if self.device.type != "cpu":
+                observations_tensor = observations_tensor.to(self.device, non_blocking=True)
+            actions_tensor = self.model(observations_tensor)
+
+        if self.actions.shape != tuple(actions_tensor.shape):
+            self.actions = np.zeros(tuple(actions_tensor.shape), dtype=np.float32)
+            self._actions_tensor = torch.from_numpy(self.actions)
+        self._actions_tensor.copy_(actions_tensor)
+        return self.actions
 
 
 class OnnxPolicy(Policy):
@@ -51,20 +166,271 @@ class OnnxPolicy(Policy):
     ONNX policy inference runner
 
     Loads and executes ONNX models for robot control policies.
+
+    The session runs sequentially on a fixed number of threads with spinning disabled, so
+    that inference does not keep a core busy between control ticks. The observations and
+    actions are bound to the session with IOBinding, so that the runtime reads the caller's
+    observation array and writes into a preallocated action array in place.
+
+    The observation history ring of `RlController` hands over one of `n_frames` windows
+    at a different address on every tick. Every observation array gets its own binding,
+    created the first time the array is seen, so the ring windows are bound once and
+    each tick only looks its binding up.
+
+    Args:
+        checkpoint_path (str): Path to the ONNX model
+        num_threads (int): Number of intra-op threads of the session
+        dynamic_batch (bool): Make the batch dimension of a model exported with a fixed batch size dynamic
     """
+    # bindings kept before they are all dropped, for callers that pass a new array every call
+    MAX_BINDINGS = 16
+
+    def __init__(self, checkpoint_path: str, num_threads: int = 1, dynamic_batch: bool = False):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+        options.add_session_config_entry("session.inter_op.allow_spinning", "0")
+
+        model = checkpoint_path
+        if dynamic_batch:
+            if onnx is None:
+                raise ImportError("the onnx package is required to make the batch dimension dynamic")
+            proto = onnx.load(checkpoint_path)
+            for value in (*proto.graph.input, *proto.graph.output):
+                value.type.tensor_type.shape.dim[0].dim_param = "batch"
+            model = proto.SerializeToString()
+
+        self.model: ort.InferenceSession = ort.InferenceSession(
+            model,
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+
+        model_input = self.model.get_inputs()[0]
+        model_output = self.model.get_outputs()[0]
+        self.key = model_input.name
+        self.output_key = model_output.name
+
+        # symbolic batch dimensions are bound to a single observation
+        output_shape = [dim if isinstance(dim, int) else 1 for dim in model_output.shape]
+        self.actions = np.zeros(output_shape, dtype=np.float32)
+
+        # bindings by observation address and shape, with the bound array kept alive
+        self._bindings: dict[tuple[int, tuple[int, ...]], tuple[ort.IOBinding, np.ndarray]] = {}
+        # input copy of observations that are not contiguous float32
+        self._observation_buffer: np.ndarray | None = None
+
+    def _bind(self, observations: np.ndarray) -> ort.IOBinding:
+        if observations.shape[0] != self.actions.shape[0]:
+            # the bindings write into the old action array
+            self.actions = np.zeros((observations.shape[0], *self.actions.shape[1:]), dtype=np.float32)
+            self._bindings.clear()
+        if len(self._bindings) >= self.MAX_BINDINGS:
+            self._bindings.clear()
+
+        io_binding = self.model.io_binding()
+        io_binding.bind_input(
+            self.key, "cpu", 0, np.float32, observations.shape, observations.ctypes.data
+        )
+        io_binding.bind_output(
+            self.output_key, "cpu", 0, np.float32, self.actions.shape, self.actions.ctypes.data
+        )
+        self._bindings[(observations.ctypes.data, observations.shape)] = (io_binding, observations)
+        return io_binding
+
+    def forward(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Run the policy on the observations.
+
+        Args:
+            observations (np.ndarray): Contiguous float32 observations
+
+        Returns:
+            np.ndarray: Actions, overwritten by the next forward pass
+        """
+        if observations.dtype != np.float32 or not observations.flags.c_contiguous:
+            if self._observation_buffer is None or self._observation_buffer.shape != observations.shape:
+                self._observation_buffer = np.zeros(observations.shape, dtype=np.float32)
+            np.copyto(self._observation_buffer, observations)
+            observations = self._observation_buffer
+
+        entry = self._bindings.get((observations.ctypes.data, observations.shape))
+        io_binding = entry[0] if entry is not None else self._bind(observations)
+        self.model.run_with_iobinding(io_binding)
+        return self.actions
+
+
+class DenseLayer:
+    """
+    Fully connected layer with an optional element-wise activation.
+
+    Args:
+        weight (np.ndarray): Weight matrix of shape (in_features, out_features)
+        bias (np.ndarray | None): Bias of shape (out_features, )
+        activation (str | None): "elu", "tanh", "relu" or None
+        alpha (float): Alpha of the ELU activation
+    """
+    def __init__(self, weight: np.ndarray, bias: np.ndarray | None = None, activation: str | None = None, alpha: float = 1.0):
+        self.weight = np.ascontiguousarray(weight, dtype=np.float32)
+        self.bias = None if bias is None else np.ascontiguousarray(bias, dtype=np.float32).reshape(-1)
+        self.activation = activation
+        self.alpha = np.float32(alpha)
+
+    @property
+    def in_features(self) -> int:
+        return self.weight.shape[0]
+
+    @property
+    def out_features(self) -> int:
+        return self.weight.shape[1]
+
+
+class NumpyPolicy(Policy):
+    """
+    NumPy MLP inference runner.
+
+    Parses ONNX models that are a chain of Gemm / MatMul / Add layers and Elu / Tanh / Relu
+    activations into contiguous float32 weight arrays, and runs the forward pass with
+    in-place matmuls and activations on preallocated buffers. This avoids the per-call
+    overhead of a runtime session for the small actor networks.
+
+    Raises:
+        ImportError: If the onnx package is not installed
+        ValueError: If the graph contains an unsupported operator or topology
+    """
+    ACTIVATIONS = {"Elu": "elu", "Tanh": "tanh", "Relu": "relu"}
+
     def __init__(self, checkpoint_path: str):
-        self.model: ort.InferenceSession = ort.InferenceSession(checkpoint_path)
+        if onnx is None:
+            raise ImportError("the onnx package is required to parse the policy")
 
-        input_shape = self.model.get_inputs()[0].shape
-        try:
-            self.model.run(None, {"obs": np.zeros(input_shape, dtype=np.float32)})[0]
-            self.key = "obs"
-        except Exception as e:
-            print(e)
-            self.key = "onnx::Gemm_0"
+        self.layers: list[DenseLayer] = self.parse_graph(onnx.load(checkpoint_path).graph)
+
+        # per-layer output and activation scratch buffers, allocated for the observation batch size
+        self.batch_size = 0
+        self._outputs: list[np.ndarray] = []
+        self._scratch: list[np.ndarray] = []
+        self._allocate(1)
+
+    @classmethod
+    def parse_graph(cls, graph) -> list[DenseLayer]:
+        """
+        Convert an ONNX graph into a list of dense layers.
+
+        Args:
+            graph (onnx.GraphProto): Graph of the model
+
+        Returns:
+            list[DenseLayer]: Layers, from the input to the output
+        """
+        initializers = {tensor.name: numpy_helper.to_array(tensor) for tensor in graph.initializer}
+        graph_inputs = [value.name for value in graph.input if value.name not in initializers]
+        if len(graph_inputs) != 1 or len(graph.output) != 1:
+            raise ValueError("only graphs with a single input and output are supported")
+
+        layers: list[DenseLayer] = []
+        # name of the tensor produced by the last parsed node
+        current = graph_inputs[0]
+
+        for node in graph.node:
+            if node.op_type not in ("Gemm", "MatMul", "Add", "Identity", *cls.ACTIVATIONS):
+                raise ValueError(f"unsupported operator {node.op_type}")
+
+            attributes = {attribute.name: onnx.helper.get_attribute_value(attribute) for attribute in node.attribute}
+            operands = [name for name in node.input if name != current]
+            if len(operands) != len(node.input) - 1 or any(name not in initializers for name in operands):
+                raise ValueError(f"unsupported topology at {node.op_type} node {node.name}")
+
+            match node.op_type:
+                case "Gemm":
+                    if attributes.get("transA", 0) or node.input[0] != current:
+                        raise ValueError(f"unsupported Gemm node {node.name}")
+                    weight = initializers[node.input[1]].astype(np.float32)
+                    if attributes.get("transB", 0):
+                        weight = weight.T
+                    weight = weight * attributes.get("alpha", 1.0)
+                    bias = None
+                    if len(node.input) > 2:
+                        bias = np.broadcast_to(initializers[node.input[2]] * attributes.get("beta", 1.0), weight.shape[1:])
+                    layers.append(DenseLayer(weight, bias))
+
+                case "MatMul":
+                    if node.input[0] != current:
+                        raise ValueError(f"unsupported MatMul node {node.name}")
+                    layers.append(DenseLayer(initializers[node.input[1]]))
+
+                case "Add":
+                    if not layers or layers[-1].activation is not None:
+                        raise ValueError(f"Add node {node.name} does not follow a linear layer")
+                    bias = np.broadcast_to(initializers[operands[0]], (layers[-1].out_features, ))
+                    if layers[-1].bias is not None:
+                        bias = bias + layers[-1].bias
+                    layers[-1].bias = np.ascontiguousarray(bias, dtype=np.float32)
+
+                case "Elu" | "Tanh" | "Relu":
+                    if not layers or layers[-1].activation is not None:
+                        raise ValueError(f"{node.op_type} node {node.name} does not follow a linear layer")
+                    layers[-1].activation = cls.ACTIVATIONS[node.op_type]
+                    layers[-1].alpha = np.float32(attributes.get("alpha", 1.0))
+
+                case "Identity":
+                    pass
+
+            current = node.output[0]
+
+        if not layers or current != graph.output[0].name:
+            raise ValueError("the graph output is not produced by the layer chain")
+        for previous, layer in zip(layers[:-1], layers[1:]):
+            if previous.out_features != layer.in_features:
+                raise ValueError("layer sizes do not match")
+        return layers
+
+    def _allocate(self, batch_size: int) -> None:
+        self.batch_size = batch_size
+        self._outputs = [np.zeros((batch_size, layer.out_features), dtype=np.float32) for layer in self.layers]
+        self._scratch = [
+            np.zeros((batch_size, layer.out_features), dtype=np.float32) if layer.activation == "elu" else None
+            for layer in self.layers
+        ]
 
     def forward(self, observations: np.ndarray) -> np.ndarray:
-        return np.array(self.model.run(None, {self.key: observations})[0])
+        """
+        Run the policy on the observations.
+
+        Args:
+            observations (np.ndarray): float32 observations of shape (batch_size, num_observations)
+
+        Returns:
+            np.ndarray: Actions, overwritten by the next forward pass
+        """
+        if observations.shape[0] != self.batch_size:
+            self._allocate(observations.shape[0])
+
+        x = observations
+        for layer, out, scratch in zip(self.layers, self._outputs, self._scratch):
+            np.matmul(x, layer.weight, out=out)
+            if layer.bias is not None:
+                out += layer.bias
+
+            match layer.activation:
+                case "elu":
+                    # elu(x) = max(x, 0) + alpha * (exp(min(x, 0)) - 1)
+                    np.minimum(out, 0.0, out=scratch)
+                    np.expm1(scratch, out=scratch)
+                    if layer.alpha != 1.0:
+                        scratch *= layer.alpha
+                    np.maximum(out, 0.0, out=out)
+                    out += scratch
+                case "tanh":
+                    np.tanh(out, out=out)
+                case "relu":
+                    np.maximum(out, 0.0, out=out)
+
+            x = out
+        return x
 
 
 class RlController:
@@ -74,25 +440,36 @@ class RlController:
     This class handles the execution of trained policies (PyTorch or ONNX format),
     processes robot observations, and sends control commands via UDP communication.
     """
+    # number of robots evaluated by every update
+    batch_size: int = 1
 
     @staticmethod
-    def quat_rotate_inverse(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    def quat_rotate_inverse(q: np.ndarray, v: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """
         Rotate a vector by the inverse of a quaternion.
 
         Args:
             q (np.ndarray): Quaternion [w, x, y, z]
             v (np.ndarray): Vector to rotate
+            out (np.ndarray | None): Preallocated output of shape (3, ), a new array is allocated if None
 
         Returns:
             np.ndarray: Rotated vector
         """
-        q_w = q[0]
-        q_vec = q[1:4]
-        a = v * (2.0 * q_w ** 2 - 1.0)
-        b = np.cross(q_vec, v) * q_w * 2.0
-        c = q_vec * (np.dot(q_vec, v)) * 2.0
-        return a - b + c
+        if out is None:
+            out = np.empty(3, dtype=np.float32)
+
+        q_w, q_x, q_y, q_z = float(q[0]), float(q[1]), float(q[2]), float(q[3])
+        v_x, v_y, v_z = float(v[0]), float(v[1]), float(v[2])
+
+        # v * (2 w^2 - 1) - 2 w (q_vec x v) + 2 q_vec (q_vec . v)
+        a = 2.0 * q_w * q_w - 1.0
+        b = 2.0 * q_w
+        c = 2.0 * (q_x * v_x + q_y * v_y + q_z * v_z)
+        out[0] = v_x * a - (q_y * v_z - q_z * v_y) * b + q_x * c
+        out[1] = v_y * a - (q_z * v_x - q_x * v_z) * b + q_y * c
+        out[2] = v_z * a - (q_x * v_y - q_y * v_x) * b + q_z * c
+        return out
 
     def __init__(self, cfg: Union[DictConfig, ListConfig]):
         """
@@ -103,10 +480,6 @@ class RlController:
         """
         self.cfg = cfg
 
-        # for data logging
-        self.data_log = []
-        self.counter = 0
-
         # Initialize robot state buffers
         self.command_velocity = np.array(self.cfg.command_velocity, dtype=np.float32)
 
@@ -118,29 +491,170 @@ class RlController:
         self.gravity_vector = np.array([0., 0., -1.], dtype=np.float32)
 
         # Initialize observation and action buffers
-        self.policy_observations = np.zeros((1, self.cfg.num_observations * (self.cfg.history_length + 1)), dtype=np.float32)
+        n_actions = self.cfg.num_actions
+        self.n_frames = self.cfg.history_length + 1
+
+        # Observation history ring. Every frame is written twice, at row k and at row
+        # k + n_frames, so that rows k + 1 to k + n_frames always hold the whole history
+        # from the oldest to the newest frame as one contiguous block.
+        self.observation_history = np.zeros((2 * self.n_frames, self.cfg.num_observations), dtype=np.float32)
+        self.history_index = 0
+        self.policy_observations = self.observation_history[self.n_frames:].reshape(1, -1)
+
+        # slices of the observation terms within a frame
+        self.command_slice = slice(0, 3)
+        self.ang_vel_slice = slice(3, 6)
+        self.gravity_slice = slice(6, 9)
+        self.joint_pos_slice = slice(9, 9 + n_actions)
+        self.joint_vel_slice = slice(9 + n_actions, 9 + 2 * n_actions)
+        self.prev_actions_slice = slice(9 + 2 * n_actions, 9 + 3 * n_actions)
+        assert self.prev_actions_slice.stop == self.cfg.num_observations, "observation terms do not match num_observations"
+
         self.policy_actions = np.zeros((1, self.cfg.num_actions), dtype=np.float32)
         self.prev_actions = np.zeros((self.cfg.num_actions,), dtype=np.float32)
+        self.actions = np.zeros((self.cfg.num_actions,), dtype=np.float32)
+
+        # config lookups are slow, cache the values used on every update
+        self.n_actions: int = self.cfg.num_actions
+        self.action_limit_lower: float = self.cfg.action_limit_lower
+        self.action_limit_upper: float = self.cfg.action_limit_upper
+        self.action_scale: float = self.cfg.action_scale
+
+        self.policy: Policy | None = None
+        self.policy_checkpoint_path: str = self.cfg.policy_checkpoint_path
+
+        # the Torch thread count applies to the whole process, so it is set once here and
+        # not by each policy, which may be loaded while another one is running
+        torch.set_num_threads(self.cfg.get("policy_num_threads", 1))
+
+        # policy loaded in the background, switched to at the start of the next update
+        self._pending_policy: tuple[Policy, str] | None = None
+        self._policy_loader: threading.Thread | None = None
 
     def load_policy(self) -> None:
         """
         Load the policy model (PyTorch or ONNX)
         """
-        model_checkpoint_path = self.cfg.policy_checkpoint_path
+        self.policy = self._create_policy(self.cfg.policy_checkpoint_path)
+        self.policy_checkpoint_path = self.cfg.policy_checkpoint_path
+
+    def _create_policy(self, model_checkpoint_path: str) -> Policy:
+        """
+        Create the policy runner for a checkpoint.
+
+        Args:
+            model_checkpoint_path (str): Path of the PyTorch or ONNX checkpoint
+
+        Returns:
+            Policy: Policy runner
+        """
+        policy = None
 
         # Determine policy format and load appropriate model
         if ".pt" in model_checkpoint_path:
             torch.set_printoptions(precision=2)
-            self.policy = TorchPolicy(model_checkpoint_path)
+            policy = TorchPolicy(
+                model_checkpoint_path,
+                input_size=self.policy_observations.shape[1],
+            )
             print("Using Torch runner")
 
         elif ".onnx" in model_checkpoint_path:
-            self.policy = OnnxPolicy(model_checkpoint_path)
-            print("Using ONNX runner")
+            # prefer the int8 model written by scripts/quantize_policy.py, which only keeps
+            # models whose actions match the float32 policy, as long as it was made from
+            # this very checkpoint and not left over from an older one
+            quantized_checkpoint_path = f"{os.path.splitext(model_checkpoint_path)[0]}.int8.onnx"
+            if (
+                self.cfg.get("policy_use_quantized", True)
+                and quantized_checkpoint_path != model_checkpoint_path
+                and os.path.exists(quantized_checkpoint_path)
+            ):
+                if read_source_hash(quantized_checkpoint_path) == checkpoint_sha256(model_checkpoint_path):
+                    model_checkpoint_path = quantized_checkpoint_path
+                    print(f"Using the quantized policy {model_checkpoint_path}")
+                else:
+                    print(f"Warning: ignoring {quantized_checkpoint_path}, it was not made from {model_checkpoint_path}. "
+                          "Run scripts/quantize_policy.py again to use a quantized policy.")
+
+            if self.cfg.get("policy_backend", "onnxruntime") == "numpy":
+                try:
+                    policy = NumpyPolicy(model_checkpoint_path)
+                    print("Using NumPy runner")
+                except (ImportError, ValueError) as e:
+                    print(f"Warning: cannot run the policy with NumPy ({e}), falling back to ONNX Runtime")
+
+            if policy is None:
+                policy = OnnxPolicy(
+                    model_checkpoint_path,
+                    num_threads=self.cfg.get("policy_num_threads", 1),
+                    dynamic_batch=self.batch_size > 1,
+                )
+                print("Using ONNX runner")
 
         else:
             raise ValueError("Unrecognized policy format")
 
+        return policy
+
+    def _warm_up_policy(self, policy: Policy, n_runs: int = 10) -> None:
+        """
+        Run a policy a few times on zero observations, and check that its actions have the configured size.
+
+        Args:
+            policy (Policy): Policy runner
+            n_runs (int): Number of forward passes
+
+        Raises:
+            ValueError: If the policy does not take or produce the configured sizes
+        """
+        observations = np.zeros_like(self.policy_observations)
+        expected_shape = (observations.shape[0], self.n_actions)
+        for _ in range(n_runs):
+            actions = np.asarray(policy.forward(observations))
+            if actions.shape != expected_shape:
+                raise ValueError(f"the policy produces actions of shape {actions.shape}, expected {expected_shape}")
+
+    def load_policy_async(self, checkpoint_path: str | None = None) -> bool:
+        """
+        Load a policy in a background thread and switch to it at the start of the next update after it is ready.
+
+        The new policy is created, warmed up and checked against the configured observation and
+        action sizes off the control thread, so the control loop keeps running the current
+        policy meanwhile. The observation history and previous actions are kept across the switch.
+        If the policy cannot be loaded, the current policy keeps running.
+
+        Args:
+            checkpoint_path (str | None): Path of the checkpoint, the current checkpoint if None
+
+        Returns:
+            bool: False if another policy is still being loaded
+        """
+        if self._policy_loader is not None and self._policy_loader.is_alive():
+            print("Warning: a policy is already being loaded")
+            return False
+
+        if checkpoint_path is None:
+            checkpoint_path = self.policy_checkpoint_path
+
+        self._policy_loader = threading.Thread(target=self._load_pending_policy, args=(checkpoint_path,), daemon=True)
+        self._policy_loader.start()
+        return True
+
+    def _load_pending_policy(self, checkpoint_path: str) -> None:
+        print(f"Loading policy {checkpoint_path}")
+        try:
+            policy = self._create_policy(checkpoint_path)
+            self._warm_up_policy(policy)
+        except Exception as e:
+            print(f"Warning: cannot load policy {checkpoint_path} ({e}), keeping {self.policy_checkpoint_path}")
+            return
+        self._pending_policy = (policy, checkpoint_path)
+
+    def _switch_to_pending_policy(self) -> None:
+        self.policy, self.policy_checkpoint_path = self._pending_policy
+        self._pending_policy = None
+        print(f"Switched to policy {self.policy_checkpoint_path}")
+
     def update(self, robot_observations: np.ndarray) -> np.ndarray:
         """
         Run the policy execution loop.
@@ -155,52 +669,164 @@ class RlController:
             robot_observations (np.ndarray): Observations from the robot low-level controller
 
         Returns:
-            np.ndarray: Actions to send to the robot
+            np.ndarray: Actions to send to the robot, overwritten by the next update
         """
+        if self._pending_policy is not None:
+            self._switch_to_pending_policy()
+
+        n_actions = self.n_actions
 
         # Parse UDP observations
         robot_base_quat = robot_observations[0:4]
         robot_base_ang_vel = robot_observations[4:7]
-        robot_joint_pos = robot_observations[7:7 + self.cfg.num_actions] - self.default_joint_positions
-        robot_joint_vel = robot_observations[7 + self.cfg.num_actions:7 + self.cfg.num_actions * 2]
-        # robot_mode = robot_observations[7 + self.cfg.num_actions * 2]
-        command_velocity = robot_observations[7 + self.cfg.num_actions * 2 + 1:7 + self.cfg.num_actions * 2 + 4]
-
-        # Process observations
-        base_ang_vel = robot_base_ang_vel
-        projected_gravity = self.quat_rotate_inverse(robot_base_quat, self.gravity_vector)
-        joint_pos = robot_joint_pos
-        joint_vel = robot_joint_vel
-
-        # Update observation buffer
-        self.policy_observations[:] = np.concatenate([
-            self.policy_observations[0, self.cfg.num_observations:],
-            command_velocity,
-            base_ang_vel,
-            projected_gravity,
-            joint_pos,
-            joint_vel,
-            self.prev_actions
-        ], axis=0)
+        robot_joint_pos = robot_observations[7:7 + n_actions]
+        robot_joint_vel = robot_observations[7 + n_actions:7 + n_actions * 2]
+        # robot_mode = robot_observations[7 + n_actions * 2]
+        command_velocity = robot_observations[7 + n_actions * 2 + 1:7 + n_actions * 2 + 4]
+
+        # Write the observation terms in place into the newest history frame
+        frame = self.observation_history[self.history_index]
+        frame[self.command_slice] = command_velocity
+        frame[self.ang_vel_slice] = robot_base_ang_vel
+        self.quat_rotate_inverse(robot_base_quat, self.gravity_vector, out=frame[self.gravity_slice])
+        np.subtract(robot_joint_pos, self.default_joint_positions, out=frame[self.joint_pos_slice])
+        frame[self.joint_vel_slice] = robot_joint_vel
+        frame[self.prev_actions_slice] = self.prev_actions
+
+        # mirror the frame and move the contiguous window to end at it
+        self.observation_history[self.history_index + self.n_frames] = frame
+        self.history_index = (self.history_index + 1) % self.n_frames
+        start = self.history_index
+        self.policy_observations = self.observation_history[start:start + self.n_frames].reshape(1, -1)
 
         # Execute policy
         self.policy_actions[:] = self.policy.forward(self.policy_observations)
 
         # Process and scale actions
-        policy_actions_clipped = np.clip(self.policy_actions[0],
-                                         self.cfg.action_limit_lower,
-                                         self.cfg.action_limit_upper)
-        self.prev_actions[:] = policy_actions_clipped
+        np.clip(self.policy_actions[0], self.action_limit_lower, self.action_limit_upper, out=self.prev_actions)
+
+        np.multiply(self.prev_actions, self.action_scale, out=self.actions)
+        self.actions += self.default_joint_positions
+
+        return self.actions
+
+    def commit_actions(self, actions: np.ndarray) -> None:
+        """
+        Replace the previous actions seen by the policy with the actions sent to the robot.
 
-        policy_actions_scaled = policy_actions_clipped * self.cfg.action_scale + self.default_joint_positions
+        Used when the robot was sent other actions than the last update returned, such as
+        a fallback action, so that the next update observes what the joints were commanded.
 
-        # # Log data
-        # data_log.append(np.concatenate([[time.time()], policy_observations.flatten()]).tolist())
-        # counter += 1
+        Args:
+            actions (np.ndarray): Joint position targets of shape (n_actions, ), as returned by `update`
+        """
+        np.subtract(actions, self.default_joint_positions, out=self.prev_actions)
+        self.prev_actions /= self.action_scale
+        np.clip(self.prev_actions, self.action_limit_lower, self.action_limit_upper, out=self.prev_actions)
+
+
+class BatchedRlController(RlController):
+    """
+    Policy runner that evaluates one policy for a batch of robots in every update.
+
+    The observation history and the previous actions of every robot are kept in (batch_size, N)
+    arrays, and the observation assembly, inference, clipping and scaling run as single
+    vectorized operations over the batch.
+
+    Args:
+        cfg (DictConfig | ListConfig): Configuration
+        batch_size (int): Number of robots
+    """
+    def __init__(self, cfg: Union[DictConfig, ListConfig], batch_size: int):
+        super().__init__(cfg)
+        self.batch_size = batch_size
+
+        n_observations = self.cfg.num_observations
+
+        # (batch_size, 2 * n_frames, num_observations) history rings, see RlController
+        self.observation_history = np.zeros((batch_size, 2 * self.n_frames, n_observations), dtype=np.float32)
+        self.policy_observations = np.zeros((batch_size, self.n_frames * n_observations), dtype=np.float32)
+        self._policy_frames = self.policy_observations.reshape(batch_size, self.n_frames, n_observations)
+
+        self.policy_actions = np.zeros((batch_size, self.cfg.num_actions), dtype=np.float32)
+        self.prev_actions = np.zeros((batch_size, self.cfg.num_actions), dtype=np.float32)
+        self.actions = np.zeros((batch_size, self.cfg.num_actions), dtype=np.float32)
+
+    @staticmethod
+    def quat_rotate_inverse_batch(q: np.ndarray, v: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Rotate a vector by the inverse of a batch of quaternions.
+
+        Args:
+            q (np.ndarray): Quaternions [w, x, y, z] of shape (batch_size, 4)
+            v (np.ndarray): Vector to rotate, of shape (3, )
+            out (np.ndarray): Output of shape (batch_size, 3)
+
+        Returns:
+            np.ndarray: Rotated vectors
+        """
+        q_w = q[:, 0:1]
+        q_vec = q[:, 1:4]
+        np.multiply(v, 2.0 * q_w ** 2 - 1.0, out=out)
+        out -= np.cross(q_vec, v) * q_w * 2.0
+        out += q_vec * (q_vec @ v)[:, None] * 2.0
+        return out
+
+    def reset(self, indices: np.ndarray | slice = slice(None)) -> None:
+        """
+        Clear the observation history and previous actions of some robots, e.g. after an episode reset.
+
+        Args:
+            indices (np.ndarray | slice): Indices of the robots to reset
+        """
+        self.observation_history[indices] = 0.0
+        self.prev_actions[indices] = 0.0
+
+    def update(self, robot_observations: np.ndarray) -> np.ndarray:
+        """
+        Run the policy for every robot in the batch.
+
+        Args:
+            robot_observations (np.ndarray): Observations from the robot low-level controllers,
+                of shape (batch_size, n_lowlevel_states)
+
+        Returns:
+            np.ndarray: Actions of shape (batch_size, num_actions), overwritten by the next update
+        """
+        if self._pending_policy is not None:
+            self._switch_to_pending_policy()
+
+        n_actions = self.n_actions
+
+        # Parse observations
+        robot_base_quat = robot_observations[:, 0:4]
+        robot_base_ang_vel = robot_observations[:, 4:7]
+        robot_joint_pos = robot_observations[:, 7:7 + n_actions]
+        robot_joint_vel = robot_observations[:, 7 + n_actions:7 + n_actions * 2]
+        command_velocity = robot_observations[:, 7 + n_actions * 2 + 1:7 + n_actions * 2 + 4]
+
+        # Write the observation terms in place into the newest history frame of every robot
+        frame = self.observation_history[:, self.history_index]
+        frame[:, self.command_slice] = command_velocity
+        frame[:, self.ang_vel_slice] = robot_base_ang_vel
+        self.quat_rotate_inverse_batch(robot_base_quat, self.gravity_vector, out=frame[:, self.gravity_slice])
+        np.subtract(robot_joint_pos, self.default_joint_positions, out=frame[:, self.joint_pos_slice])
+        frame[:, self.joint_vel_slice] = robot_joint_vel
+        frame[:, self.prev_actions_slice] = self.prev_actions
+
+        self.observation_history[:, self.history_index + self.n_frames] = frame
+        self.history_index = (self.history_index + 1) % self.n_frames
+        start = self.history_index
+        # the history of a robot is contiguous, but the batch is strided, so gather it into the policy input
+        np.copyto(self._policy_frames, self.observation_history[:, start:start + self.n_frames])
+
+        # Execute policy
+        self.policy_actions[:] = self.policy.forward(self.policy_observations)
+
+        # Process and scale actions
+        np.clip(self.policy_actions, self.action_limit_lower, self.action_limit_upper, out=self.prev_actions)
 
-        # # Save experiment data
-        # with open("data_log.json", "w") as f:
-        #     json.dump(data_log, f)
-        # print("Written experiment data to ./data_log.json")
+        np.multiply(self.prev_actions, self.action_scale, out=self.actions)
+        self.actions += self.default_joint_positions
 
-        return policy_actions_scaled
+        return self.actions
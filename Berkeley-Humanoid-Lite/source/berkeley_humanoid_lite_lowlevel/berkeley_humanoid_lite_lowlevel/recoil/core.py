@@ -63,6 +63,22 @@ class ErrorCode:
     CAN_TX_FAULT                    = 0b0000010000000000
     I2C_FAULT                       = 0b0000100000000000
 
+    @staticmethod
+    def decode(error: int) -> list[str]:
+        """
+        Decode an error bitfield into the names of the set error flags.
+
+        Args:
+            error (int): Value of the ERROR parameter
+
+        Returns:
+            list[str]: Names of the error flags that are set
+        """
+        return [
+            name for name, flag in vars(ErrorCode).items()
+            if isinstance(flag, int) and flag != ErrorCode.NO_ERROR and error & flag
+        ]
+
 
 # supported version: >= 1.1.1
 class Parameter:
@@ -192,16 +208,17 @@ class Bus:
             print("warning:", e, data)
             return ()
 
-    def __init__(self, channel: str, bitrate: int = 1000000):
+    def __init__(self, channel: str, bitrate: int = 1000000, can_filters: list[dict] | None = None):
         """
         Args:
             channel (str): The port to use for communication, e.g., "can0"
             bitrate (int): The bitrate for the CAN bus, default is 1 Mbps
+            can_filters (list[dict] | None): Kernel receive filters, e.g. [{"can_id": ..., "can_mask": ...}]
         """
         self.channel = channel
         self.bitrate = bitrate
 
-        self.__bus = can.interface.Bus(interface="socketcan", channel=self.channel, bitrate=self.bitrate)
+        self.__bus = can.interface.Bus(interface="socketcan", channel=self.channel, bitrate=self.bitrate, can_filters=can_filters)
 
     def __del__(self):
         self.stop()
@@ -255,7 +272,15 @@ class Bus:
 
             return frame
 
-    def transmit(self, frame: CANFrame):
+    """
+    Transmit data.
+
+    timeout == None: try once, raise if the transmit queue is full
+    timeout >= 0: retry for up to timeout seconds while the transmit queue is full
+
+    @param timeout: timeout in seconds
+    """
+    def transmit(self, frame: CANFrame, timeout=None):
         assert frame.device_id <= CANFrame.DEVICE_ID_MSK, "device_id: {0} out of range".format(frame.device_id)
         assert frame.func_id is not None
 
@@ -266,7 +291,20 @@ class Bus:
             is_extended_id=False,
             data=frame.data)
 
-        self.__bus.send(msg)
+        if timeout is None:
+            self.__bus.send(msg)
+            return
+
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                self.__bus.send(msg)
+                return
+            except can.exceptions.CanOperationError:
+                # socketcan reports a full transmit queue as ENOBUFS, wait for it to drain
+                if time.perf_counter() > deadline:
+                    raise
+                time.sleep(0.0001)
 
     def ping(self, device_id: int, timeout=0.1) -> bool:
         self.transmit(CANFrame(device_id, Function.RECEIVE_PDO_1, size=1, data=b"\xCA"))
@@ -276,16 +314,16 @@ class Bus:
         rx_data = self.unpack("<BBBBBBBB", rx_frame.data)[0]
         return rx_data == 0xCA
 
-    def feed(self, device_id: int) -> None:
-        self.transmit(CANFrame(device_id, Function.HEARTBEAT))
+    def feed(self, device_id: int, timeout=None) -> None:
+        self.transmit(CANFrame(device_id, Function.HEARTBEAT), timeout=timeout)
 
-    def set_mode(self, device_id: int, mode: Mode) -> None:
+    def set_mode(self, device_id: int, mode: Mode, timeout=None) -> None:
         self.transmit(CANFrame(
             device_id,
             Function.NMT,
             size=2,
             data=struct.pack("<BB", mode, device_id)
-        ))
+        ), timeout=timeout)
 
     def load_settings_from_flash(self, device_id: int) -> None:
         self.transmit(CANFrame(
@@ -303,23 +341,80 @@ class Bus:
             data=struct.pack("<B", 1)
         ))
 
-    def _read_parameter(self, device_id: int, param_id: int, timeout=None) -> CANFrame | None:
+    def _request_parameter(self, device_id: int, param_id: int, timeout=None) -> None:
         self.transmit(CANFrame(
             device_id,
             Function.RECEIVE_SDO,
             size=3,
             data=struct.pack("<BH", 0x02 << 5, param_id)
-        ))
+        ), timeout=timeout)
+
+    def _drain(self, filter_function: int) -> int:
+        """
+        Discard the received frames of a function that are already queued.
+
+        Returns:
+            int: Number of discarded frames
+        """
+        n_discarded = 0
+        while self.receive(filter_function=filter_function, timeout=0.0):
+            n_discarded += 1
+        return n_discarded
+
+    def _read_parameter(self, device_id: int, param_id: int, timeout=None) -> CANFrame | None:
+        self._request_parameter(device_id, param_id)
         rx_frame = self.receive(filter_device_id=device_id, filter_function=Function.TRANSMIT_SDO, timeout=timeout)
         return rx_frame
 
-    def _write_parameter(self, device_id: int, param_id: int, tx_data: bytes) -> None:
+    def _read_parameters(self, requests: list[tuple[int, int]], timeout=0.01) -> list[CANFrame | None]:
+        """
+        Read several parameters with the requests pipelined on the bus.
+
+        All the requests are transmitted back-to-back before any response is awaited.
+        The SDO responses do not carry the parameter id, so responses are matched to the
+        requests of the same device in the order the requests were sent. Responses still
+        queued from earlier requests that timed out are discarded first.
+
+        Args:
+            requests (list[tuple[int, int]]): (device_id, param_id) pairs
+            timeout (float): Time to wait for all the responses, in seconds
+
+        Returns:
+            list[CANFrame | None]: Response frame of each request, None if not answered in time
+        """
+        self._drain(Function.TRANSMIT_SDO)
+
+        pending: dict[int, list[int]] = {}
+        for i, (device_id, param_id) in enumerate(requests):
+            self._request_parameter(device_id, param_id, timeout=timeout)
+            pending.setdefault(device_id, []).append(i)
+
+        rx_frames: list[CANFrame | None] = [None] * len(requests)
+        n_pending = len(requests)
+        deadline = time.perf_counter() + timeout
+
+        while n_pending > 0:
+            time_left = deadline - time.perf_counter()
+            if time_left <= 0:
+                break
+            rx_frame = self.receive(filter_function=Function.TRANSMIT_SDO, timeout=time_left)
+            if not rx_frame:
+                break
+            request_indices = pending.get(rx_frame.device_id)
+            if not request_indices:
+                continue
+            rx_frames[request_indices.pop(0)] = rx_frame
+            n_pending -= 1
+
+        return rx_frames
+
+    def _write_parameter(self, device_id: int, param_id: int, tx_data: bytes, timeout=None) -> None:
         self.transmit(CANFrame(
             device_id,
             Function.RECEIVE_SDO,
             size=8,
             data=struct.pack("<BHB", 0x01 << 5, param_id, 0) + tx_data
-        ))
+        ), timeout=timeout)
 
     def _read_parameter_bytes(self, device_id: int, param_id: int, timeout=None) -> bytes | bytearray | None:
         rx_frame = self._read_parameter(device_id, param_id, timeout)
@@ -349,12 +444,20 @@ class Bus:
         rx_data = self.unpack("<L", rx_frame.data[0:4])[0]
         return rx_data
 
+    def _read_parameters_f32(self, requests: list[tuple[int, int]], timeout=0.01) -> list[float | None]:
+        rx_frames = self._read_parameters(requests, timeout)
+        return [self.unpack("<f", rx_frame.data[0:4])[0] if rx_frame else None for rx_frame in rx_frames]
+
+    def _read_parameters_u32(self, requests: list[tuple[int, int]], timeout=0.01) -> list[int | None]:
+        rx_frames = self._read_parameters(requests, timeout)
+        return [self.unpack("<L", rx_frame.data[0:4])[0] if rx_frame else None for rx_frame in rx_frames]
+
     def _write_parameter_bytes(self, device_id: int, param_id: int, value: bytes):
         self._write_parameter(device_id, param_id, value)
 
-    def _write_parameter_f32(self, device_id: int, param_id: int, value: float):
+    def _write_parameter_f32(self, device_id: int, param_id: int, value: float, timeout=None):
         tx_data = struct.pack("<f", value)
-        self._write_parameter(device_id, param_id, tx_data)
+        self._write_parameter(device_id, param_id, tx_data, timeout=timeout)
 
     def _write_parameter_i32(self, device_id: int, param_id: int, value: int):
         assert isinstance(value, int), "value must be an integer"
@@ -582,7 +685,7 @@ class Bus:
         ))
 
     def receive_pdo_2(self, device_id: int) -> tuple:
-        rx_frame = self.receive(filter_device_id=device_id, timeout=0.001)
+        rx_frame = self.receive(filter_device_id=device_id, filter_function=Function.TRANSMIT_PDO_2, timeout=0.001)
 
         if rx_frame:
             measured_position, measured_velocity = struct.unpack("<ff", rx_frame.data[0:8])
@@ -590,3 +693,64 @@ class Bus:
         else:
             print(f"ERROR: <{self.channel}> No response from device {device_id}, timeout")
             return None, None
+
+    def exchange_pdo_2(
+        self,
+        device_indices: dict[int, int],
+        position_targets,
+        velocity_targets,
+        positions_out,
+        velocities_out,
+        timeout=0.001,
+    ) -> int:
+        """
+        Send position and velocity targets to several devices with the frames pipelined on the bus.
+
+        All the targets are transmitted back-to-back before any response is awaited, and the
+        PDO 2 responses are matched to the devices by their device id. Responses left over
+        from an earlier exchange are discarded first, so that a late response is never taken
+        for a fresh measurement.
+
+        Args:
+            device_indices (dict[int, int]): Device id -> index into the target and output arrays
+            position_targets: Position targets, indexed by the device index
+            velocity_targets: Velocity targets, indexed by the device index
+            positions_out: Measured positions, written at the device index of every response
+            velocities_out: Measured velocities, written at the device index of every response
+            timeout (float): Time to wait for the responses per device, in seconds. The exchange
+                waits up to timeout times the number of devices, as when the devices are served
+                one after the other.
+
+        Returns:
+            int: Number of devices that responded
+        """
+        self._drain(Function.TRANSMIT_PDO_2)
+
+        for device_id, i in device_indices.items():
+            self.transmit(CANFrame(
+                device_id,
+                Function.RECEIVE_PDO_2,
+                size=8,
+                data=struct.pack("<ff", position_targets[i], velocity_targets[i])
+            ))
+
+        received = set()
+        deadline = time.perf_counter() + timeout * len(device_indices)
+
+        while len(received) < len(device_indices):
+            time_left = deadline - time.perf_counter()
+            if time_left <= 0:
+                break
+            rx_frame = self.receive(filter_function=Function.TRANSMIT_PDO_2, timeout=time_left)
+            if not rx_frame:
+                break
+            i = device_indices.get(rx_frame.device_id)
+            if i is None:
+                continue
+            positions_out[i], velocities_out[i] = struct.unpack_from("<ff", rx_frame.data, 0)
+            received.add(rx_frame.device_id)
+        n_received = len(received)
+
+        if n_received < len(device_indices):
+            print(f"ERROR: <{self.channel}> {len(device_indices) - n_received} devices did not respond, timeout")
+        return n_received
@@ -0,0 +1,197 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Actuator Group
+
+Batched configuration and readout of the joint actuators. Work is split by CAN bus:
+every bus is served by its own worker thread, so the buses run concurrently, and the
+frames on each bus are pipelined instead of waiting for one joint before the next.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import berkeley_humanoid_lite_lowlevel.recoil as recoil
+
+
+class ActuatorGroup:
+    """
+    Joint actuators grouped by the CAN bus they are connected to.
+
+    Args:
+        joints (list[tuple[recoil.Bus, int, str]]): (bus, device_id, joint_name) entries, in joint order
+        transmit_timeout (float): Time to wait for a full transmit queue to drain, in seconds
+        write_spacing (float): Smallest time between two parameter writes to the same actuator, in seconds
+    """
+    def __init__(
+        self,
+        joints: list[tuple[recoil.Bus, int, str]],
+        transmit_timeout: float = 0.01,
+        write_spacing: float = 0.001,
+    ):
+        self.joints = joints
+        self.transmit_timeout = transmit_timeout
+        self.write_spacing = write_spacing
+
+        # bus -> [(joint index, device id), ...]
+        self.buses: dict[recoil.Bus, list[tuple[int, int]]] = {}
+        for i, (bus, device_id, _) in enumerate(self.joints):
+            self.buses.setdefault(bus, []).append((i, device_id))
+
+        # bus -> {device id: joint index}
+        self.device_indices: dict[recoil.Bus, dict[int, int]] = {
+            bus: {device_id: i for i, device_id in entries} for bus, entries in self.buses.items()
+        }
+
+        self._executor = ThreadPoolExecutor(max_workers=len(self.buses), thread_name_prefix="actuator_group")
+
+    def stop(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _run_on_buses(self, function, *args) -> None:
+        futures = [self._executor.submit(function, bus, entries, *args) for bus, entries in self.buses.items()]
+        for future in futures:
+            future.result()
+
+    def set_mode(self, mode: int) -> None:
+        def set_bus_mode(bus: recoil.Bus, entries: list[tuple[int, int]]):
+            for _, device_id in entries:
+                bus.set_mode(device_id, mode, timeout=self.transmit_timeout)
+        self._run_on_buses(set_bus_mode)
+
+    def feed(self) -> None:
+        def feed_bus(bus: recoil.Bus, entries: list[tuple[int, int]]):
+            for _, device_id in entries:
+                bus.feed(device_id, timeout=self.transmit_timeout)
+        self._run_on_buses(feed_bus)
+
+    def write_parameters_f32(self, param_ids: list[int], values: list[np.ndarray]) -> None:
+        """
+        Write float parameters to all the joints.
+
+        The frames are interleaved joint by joint, so consecutive frames on a bus go to
+        different actuators, and each actuator gets at least `write_spacing` between two
+        of its writes, as the sequential initialization used to leave.
+
+        Args:
+            param_ids (list[int]): Parameters to write
+            values (list[np.ndarray]): Per-joint values of each parameter, each of shape (n_joints, )
+        """
+        def write_bus(bus: recoil.Bus, entries: list[tuple[int, int]]):
+            for param_id, param_values in zip(param_ids, values):
+                round_start_time = time.perf_counter()
+                for i, device_id in entries:
+                    bus._write_parameter_f32(device_id, param_id, float(param_values[i]), timeout=self.transmit_timeout)
+                remaining_time = self.write_spacing - (time.perf_counter() - round_start_time)
+                if remaining_time > 0:
+                    time.sleep(remaining_time)
+        self._run_on_buses(write_bus)
+
+    def read_parameters_f32(self, param_ids: list[int], timeout: float = 0.01) -> np.ndarray:
+        """
+        Read float parameters from all the joints.
+
+        Args:
+            param_ids (list[int]): Parameters to read
+            timeout (float): Time to wait for the responses on each bus, in seconds
+
+        Returns:
+            np.ndarray: Values of shape (len(param_ids), n_joints), NaN where a joint did not respond
+        """
+        readings = np.full((len(param_ids), len(self.joints)), np.nan, dtype=np.float32)
+
+        def read_bus(bus: recoil.Bus, entries: list[tuple[int, int]]):
+            requests = [(device_id, param_id) for param_id in param_ids for _, device_id in entries]
+            results = bus._read_parameters_f32(requests, timeout=timeout)
+            for k, result in enumerate(results):
+                if result is not None:
+                    readings[k // len(entries), entries[k % len(entries)][0]] = result
+        self._run_on_buses(read_bus)
+
+        return readings
+
+    def exchange_pdo_2(
+        self,
+        position_targets: np.ndarray,
+        velocity_targets: np.ndarray,
+        positions_out: np.ndarray,
+        velocities_out: np.ndarray,
+        timeout: float = 0.001,
+    ) -> int:
+        """
+        Send position and velocity targets to all the joints and read back their measurements.
+
+        Each bus pipelines its frames, and the buses are served concurrently.
+
+        Args:
+            position_targets (np.ndarray): Position targets of shape (n_joints, ), in actuator frame
+            velocity_targets (np.ndarray): Velocity targets of shape (n_joints, ), in actuator frame
+            positions_out (np.ndarray): Measured positions of shape (n_joints, ), left unchanged for joints that did not respond
+            velocities_out (np.ndarray): Measured velocities of shape (n_joints, ), left unchanged for joints that did not respond
+            timeout (float): Time to wait for the response of each joint, in seconds. A bus
+                waits up to timeout times its number of joints.
+
+        Returns:
+            int: Number of joints that responded
+        """
+        futures = [
+            self._executor.submit(
+                bus.exchange_pdo_2, device_indices, position_targets, velocity_targets, positions_out, velocities_out, timeout
+            )
+            for bus, device_indices in self.device_indices.items()
+        ]
+        return sum(future.result() for future in futures)
+
+    def initialize(self, kp: np.ndarray, kd: np.ndarray, torque_limit: np.ndarray, mode: int = recoil.Mode.DAMPING) -> bool:
+        """
+        Configure the gains and torque limit of all the joints and switch them to the given mode.
+
+        The actuators are put into idle mode, the gains and limits are written, and then
+        read back in a single verification pass before the actuators are enabled.
+
+        Args:
+            kp (np.ndarray): Position gains of shape (n_joints, )
+            kd (np.ndarray): Velocity gains of shape (n_joints, )
+            torque_limit (np.ndarray): Torque limits of shape (n_joints, )
+            mode (int): Mode to switch the joints to once configured
+
+        Returns:
+            bool: True if every joint reported back the written values
+        """
+        start_time = time.perf_counter()
+
+        # the derivative gain of the position controller is the velocity loop kp
+        param_ids = [
+            recoil.Parameter.POSITION_CONTROLLER_POSITION_KP,
+            recoil.Parameter.POSITION_CONTROLLER_VELOCITY_KP,
+            recoil.Parameter.POSITION_CONTROLLER_TORQUE_LIMIT,
+        ]
+        values = [
+            np.asarray(kp, dtype=np.float32),
+            np.asarray(kd, dtype=np.float32),
+            np.asarray(torque_limit, dtype=np.float32),
+        ]
+
+        self.set_mode(recoil.Mode.IDLE)
+        time.sleep(self.write_spacing)
+        self.write_parameters_f32(param_ids, values)
+
+        readings = self.read_parameters_f32(param_ids)
+        matched = np.isclose(readings, np.stack(values), rtol=1e-6, atol=0.0)
+
+        is_verified = True
+        for i, (_, _, joint_name) in enumerate(self.joints):
+            if not np.all(matched[:, i]):
+                is_verified = False
+                print(f"Warning: {joint_name} reported kp: {readings[0, i]}, kd: {readings[1, i]}, "
+                      f"torque limit: {readings[2, i]}, expected {values[0][i]}, {values[1][i]}, {values[2][i]}")
+
+        self.feed()
+        self.set_mode(mode)
+
+        print(f"Initialized {len(self.joints)} joints on {len(self.buses)} buses "
+              f"in {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+        return is_verified
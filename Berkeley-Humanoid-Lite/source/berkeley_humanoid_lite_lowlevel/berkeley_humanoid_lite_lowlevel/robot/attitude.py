@@ -0,0 +1,133 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Attitude Estimation
+
+Host-side orientation filter that fuses the raw gyroscope and accelerometer readings
+of the IMU. The filter runs at the gyroscope rate, so the IMU does not need to stream
+its onboard quaternion, and the orientation is updated as soon as a gyroscope frame
+arrives.
+"""
+
+import math
+
+import numpy as np
+
+
+class MahonyFilter:
+    """
+    Mahony complementary filter with gyroscope bias estimation.
+
+    The gyroscope is integrated to propagate the orientation, and the angle between the
+    measured and the predicted gravity direction is fed back through a PI controller.
+    The integral term converges to the negative gyroscope bias.
+
+    Only roll and pitch are observable from gravity, the yaw drifts with the residual
+    gyroscope bias around the vertical axis.
+
+    Args:
+        kp (float): Proportional gain of the gravity correction, in rad/s per rad
+        ki (float): Integral gain of the gravity correction, in rad/s^2 per rad
+        acceleration_rejection (float): Skip the correction when the acceleration norm differs
+            from 1 g by more than this fraction, as the accelerometer is then dominated by motion
+    """
+    def __init__(self, kp: float = 1.0, ki: float = 0.02, acceleration_rejection: float = 0.2):
+        self.kp = kp
+        self.ki = ki
+        self.acceleration_rejection = acceleration_rejection
+
+        # (w, x, y, z)
+        self.quaternion: np.ndarray = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+        # (x, y, z) rad/s
+        self.gyro_bias: np.ndarray = np.zeros(3, dtype=np.float32)
+
+        self.is_initialized: bool = False
+
+    def reset(self) -> None:
+        self.quaternion[:] = (1.0, 0.0, 0.0, 0.0)
+        self.gyro_bias[:] = 0.0
+        self.is_initialized = False
+
+    def initialize(self, acceleration: np.ndarray) -> None:
+        """
+        Set the roll and pitch from the gravity direction, with zero yaw.
+
+        Args:
+            acceleration (np.ndarray): Accelerometer reading (x, y, z), in any unit
+        """
+        ax, ay, az = float(acceleration[0]), float(acceleration[1]), float(acceleration[2])
+        roll = math.atan2(ay, az)
+        pitch = math.atan2(-ax, math.sqrt(ay * ay + az * az))
+
+        cr, sr = math.cos(0.5 * roll), math.sin(0.5 * roll)
+        cp, sp = math.cos(0.5 * pitch), math.sin(0.5 * pitch)
+        self.quaternion[:] = (cr * cp, sr * cp, cr * sp, -sr * sp)
+        self.is_initialized = True
+
+    def update(self, angular_velocity: np.ndarray, acceleration: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Propagate the orientation by one gyroscope sample.
+
+        Args:
+            angular_velocity (np.ndarray): Gyroscope reading (x, y, z) in rad/s
+            acceleration (np.ndarray): Latest accelerometer reading (x, y, z) in g
+            dt (float): Time since the previous gyroscope sample, in seconds
+
+        Returns:
+            np.ndarray: The updated quaternion (w, x, y, z)
+        """
+        ax, ay, az = float(acceleration[0]), float(acceleration[1]), float(acceleration[2])
+        acceleration_norm = math.sqrt(ax * ax + ay * ay + az * az)
+
+        if not self.is_initialized:
+            if acceleration_norm > 0.0:
+                self.initialize(acceleration)
+            return self.quaternion
+
+        w, x, y, z = (float(value) for value in self.quaternion)
+        bx, by, bz = (float(value) for value in self.gyro_bias)
+
+        # bias-corrected angular velocity
+        gx = float(angular_velocity[0]) - bx
+        gy = float(angular_velocity[1]) - by
+        gz = float(angular_velocity[2]) - bz
+
+        if acceleration_norm > 0.0 and abs(acceleration_norm - 1.0) < self.acceleration_rejection:
+            ax /= acceleration_norm
+            ay /= acceleration_norm
+            az /= acceleration_norm
+
+            # predicted gravity direction in the body frame
+            vx = 2.0 * (x * z - w * y)
+            vy = 2.0 * (w * x + y * z)
+            vz = w * w - x * x - y * y + z * z
+
+            # rotation error between the measured and the predicted gravity direction
+            ex = ay * vz - az * vy
+            ey = az * vx - ax * vz
+            ez = ax * vy - ay * vx
+
+            if self.ki > 0.0:
+                bx -= self.ki * ex * dt
+                by -= self.ki * ey * dt
+                bz -= self.ki * ez * dt
+                self.gyro_bias[:] = (bx, by, bz)
+
+            gx += self.kp * ex
+            gy += self.kp * ey
+            gz += self.kp * ez
+
+        # integrate q_dot = 0.5 * q * (0, omega)
+        half_dt = 0.5 * dt
+        dw = (-x * gx - y * gy - z * gz) * half_dt
+        dx = (w * gx + y * gz - z * gy) * half_dt
+        dy = (w * gy - x * gz + z * gx) * half_dt
+        dz = (w * gz + x * gy - y * gx) * half_dt
+        w += dw
+        x += dx
+        y += dy
+        z += dz
+
+        norm = math.sqrt(w * w + x * x + y * y + z * z)
+        self.quaternion[:] = (w / norm, x / norm, y / norm, z / norm)
+        return self.quaternion
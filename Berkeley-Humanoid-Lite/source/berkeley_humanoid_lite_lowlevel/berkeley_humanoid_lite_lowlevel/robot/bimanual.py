@@ -7,6 +7,8 @@ import serial
 import numpy as np
 
 import berkeley_humanoid_lite_lowlevel.recoil as recoil
+from berkeley_humanoid_lite_lowlevel.robot.actuators import ActuatorGroup
+from berkeley_humanoid_lite_lowlevel.robot.sensor_io import SensorEventLoop
 
 
 class Bimanual:
@@ -16,6 +18,11 @@ class Bimanual:
         self.right_arm_transport = recoil.Bus("can1")
         self.gripper = serial.Serial("/dev/ttyUSB0", 115200)
 
+        # gripper commands are written by the event loop thread, only the latest pending command is kept
+        self.sensor_loop = SensorEventLoop()
+        self.gripper_fd = self.sensor_loop.add_device(self.gripper, max_pending_writes=1, name="gripper")
+        self.sensor_loop.run_forever()
+
         self.joints = [
             (self.left_arm_transport, 1, "left_shoulder_pitch_joint"),
             (self.left_arm_transport, 3, "left_shoulder_roll_joint"),
@@ -30,6 +37,8 @@ class Bimanual:
             (self.right_arm_transport, 10, "right_wrist_yaw_joint"),
         ]
 
+        self.actuators = ActuatorGroup(self.joints)
+
         self.joint_axis_directions = np.array([
             +1, +1, -1, -1, -1,
             -1, +1, -1, +1, -1,
@@ -57,25 +66,22 @@ class Bimanual:
         self.joint_kd[:] = kd
         self.torque_limit[:] = torque_limit
 
-        for i, entry in enumerate(self.joints):
-            bus, device_id, joint_name = entry
+        print(f"Initializing joints with kp: {kp}, kd: {kd}, torque limit: {torque_limit}")
 
-            print(f"Initializing joint {joint_name}:")
-            print(f"  kp: {self.joint_kp[i]}, kd: {self.joint_kd[i]}, torque limit: {self.torque_limit[i]}")
+        # the joints stay idle until the configuration and the starting positions are known
+        if not self.actuators.initialize(self.joint_kp, self.joint_kd, self.torque_limit, recoil.Mode.IDLE):
+            raise RuntimeError("some joints did not confirm their configuration, not enabling position mode")
 
-            # Set the joint mode to idle
-            bus.set_mode(device_id, recoil.Mode.IDLE)
-            time.sleep(0.001)
-            bus.write_position_kp(device_id, self.joint_kp[i])
-            time.sleep(0.001)
-            bus.write_position_kd(device_id, self.joint_kd[i])
-            time.sleep(0.001)
-            bus.write_torque_limit(device_id, self.torque_limit[i])
-            time.sleep(0.001)
-            bus.feed(device_id)
-            bus.set_mode(device_id, recoil.Mode.POSITION)
-
-            self.position_offsets[i] = bus.read_position_measured(device_id) * self.joint_axis_directions[i]
+        n_joints = len(self.joints)
+        position_measured = self.actuators.read_parameters_f32([recoil.Parameter.POSITION_CONTROLLER_POSITION_MEASURED])[0]
+        is_missing = np.isnan(position_measured)
+        if np.any(is_missing):
+            missing_joints = [self.joints[i][2] for i in np.flatnonzero(is_missing)]
+            raise RuntimeError(f"no position from {', '.join(missing_joints)}, not enabling position mode")
+        self.position_offsets[:n_joints] = position_measured * self.joint_axis_directions[:n_joints]
+
+        self.actuators.feed()
+        self.actuators.set_mode(recoil.Mode.POSITION)
 
         print("Motors enabled")
         print(self.position_offsets)
@@ -97,6 +103,9 @@ class Bimanual:
             bus, device_id, _ = entry
             bus.set_mode(device_id, recoil.Mode.IDLE)
 
+        self.actuators.stop()
+        self.sensor_loop.stop()
+
         self.left_arm_transport.stop()
         self.right_arm_transport.stop()
 
@@ -143,7 +152,7 @@ class Bimanual:
         gripper_left_raw_value = 0.2 + self.gripper_left_target * 0.6
         gripper_right_raw_value = 0.2 + self.gripper_right_target * 0.6
         data = struct.pack("<ffb", gripper_left_raw_value, gripper_right_raw_value, 0x0C)
-        self.gripper.write(data)
+        self.sensor_loop.write(self.gripper_fd, data)
 
     def reset(self):
         obs = self.get_observations()
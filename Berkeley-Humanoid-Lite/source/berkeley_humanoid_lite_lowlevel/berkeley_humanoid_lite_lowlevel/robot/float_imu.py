@@ -0,0 +1,204 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+import numpy as np
+import serial
+from loop_rate_limiters import RateLimiter
+
+from berkeley_humanoid_lite_lowlevel.robot.imu import ImuBase
+from berkeley_humanoid_lite_lowlevel.robot.serial_transport import ReplaySerial
+
+
+class FloatImu(ImuBase):
+    """
+    Driver for the IMU that streams its orientation and angular velocity as float32 values.
+
+    Every frame carries one full sample:
+        2 bytes sync 0x75 0x65
+        uint16 payload size, always 28
+        float32 quaternion (w, x, y, z)
+        float32 angular velocity (x, y, z) in rad/s
+
+    The frames carry no checksum, so a frame is accepted when its size field matches and
+    its values are plausible: a unit quaternion, and an angular velocity within the range
+    of the gyroscope. Angular velocities are converted to deg/s so that the readings have
+    the same units as SerialImu.
+    """
+    SYNC_1 = 0x75
+    SYNC_2 = 0x65
+    PAYLOAD_SIZE = 28
+    FRAME_LENGTH = 4 + PAYLOAD_SIZE
+
+    # largest accepted deviation of the quaternion norm from 1
+    QUATERNION_NORM_TOLERANCE = 0.05
+    # largest accepted angular velocity on each axis, the 2000 deg/s gyroscope range, in rad/s
+    MAX_ANGULAR_VELOCITY = np.deg2rad(2000.0)
+
+    FRAME_DTYPE = np.dtype([
+        ("sync", np.uint8, (2,)),
+        ("size", "<u2"),
+        ("quaternion", "<f4", (4,)),
+        ("angular_velocity", "<f4", (3,)),
+    ])
+
+    def __init__(
+        self,
+        port: str = "/dev/serial/by-path/pci-0000:00:14.0-usb-0:4.1:1.0",
+        baudrate: int = 1000000,
+        read_timeout: float = 1.0,
+        history_capacity: int = 1024,
+        transport: serial.Serial | ReplaySerial | None = None,
+        record_path: str | None = None,
+        sample_rate: float = 200.0,
+    ):
+        self.port: str = port
+        self.read_timeout: float = read_timeout
+
+        if transport is None:
+            transport = serial.Serial(self.port, baudrate, timeout=self.read_timeout)
+
+        super().__init__(transport, baudrate, history_capacity, record_path, sample_rate)
+
+        # number of frames rejected by the size or value check, each frame is counted once
+        self.n_invalid_frames: int = 0
+
+    def _parse_buffer(self, length: int, read_time: float) -> int:
+        """
+        Decode the complete frames in the receive buffer.
+
+        The frames are decoded in aligned runs that start with the sync bytes. Invalid frames
+        of a run are counted and skipped, except for an invalid last frame that is not
+        followed by the next frame: its sync bytes were part of the payload of another frame.
+        When a run breaks, or ends on such a frame, the parser scans for the next sync bytes
+        to resynchronize. Incomplete bytes at the end are moved to the start of the buffer
+        to be completed by the next read.
+
+        Args:
+            length (int): Number of valid bytes in the buffer
+            read_time (float): time.monotonic() right after the last byte was read
+
+        Returns:
+            int: Number of bytes carried over to the next read
+        """
+        view = self._buffer_view
+        start = 0
+
+        is_synchronized = True
+
+        while length - start >= self.FRAME_LENGTH:
+            if not is_synchronized or view[start] != self.SYNC_1 or view[start + 1] != self.SYNC_2:
+                # skip to the next pair of sync bytes
+                candidates = np.flatnonzero(
+                    (view[start + 1:length - 1] == self.SYNC_1) & (view[start + 2:length] == self.SYNC_2)
+                )
+                self.n_resyncs += 1
+                if candidates.size == 0:
+                    # the last byte may be the first sync byte of the next frame
+                    start = length - 1 if view[length - 1] == self.SYNC_1 else length
+                    break
+                start += 1 + int(candidates[0])
+                is_synchronized = True
+                continue
+
+            n_frames = (length - start) // self.FRAME_LENGTH
+            frames = np.frombuffer(self._buffer, dtype=self.FRAME_DTYPE, count=n_frames, offset=start)
+
+            is_aligned = (frames["sync"][:, 0] == self.SYNC_1) & (frames["sync"][:, 1] == self.SYNC_2)
+            misaligned = np.flatnonzero(~is_aligned)
+            if misaligned.size > 0:
+                n_frames = int(misaligned[0])
+                frames = frames[:n_frames]
+
+            is_valid = self._is_plausible(frames)
+
+            # every frame but the last is followed by another frame of the run, so an invalid
+            # frame is a corrupted one. The last one may be a sync pattern inside a payload.
+            if not is_valid[-1] and not self._is_corrupted_frame(start + n_frames * self.FRAME_LENGTH, length):
+                n_frames -= 1
+                frames = frames[:n_frames]
+                is_valid = is_valid[:n_frames]
+                is_synchronized = False
+
+            n_valid = int(np.count_nonzero(is_valid))
+            self.n_invalid_frames += n_frames - n_valid
+
+            if n_valid > 0:
+                # arrival time of the last byte of each frame, assuming the bytes arrived back to back
+                frame_ends = start + self.FRAME_LENGTH * np.arange(1, n_frames + 1)
+                arrival_times = read_time - (length - frame_ends) * self.byte_time
+
+                self._decode_frames(frames[is_valid], arrival_times[is_valid])
+            start += n_frames * self.FRAME_LENGTH
+
+        # carry the partial frame over
+        remaining = length - start
+        if remaining > 0 and start > 0:
+            self._buffer[:remaining] = self._buffer[start:length]
+        return remaining
+
+    def _is_plausible(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            frames (np.ndarray): Aligned frames
+
+        Returns:
+            np.ndarray: True for every frame with the expected size and plausible values
+        """
+        # in float64 the squares of corrupted float32 values cannot overflow
+        quaternions = frames["quaternion"].astype(np.float64)
+        quaternion_norms = np.sqrt(np.einsum("ij,ij->i", quaternions, quaternions))
+        return (
+            (frames["size"] == self.PAYLOAD_SIZE)
+            & (np.abs(quaternion_norms - 1.0) < self.QUATERNION_NORM_TOLERANCE)
+            & (np.abs(frames["angular_velocity"]) < self.MAX_ANGULAR_VELOCITY).all(axis=1)
+        )
+
+    def _is_corrupted_frame(self, next_start: int, length: int) -> bool:
+        """
+        Tell an invalid frame from a sync pattern inside the payload of another frame.
+
+        Args:
+            next_start (int): Position right after the invalid frame
+            length (int): Number of valid bytes in the buffer
+
+        Returns:
+            bool: True if the next frame starts right after it, or the buffer ends there
+        """
+        return (
+            length - next_start < 2
+            or (self._buffer[next_start] == self.SYNC_1 and self._buffer[next_start + 1] == self.SYNC_2)
+        )
+
+    def _decode_frames(self, frames: np.ndarray, arrival_times: np.ndarray) -> None:
+        """
+        Publish the latest frame and push all the frames into the history.
+
+        Args:
+            frames (np.ndarray): Valid frames, in arrival order
+            arrival_times (np.ndarray): Estimated arrival time of each frame
+        """
+        angular_velocities = np.rad2deg(frames["angular_velocity"])
+        self.history.extend(arrival_times, frames["quaternion"], angular_velocities)
+
+        self.quaternion[:] = frames["quaternion"][-1]
+        self.angular_velocity[:] = angular_velocities[-1]
+        self.timestamp = float(arrival_times[-1])
+        self.n_frames += len(frames)
+
+
+if __name__ == "__main__":
+    imu = FloatImu()
+    imu.run_forever()
+
+    rate = RateLimiter(100)
+
+    print("IMU reader started")
+
+    try:
+        while True:
+            print(f"gx: {imu.angular_velocity[0]:.2f}\tgy: {imu.angular_velocity[1]:.2f}\tgz: {imu.angular_velocity[2]:.2f}", end="\t")
+            print(f"qw: {imu.quaternion[0]:.2f}\tqx: {imu.quaternion[1]:.2f}\tqy: {imu.quaternion[2]:.2f}\tqz: {imu.quaternion[3]:.2f}")
+            rate.sleep()
+    except KeyboardInterrupt:
+        imu.stop()
+        print(f"frames: {imu.n_frames}, invalid frames: {imu.n_invalid_frames}, resyncs: {imu.n_resyncs}")
+        print("IMU reader stopped")
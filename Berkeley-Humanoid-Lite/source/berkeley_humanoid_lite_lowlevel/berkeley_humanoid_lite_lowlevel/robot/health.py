@@ -0,0 +1,176 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Actuator Health Monitor
+
+Polls the error flags, mode and bus voltage of every actuator in the background.
+
+The monitor opens its own CAN sockets with a kernel filter that only passes SDO
+responses, so it never consumes the PDO frames of the control loop. Requests are only
+sent right after the control loop signals that its PDO exchange of the tick has
+finished, one request per bus at a time, so polling fills the idle time on the bus
+instead of delaying the PDO frames. Responses that arrive after their timeout are
+discarded before the next request, and responses from other devices are skipped, so a
+late response is never taken for the answer to the next one.
+
+The results are published in plain per-joint arrays, which the control loop can read
+at any time without taking a lock.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+import berkeley_humanoid_lite_lowlevel.recoil as recoil
+
+
+class ActuatorHealthMonitor:
+    """
+    Round-robin poller of the actuator status parameters.
+
+    Args:
+        joints (list[tuple[recoil.Bus, int, str]]): (bus, device_id, joint_name) entries, in joint order
+        poll_rate (float): Number of parameter requests per second on each bus
+        response_timeout (float): Time to wait for each response, in seconds
+    """
+    POLLED_PARAMETERS = (
+        recoil.Parameter.ERROR,
+        recoil.Parameter.MODE,
+        recoil.Parameter.POWERSTAGE_BUS_VOLTAGE_MEASURED,
+    )
+
+    def __init__(self, joints: list[tuple[recoil.Bus, int, str]], poll_rate: float = 30.0, response_timeout: float = 0.002):
+        self.joints = joints
+        self.poll_period = 1.0 / poll_rate
+        self.response_timeout = response_timeout
+
+        n_joints = len(self.joints)
+
+        # === Per-joint health, written by the monitor thread only ===
+        # ERROR bitfield, see recoil.ErrorCode
+        self.error: np.ndarray = np.zeros(n_joints, dtype=np.uint32)
+        # see recoil.Mode
+        self.mode: np.ndarray = np.zeros(n_joints, dtype=np.uint32)
+        # V
+        self.bus_voltage: np.ndarray = np.full(n_joints, np.nan, dtype=np.float32)
+        # time.monotonic() of the last response
+        self.last_response_time: np.ndarray = np.zeros(n_joints, dtype=np.float64)
+        # number of requests that were not answered in time
+        self.n_timeouts: np.ndarray = np.zeros(n_joints, dtype=np.uint32)
+        # number of discarded late or mismatched responses
+        self.n_discarded_responses: int = 0
+
+        # the monitor uses separate sockets that only receive SDO responses
+        sdo_filter = [{
+            "can_id": recoil.Function.TRANSMIT_SDO << recoil.CANFrame.FUNC_ID_POS,
+            "can_mask": recoil.CANFrame.FUNC_ID_MSK,
+        }]
+        self._schedules: list[tuple[recoil.Bus, list[tuple[int, int, int]]]] = []
+        for bus in dict.fromkeys(entry[0] for entry in self.joints):
+            schedule = [
+                (i, device_id, param_id)
+                for param_id in self.POLLED_PARAMETERS
+                for i, (joint_bus, device_id, _) in enumerate(self.joints) if joint_bus is bus
+            ]
+            self._schedules.append((recoil.Bus(bus.channel, bus.bitrate, can_filters=sdo_filter), schedule))
+        self._schedule_index = 0
+
+        self._tick = threading.Event()
+        self._is_stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._is_stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._is_stopped.set()
+        self._tick.set()
+        if self._thread:
+            self._thread.join()
+        for bus, _ in self._schedules:
+            bus.stop()
+
+    def notify_tick(self) -> None:
+        """
+        Signal that the control loop has finished its PDO exchange and the buses are idle.
+        """
+        self._tick.set()
+
+    def is_healthy(self) -> bool:
+        return not np.any(self.error)
+
+    def get_faults(self) -> dict[str, list[str]]:
+        """
+        Returns:
+            dict[str, list[str]]: Names of the set error flags of every joint that reports an error
+        """
+        return {
+            joint_name: recoil.ErrorCode.decode(int(self.error[i]))
+            for i, (_, _, joint_name) in enumerate(self.joints) if self.error[i]
+        }
+
+    def _run(self) -> None:
+        next_poll_time = time.monotonic()
+
+        while not self._is_stopped.is_set():
+            # wait for the gap after the PDO exchange of the next control tick
+            self._tick.wait()
+            self._tick.clear()
+
+            now = time.monotonic()
+            if now < next_poll_time:
+                continue
+            next_poll_time = max(next_poll_time + self.poll_period, now)
+
+            self._poll()
+
+    def _receive_response(self, bus: recoil.Bus, device_id: int, deadline: float) -> recoil.CANFrame | None:
+        """
+        Wait for the response to a request, discarding the responses of other devices.
+
+        The SDO responses do not carry the parameter id, the responses to earlier requests
+        are drained before the request is sent.
+        """
+        while True:
+            time_left = deadline - time.perf_counter()
+            if time_left <= 0:
+                return None
+            rx_frame = bus.receive(timeout=time_left)
+            if not rx_frame:
+                return None
+            if rx_frame.device_id == device_id:
+                return rx_frame
+            self.n_discarded_responses += 1
+
+    def _poll(self) -> None:
+        requests = []
+        for bus, schedule in self._schedules:
+            request = schedule[self._schedule_index % len(schedule)]
+            # responses still queued answer earlier requests that timed out
+            self.n_discarded_responses += bus._drain(recoil.Function.TRANSMIT_SDO)
+            bus._request_parameter(request[1], request[2])
+            requests.append(request)
+        self._schedule_index += 1
+
+        deadline = time.perf_counter() + self.response_timeout
+        for (bus, _), (i, device_id, param_id) in zip(self._schedules, requests):
+            rx_frame = self._receive_response(bus, device_id, deadline)
+            if not rx_frame:
+                self.n_timeouts[i] += 1
+                continue
+
+            self.last_response_time[i] = time.monotonic()
+
+            if param_id == recoil.Parameter.POWERSTAGE_BUS_VOLTAGE_MEASURED:
+                self.bus_voltage[i] = bus.unpack("<f", rx_frame.data[0:4])[0]
+            elif param_id == recoil.Parameter.MODE:
+                self.mode[i] = bus.unpack("<L", rx_frame.data[0:4])[0]
+            else:
+                error = bus.unpack("<L", rx_frame.data[0:4])[0]
+                if error != self.error[i]:
+                    _, _, joint_name = self.joints[i]
+                    print(f"Warning: {joint_name} error flags changed: {recoil.ErrorCode.decode(error) or 'NO_ERROR'}")
+                self.error[i] = error
@@ -6,7 +6,11 @@ from omegaconf import OmegaConf
 import numpy as np
 
 import berkeley_humanoid_lite_lowlevel.recoil as recoil
-from berkeley_humanoid_lite_lowlevel.robot.imu import SerialImu, Baudrate
+from berkeley_humanoid_lite_lowlevel.robot.actuators import ActuatorGroup
+from berkeley_humanoid_lite_lowlevel.robot.health import ActuatorHealthMonitor
+from berkeley_humanoid_lite_lowlevel.robot.float_imu import FloatImu
+from berkeley_humanoid_lite_lowlevel.robot.imu import SerialImu, ImuProfile, Baudrate
+from berkeley_humanoid_lite_lowlevel.robot.sensor_io import SensorEventLoop
 from berkeley_humanoid_lite_lowlevel.policy.gamepad import Se2Gamepad
 
 
@@ -24,7 +28,13 @@ def linear_interpolate(start: np.ndarray, end: np.ndarray, percentage: float) ->
 
 
 class Humanoid:
-    def __init__(self):
+    """
+    Args:
+        imu_type (str): IMU to use, "hiwonder" for SerialImu or "float" for FloatImu
+        imu_sample_delay (float | None): Age of the IMU samples used in the observations, in seconds.
+            None for one IMU sample period plus the transfer time of a sample, 0 for the newest sample.
+    """
+    def __init__(self, imu_type: str = "hiwonder", imu_sample_delay: float | None = None):
 
         # self.left_arm_transport = recoil.Bus("can0")
         # self.right_arm_transport = recoil.Bus("can1")
@@ -62,8 +72,29 @@ class Humanoid:
             (self.right_leg_transport,  14, "right_ankle_roll_joint"        ),  # noqa: E241
         ]
 
-        self.imu = SerialImu(baudrate=Baudrate.BAUD_460800)
-        self.imu.run_forever()
+        self.actuators = ActuatorGroup(self.joints)
+        self.health_monitor = ActuatorHealthMonitor(self.joints)
+
+        # serial sensors are serviced by one event loop thread
+        self.sensor_loop = SensorEventLoop()
+
+        match imu_type:
+            case "hiwonder":
+                self.imu = SerialImu(baudrate=Baudrate.BAUD_460800)
+                if not self.imu.configure(ImuProfile(baudrate=Baudrate.BAUD_460800)):
+                    print("Warning: IMU does not stream the expected frames")
+            case "float":
+                self.imu = FloatImu()
+            case _:
+                raise ValueError(f"Unknown IMU type: {imu_type}")
+        self.imu.attach(self.sensor_loop)
+
+        self.sensor_loop.run_forever()
+
+        # the IMU is sampled this far behind the current time, so that a newer sample to
+        # interpolate towards has already arrived and the sample age is the same every tick
+        self.imu_sample_delay: float = self.imu.sample_delay() if imu_sample_delay is None else imu_sample_delay
+        print(f"IMU sample delay: {self.imu_sample_delay * 1000:.1f} ms")
 
         # Start joystick thread
         self.command_controller = Se2Gamepad()
@@ -72,6 +103,9 @@ class Humanoid:
         self.state = State.IDLE
         self.next_state = State.IDLE
 
+        # set once a serial sensor failed, the robot then stays in damping
+        self.has_sensor_failure = False
+
         self.rl_init_positions = np.array([
             0.0, 0.0, -0.2,
             0.4,
@@ -99,6 +133,26 @@ class Humanoid:
             0.0, 0.0
         ], dtype=np.float32)
 
+        # joint positions at the mechanical limits used for calibration
+        self.calibration_limit_positions = np.deg2rad(np.array([
+            -10.0, +33.75, +56.25,
+            0.0,
+            -45.0, -15.0,
+            +10.0, -33.75, +56.25,
+            0.0,
+            -45.0, +15.0
+        ], dtype=np.float32))
+
+        # side of the calibration limit, -1: lower limit, +1: upper limit
+        self.calibration_limit_sides = np.array([
+            -1, +1, +1,
+            -1,
+            -1, -1,
+            +1, -1, +1,
+            -1,
+            -1, +1
+        ], dtype=np.float32)
+
         self.n_lowlevel_states = 4 + 3 + 12 + 12 + 1 + 3
         self.lowlevel_states = np.zeros(self.n_lowlevel_states, dtype=np.float32)
 
@@ -107,7 +161,17 @@ class Humanoid:
         self.joint_position_measured = np.zeros(len(self.joints), dtype=np.float32)
         self.joint_velocity_measured = np.zeros(len(self.joints), dtype=np.float32)
 
+        # actuator frame commands and measurements of the pipelined joint update
+        self._position_command = np.zeros(len(self.joints), dtype=np.float32)
+        self._velocity_command = np.zeros(len(self.joints), dtype=np.float32)
+        self._position_raw = np.zeros(len(self.joints), dtype=np.float32)
+        self._velocity_raw = np.zeros(len(self.joints), dtype=np.float32)
+        self._joint_value = np.zeros(len(self.joints), dtype=np.float32)
+        self._is_received = np.zeros(len(self.joints), dtype=bool)
+
         # used for RL initialization controller
+        # number of step() calls to move from the current pose to the RL initialization pose
+        self.rl_init_steps = 100
         self.init_percentage = 0.0
         self.starting_positions = np.zeros_like(self.joint_position_target, dtype=np.float32)
 
@@ -127,28 +191,18 @@ class Humanoid:
         self.joint_kd[:] = 2
         self.torque_limit[:] = 4
 
-        for i, entry in enumerate(self.joints):
-            bus, device_id, joint_name = entry
+        print(f"Initializing joints with kp: {self.joint_kp}, kd: {self.joint_kd}, torque limit: {self.torque_limit}")
 
-            print(f"Initializing joint {joint_name}:")
-            print(f"  kp: {self.joint_kp[i]}, kd: {self.joint_kd[i]}, torque limit: {self.torque_limit[i]}")
+        if not self.actuators.initialize(self.joint_kp, self.joint_kd, self.torque_limit, recoil.Mode.DAMPING):
+            print("Warning: some joints did not confirm their configuration")
 
-            # Set the joint mode to idle
-            bus.set_mode(device_id, recoil.Mode.IDLE)
-            time.sleep(0.001)
-            bus.write_position_kp(device_id, self.joint_kp[i])
-            time.sleep(0.001)
-            bus.write_position_kd(device_id, self.joint_kd[i])
-            time.sleep(0.001)
-            bus.write_torque_limit(device_id, self.torque_limit[i])
-            time.sleep(0.001)
-            bus.feed(device_id)
-            bus.set_mode(device_id, recoil.Mode.DAMPING)
+        self.health_monitor.start()
 
         print("Motors enabled")
 
     def stop(self):
-        self.imu.stop()
+        self.health_monitor.stop()
+        self.sensor_loop.stop()
         self.command_controller.stop()
 
         for entry in self.joints:
@@ -167,6 +221,8 @@ class Humanoid:
             bus, device_id, _ = entry
             bus.set_mode(device_id, recoil.Mode.IDLE)
 
+        self.actuators.stop()
+
         # self.left_arm_transport.stop()
         # self.right_arm_transport.stop()
         self.left_leg_transport.stop()
@@ -180,10 +236,12 @@ class Humanoid:
         mode = self.lowlevel_states[31:32]
         velocity_commands = self.lowlevel_states[32:35]
 
-        imu_quaternion[:] = self.imu.quaternion[:]
+        if not self.imu.sample_at(time.monotonic() - self.imu_sample_delay, imu_quaternion, imu_angular_velocity):
+            imu_quaternion[:] = self.imu.quaternion[:]
+            imu_angular_velocity[:] = self.imu.angular_velocity[:]
 
         # IMU returns angular velocity in deg/s, we need rad/s
-        imu_angular_velocity[:] = np.deg2rad(self.imu.angular_velocity[:])
+        np.deg2rad(imu_angular_velocity, out=imu_angular_velocity)
 
         joint_positions[:] = self.joint_position_measured[:]
         joint_velocities[:] = self.joint_velocity_measured[:]
@@ -195,38 +253,35 @@ class Humanoid:
 
         self.next_state = self.command_controller.commands["mode_switch"]
 
+        # the IMU readings are frozen once its device failed, so the policy must not run
+        if not self.sensor_loop.is_healthy():
+            if not self.has_sensor_failure:
+                failures = ", ".join(f"{name}: {error}" for name, error in self.sensor_loop.get_failures().items())
+                print(f"Error: sensor failure ({failures or 'the sensor loop stopped'}), switching to idle mode")
+                self.has_sensor_failure = True
+            self.next_state = State.IDLE
+
         return self.lowlevel_states
 
-    def update_joint_group(self, joint_id_l, joint_id_r):
+    def update_joints(self):
         # adjust direction and offset of target values
-        position_target_l = (self.joint_position_target[joint_id_l] + self.position_offsets[joint_id_l]) * self.joint_axis_directions[joint_id_l]
-        position_target_r = (self.joint_position_target[joint_id_r] + self.position_offsets[joint_id_r]) * self.joint_axis_directions[joint_id_r]
-
-        self.joints[joint_id_l][0].transmit_pdo_2(self.joints[joint_id_l][1], position_target=position_target_l, velocity_target=0.0)
-        self.joints[joint_id_r][0].transmit_pdo_2(self.joints[joint_id_r][1], position_target=position_target_r, velocity_target=0.0)
+        np.add(self.joint_position_target, self.position_offsets, out=self._position_command)
+        self._position_command *= self.joint_axis_directions
 
-        position_measured_l, velocity_measured_l = self.joints[joint_id_l][0].receive_pdo_2(self.joints[joint_id_l][1])
-        position_measured_r, velocity_measured_r = self.joints[joint_id_r][0].receive_pdo_2(self.joints[joint_id_r][1])
+        # communicate with actuators, joints that do not respond keep their last measurement
+        self._position_raw.fill(np.nan)
+        self._velocity_raw.fill(np.nan)
+        self.actuators.exchange_pdo_2(self._position_command, self._velocity_command, self._position_raw, self._velocity_raw)
 
-        # adjust direction and offset of target values
-        if position_measured_l is not None:
-            self.joint_position_measured[joint_id_l] = (position_measured_l * self.joint_axis_directions[joint_id_l]) - self.position_offsets[joint_id_l]
-        if velocity_measured_l is not None:
-            self.joint_velocity_measured[joint_id_l] = velocity_measured_l * self.joint_axis_directions[joint_id_l]
-        if position_measured_r is not None:
-            self.joint_position_measured[joint_id_r] = (position_measured_r * self.joint_axis_directions[joint_id_r]) - self.position_offsets[joint_id_r]
-        if velocity_measured_r is not None:
-            self.joint_velocity_measured[joint_id_r] = velocity_measured_r * self.joint_axis_directions[joint_id_r]
-
-    def update_joints(self):
+        # adjust direction and offset of measured values
+        np.isfinite(self._position_raw, out=self._is_received)
+        np.multiply(self._position_raw, self.joint_axis_directions, out=self._joint_value)
+        self._joint_value -= self.position_offsets
+        np.copyto(self.joint_position_measured, self._joint_value, where=self._is_received)
 
-        # communicate with actuators
-        self.update_joint_group(0, 6)
-        self.update_joint_group(1, 7)
-        self.update_joint_group(2, 8)
-        self.update_joint_group(3, 9)
-        self.update_joint_group(4, 10)
-        self.update_joint_group(5, 11)
+        np.isfinite(self._velocity_raw, out=self._is_received)
+        np.multiply(self._velocity_raw, self.joint_axis_directions, out=self._joint_value)
+        np.copyto(self.joint_velocity_measured, self._joint_value, where=self._is_received)
 
     def reset(self):
         obs = self.get_observations()
@@ -255,7 +310,7 @@ class Humanoid:
             case State.RL_INIT:
                 print(f"init: {self.init_percentage:.2f}")
                 if self.init_percentage < 1.0:
-                    self.init_percentage += 1 / 100.0
+                    self.init_percentage += 1 / self.rl_init_steps
                     self.init_percentage = min(self.init_percentage, 1.0)
 
                     self.joint_position_target = linear_interpolate(self.starting_positions, self.rl_init_positions, self.init_percentage)
@@ -273,8 +328,7 @@ class Humanoid:
                             bus.set_mode(device_id, recoil.Mode.DAMPING)
 
             case State.RL_RUNNING:
-                for i in range(len(self.joints)):
-                    self.joint_position_target[i] = actions[i]
+                self.joint_position_target[:] = actions[:len(self.joints)]
 
                 if self.next_state == State.IDLE:
                     print("Switching to idle mode")
@@ -285,6 +339,7 @@ class Humanoid:
                         bus.set_mode(device_id, recoil.Mode.DAMPING)
 
         self.update_joints()
+        self.health_monitor.notify_tick()
 
         obs = self.get_observations()
 
@@ -1,5 +1,6 @@
 # Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
 
+import math
 import time
 import struct
 import threading
@@ -8,6 +9,10 @@ import numpy as np
 from loop_rate_limiters import RateLimiter
 import serial
 
+from berkeley_humanoid_lite_lowlevel.robot.attitude import MahonyFilter
+from berkeley_humanoid_lite_lowlevel.robot.sensor_io import SensorEventLoop
+from berkeley_humanoid_lite_lowlevel.robot.serial_transport import RecordingSerial, ReplaySerial
+
 
 class ImuRegisters:
     """
@@ -158,7 +163,432 @@ class Baudrate:
     # BAUD_921600     = 0x09
 
 
-class SerialImu:
+class ImuProfile:
+    """
+    Declarative output configuration of the HiWonder IMU.
+
+    Args:
+        frame_types (tuple[int, ...]): Frame types the IMU should stream, see FrameType
+        rate (int): Output rate, see SamplingRate
+        baudrate (int): Serial baud rate, see Baudrate
+    """
+    def __init__(
+        self,
+        frame_types: tuple[int, ...] = (FrameType.ACCELERATION, FrameType.ANGULAR_VELOCITY, FrameType.QUATERNION),
+        rate: int = SamplingRate.RATE_200_HZ,
+        baudrate: int = Baudrate.BAUD_460800,
+    ):
+        self.frame_types = frame_types
+        self.rate = rate
+        self.baudrate = baudrate
+
+
+def slerp(q0: np.ndarray, q1: np.ndarray, alpha: float, out: np.ndarray) -> np.ndarray:
+    """
+    Spherical linear interpolation between two unit quaternions.
+
+    Args:
+        q0 (np.ndarray): Start quaternion (w, x, y, z)
+        q1 (np.ndarray): End quaternion (w, x, y, z)
+        alpha (float): Interpolation fraction, 0 gives q0 and 1 gives q1
+        out (np.ndarray): Output quaternion
+
+    Returns:
+        np.ndarray: The output quaternion
+    """
+    dot = float(np.dot(q0, q1))
+
+    # take the shorter arc
+    sign = 1.0
+    if dot < 0.0:
+        dot = -dot
+        sign = -1.0
+
+    if dot > 0.9995:
+        # nearly parallel, fall back to normalized linear interpolation
+        w0 = 1.0 - alpha
+        w1 = alpha
+    else:
+        theta = math.acos(dot)
+        sin_theta = math.sin(theta)
+        w0 = math.sin((1.0 - alpha) * theta) / sin_theta
+        w1 = math.sin(alpha * theta) / sin_theta
+
+    np.multiply(q0, w0, out=out)
+    out += q1 * (sign * w1)
+    out /= np.linalg.norm(out)
+    return out
+
+
+class ImuSampleHistory:
+    """
+    Fixed-size ring of timestamped orientation and angular velocity samples.
+
+    The IMU thread is the only writer. Readers only look at the most recent samples,
+    which the writer does not overwrite until the ring wraps around, so no lock is
+    needed as long as the ring holds many more samples than one control period.
+
+    Args:
+        capacity (int): Number of samples kept
+    """
+    # layout of one slot of each array, to write a sample without numpy calls
+    TIMESTAMP_STRUCT = struct.Struct("=d")
+    QUATERNION_STRUCT = struct.Struct("=4f")
+    ANGULAR_VELOCITY_STRUCT = struct.Struct("=3f")
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+
+        # time.monotonic() of each sample, in seconds
+        self.timestamps: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        # (w, x, y, z)
+        self.quaternions: np.ndarray = np.zeros((capacity, 4), dtype=np.float32)
+        # (x, y, z) deg/s
+        self.angular_velocities: np.ndarray = np.zeros((capacity, 3), dtype=np.float32)
+
+        # total number of samples pushed, published after the sample data is written
+        self.count: int = 0
+
+    def extend(self, timestamps: np.ndarray, quaternions: np.ndarray, angular_velocities: np.ndarray) -> None:
+        """
+        Push a batch of samples, in time order.
+
+        The batch is written with at most two slice writes per array, one up to the end
+        of the ring and one for the part that wraps around.
+
+        Args:
+            timestamps (np.ndarray): Timestamps of shape (n, )
+            quaternions (np.ndarray): Quaternions of shape (n, 4)
+            angular_velocities (np.ndarray): Angular velocities of shape (n, 3)
+        """
+        n = len(timestamps)
+        # sequence number of the first written sample
+        first = self.count
+        if n > self.capacity:
+            # only the newest samples fit, the older ones count as pushed and overwritten
+            first += n - self.capacity
+            timestamps = timestamps[n - self.capacity:]
+            quaternions = quaternions[n - self.capacity:]
+            angular_velocities = angular_velocities[n - self.capacity:]
+
+        start = first % self.capacity
+        n_written = len(timestamps)
+        end = start + n_written
+        if end <= self.capacity:
+            self.timestamps[start:end] = timestamps
+            self.quaternions[start:end] = quaternions
+            self.angular_velocities[start:end] = angular_velocities
+        else:
+            n_head = self.capacity - start
+            self.timestamps[start:] = timestamps[:n_head]
+            self.quaternions[start:] = quaternions[:n_head]
+            self.angular_velocities[start:] = angular_velocities[:n_head]
+            self.timestamps[:end - self.capacity] = timestamps[n_head:]
+            self.quaternions[:end - self.capacity] = quaternions[n_head:]
+            self.angular_velocities[:end - self.capacity] = angular_velocities[n_head:]
+
+        self.count += n
+
+    def stage(self, index: int, timestamp: float, quaternion: list[float], angular_velocity: list[float]) -> None:
+        """
+        Write a sample after the published ones, without publishing it.
+
+        A batch of samples is staged one by one and published at once with `publish()`.
+
+        Args:
+            index (int): Position of the sample in the batch
+            timestamp (float): Timestamp
+            quaternion (list[float]): Quaternion (w, x, y, z)
+            angular_velocity (list[float]): Angular velocity (x, y, z)
+        """
+        slot = (self.count + index) % self.capacity
+        self.TIMESTAMP_STRUCT.pack_into(self.timestamps, slot * self.TIMESTAMP_STRUCT.size, timestamp)
+        self.QUATERNION_STRUCT.pack_into(self.quaternions, slot * self.QUATERNION_STRUCT.size, *quaternion)
+        self.ANGULAR_VELOCITY_STRUCT.pack_into(self.angular_velocities, slot * self.ANGULAR_VELOCITY_STRUCT.size, *angular_velocity)
+
+    def publish(self, n: int) -> None:
+        """
+        Publish the first n staged samples.
+        """
+        self.count += n
+
+    def _find(self, t: float, count: int) -> int:
+        """
+        Returns:
+            int: Sequence number of the latest sample at or before t, less than the oldest
+                sequence number if t precedes the whole history
+        """
+        oldest = max(count - self.capacity, 0)
+        i = count - 1
+        while i >= oldest and self.timestamps[i % self.capacity] > t:
+            i -= 1
+        return i
+
+    def sample_at(self, t: float, quaternion: np.ndarray, angular_velocity: np.ndarray) -> bool:
+        """
+        Interpolate the samples at the given time.
+
+        The quaternion is interpolated with slerp and the angular velocity linearly. Times
+        outside of the history are clamped to the oldest or the newest sample.
+
+        Args:
+            t (float): time.monotonic() to sample at
+            quaternion (np.ndarray): Output quaternion (w, x, y, z)
+            angular_velocity (np.ndarray): Output angular velocity (x, y, z) in deg/s
+
+        Returns:
+            bool: False if the history is empty and the outputs were not written
+        """
+        count = self.count
+        if count == 0:
+            return False
+
+        oldest = max(count - self.capacity, 0)
+        i = self._find(t, count)
+
+        if i >= count - 1 or i < oldest:
+            slot = (count - 1 if i >= count - 1 else oldest) % self.capacity
+            quaternion[:] = self.quaternions[slot]
+            angular_velocity[:] = self.angular_velocities[slot]
+            return True
+
+        slot0 = i % self.capacity
+        slot1 = (i + 1) % self.capacity
+        t0 = self.timestamps[slot0]
+        t1 = self.timestamps[slot1]
+        alpha = float((t - t0) / (t1 - t0)) if t1 > t0 else 1.0
+
+        slerp(self.quaternions[slot0], self.quaternions[slot1], alpha, out=quaternion)
+
+        np.subtract(self.angular_velocities[slot1], self.angular_velocities[slot0], out=angular_velocity)
+        angular_velocity *= alpha
+        angular_velocity += self.angular_velocities[slot0]
+        return True
+
+    def window(self, t0: float, t1: float, angular_velocity: np.ndarray) -> int:
+        """
+        Average the angular velocity of the samples within a time window.
+
+        Args:
+            t0 (float): Start of the window, time.monotonic()
+            t1 (float): End of the window, time.monotonic()
+            angular_velocity (np.ndarray): Output mean angular velocity (x, y, z) in deg/s
+
+        Returns:
+            int: Number of samples averaged. The output is not written if no sample is in the window.
+        """
+        count = self.count
+        oldest = max(count - self.capacity, 0)
+
+        n_samples = 0
+        i = self._find(t1, count)
+        while i >= oldest and self.timestamps[i % self.capacity] >= t0:
+            if n_samples == 0:
+                angular_velocity[:] = self.angular_velocities[i % self.capacity]
+            else:
+                angular_velocity += self.angular_velocities[i % self.capacity]
+            n_samples += 1
+            i -= 1
+
+        if n_samples > 1:
+            angular_velocity /= n_samples
+        return n_samples
+
+
+class ImuBase:
+    """
+    Common part of the serial IMU drivers.
+
+    Bytes are read from the serial port in bulk into a reusable receive buffer, either by
+    the reading thread of the driver or by a SensorEventLoop, and the subclass decodes
+    the complete frames in `_parse_buffer()`. The decoded orientation and angular
+    velocity are published as attributes and pushed into a timestamped sample history.
+
+    Args:
+        transport (serial.Serial | ReplaySerial): Opened serial port, or a replay of a recording
+        baudrate (int): Baud rate of the serial port, in bit/s
+        history_capacity (int): Number of samples kept in the history
+        record_path (str | None): Record the raw byte stream to this file
+        sample_rate (float): Nominal sample rate of the IMU, in Hz
+    """
+    FRAME_LENGTH = 1
+    BUFFER_SIZE = 4096
+
+    def __init__(
+        self,
+        transport: serial.Serial | ReplaySerial,
+        baudrate: int,
+        history_capacity: int = 256,
+        record_path: str | None = None,
+        sample_rate: float = 200.0,
+    ):
+        if record_path:
+            transport = RecordingSerial(transport, record_path)
+        self.ser: serial.Serial | RecordingSerial | ReplaySerial = transport
+
+        # time source of the frame timestamps, the recorded time when replaying faster than real time
+        self.clock = self.ser.clock if isinstance(self.ser, ReplaySerial) else time.monotonic
+        # transmission time of one byte (start bit, 8 data bits, stop bit), in seconds
+        self.byte_time: float = 10.0 / baudrate
+        # nominal rate of the samples in Hz, and number of bytes sent for every sample
+        self.sample_rate: float = sample_rate
+        self.sample_length: int = self.FRAME_LENGTH
+
+        print("Serial is Opened:", self.ser.is_open)
+
+        self.is_stopped: threading.Event = threading.Event()
+        self.is_stopped.clear()
+
+        # === IMU readings ===
+        # time.monotonic() of the latest decoded frame, in seconds
+        self.timestamp: float = 0.0
+        # (x, y, z) deg/s
+        self.angular_velocity: np.ndarray = np.zeros(3, dtype=np.float32)
+        # (w, x, y, z)
+        self.quaternion: np.ndarray = np.zeros(4, dtype=np.float32)
+
+        # timestamped quaternion and angular velocity samples
+        self.history: ImuSampleHistory = ImuSampleHistory(history_capacity)
+
+        # === Receive buffer ===
+        self._buffer: bytearray = bytearray(self.BUFFER_SIZE)
+        self._buffer_view: np.ndarray = np.frombuffer(self._buffer, dtype=np.uint8)
+        # number of valid bytes in the buffer
+        self._buffer_length: int = 0
+
+        # number of decoded frames
+        self.n_frames: int = 0
+        # number of times the parser lost the frame alignment
+        self.n_resyncs: int = 0
+
+    def __read_frames(self) -> None:
+        """
+        Read all the available bytes from the serial port and parse the complete frames.
+        """
+        # block until at least one frame worth of bytes is available, then take everything queued
+        n_bytes = min(max(self.ser.in_waiting, self.FRAME_LENGTH), len(self._buffer) - self._buffer_length)
+        data = self.ser.read(n_bytes)
+        self.feed(data, self.clock())
+
+    def feed(self, data: bytes, read_time: float) -> None:
+        """
+        Parse bytes received from the IMU.
+
+        Args:
+            data (bytes): Received bytes
+            read_time (float): time.monotonic() right after the bytes were read
+        """
+        length = self._buffer_length
+        n_bytes = len(data)
+        if n_bytes <= len(self._buffer) - length:
+            # the usual case, the whole read fits into the buffer
+            self._buffer[length:length + n_bytes] = data
+            self._buffer_length = self._parse_buffer(length + n_bytes, read_time)
+            return
+
+        view = memoryview(data)
+        while len(view) > 0:
+            n_bytes = min(len(view), len(self._buffer) - self._buffer_length)
+            self._buffer[self._buffer_length:self._buffer_length + n_bytes] = view[:n_bytes]
+            self._buffer_length += n_bytes
+            view = view[n_bytes:]
+
+            # the bytes not yet copied arrived after the ones in the buffer
+            self._buffer_length = self._parse_buffer(self._buffer_length, read_time - len(view) * self.byte_time)
+
+    def attach(self, loop: SensorEventLoop, coalesce_time: float = 0.0) -> None:
+        """
+        Service the IMU from a sensor event loop instead of its own reading thread.
+
+        Args:
+            loop (SensorEventLoop): Event loop, not started yet
+            coalesce_time (float): Minimum time between two reads of the serial port, in seconds
+        """
+        loop.add_device(self.ser, on_read=self._on_read, coalesce_time=coalesce_time, name=type(self).__name__)
+
+    def _on_read(self, data: bytes, read_time: float) -> None:
+        if isinstance(self.ser, RecordingSerial):
+            self.ser.record(data, read_time)
+        self.feed(data, read_time)
+
+    def _parse_buffer(self, length: int, read_time: float) -> int:
+        """
+        Decode the complete frames in the receive buffer.
+
+        Args:
+            length (int): Number of valid bytes in the buffer
+            read_time (float): time.monotonic() right after the last byte was read
+
+        Returns:
+            int: Number of bytes carried over to the next read
+        """
+        raise NotImplementedError
+
+    def sample_delay(self) -> float:
+        """
+        Shortest age of a sample that can be interpolated towards a newer one.
+
+        Returns:
+            float: One sample period plus the transfer time of one sample, in seconds
+        """
+        return 1.0 / self.sample_rate + self.sample_length * self.byte_time
+
+    def sample_at(self, t: float, quaternion: np.ndarray, angular_velocity: np.ndarray) -> bool:
+        """
+        Interpolate the orientation and angular velocity at the given time, see ImuSampleHistory.sample_at().
+        """
+        return self.history.sample_at(t, quaternion, angular_velocity)
+
+    def window(self, t0: float, t1: float, angular_velocity: np.ndarray) -> int:
+        """
+        Average the angular velocity over a time window, see ImuSampleHistory.window().
+        """
+        return self.history.window(t0, t1, angular_velocity)
+
+    def run(self) -> None:
+        """
+        Start the IMU reading loop.
+        """
+        self.start_time = time.time()
+        while not self.is_stopped.is_set():
+            self.__read_frames()
+
+            if isinstance(self.ser, ReplaySerial) and self.ser.is_finished:
+                print("IMU replay finished")
+                break
+
+        if isinstance(self.ser, RecordingSerial):
+            self.ser.close_recording()
+
+    def run_forever(self) -> None:
+        """
+        Start the IMU reading loop in a separate thread with high priority.
+        """
+        # self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread = threading.Thread(target=self.run)
+        self.thread.start()
+
+        # Set thread priority to high
+        try:
+            import os
+            import psutil
+            process = psutil.Process(os.getpid())
+            process.nice(0)  # Set process priority to high (-20 is highest, 19 is lowest)
+        except (ImportError, PermissionError):
+            print("Warning: Could not set thread priority. Running with default priority.")
+
+    def stop(self) -> None:
+        """
+        Stop the IMU reading loop.
+        """
+        self.is_stopped.set()
+
+        # return from a blocking read right away instead of waiting for the next byte or the timeout
+        if hasattr(self.ser, "cancel_read"):
+            self.ser.cancel_read()
+
+
+class SerialImu(ImuBase):
     """
     Driver for the HiWonder IM10A 10-axis USB IMU.
 
@@ -171,8 +601,71 @@ class SerialImu:
 
     The commands must be completed within 10 seconds, otherwise the IMU will
     automatically be locked.
+
+    When an attitude filter is given, the orientation is estimated on the host from the
+    acceleration and angular velocity frames at the gyroscope rate, and the quaternion
+    frames of the IMU are ignored, so the quaternion output can be turned off on the IMU.
+
+    The raw byte stream can be recorded to a file with `record_path`, and a recording can
+    be fed back into the driver by passing a ReplaySerial as `transport`.
     """
     FRAME_LENGTH = 11
+    FRAME_HEADER = 0x55
+
+    # header, frame type, 4 x int16 payload, checksum
+    FRAME_DTYPE = np.dtype([
+        ("header", np.uint8),
+        ("type", np.uint8),
+        ("data", "<i2", (4,)),
+        ("checksum", np.uint8),
+    ])
+    # frame type and payload, from the second byte of a frame
+    FRAME_STRUCT = struct.Struct("<B4h")
+
+    # buffers shorter than this are decoded frame by frame with struct, longer ones with
+    # numpy, whose fixed cost per call only pays off for many frames. Reads usually hold
+    # about one frame.
+    BULK_PARSE_SIZE = 24 * FRAME_LENGTH
+
+    # set_output_content() argument enabling each frame type
+    OUTPUT_CONTENT_ARGUMENTS = {
+        FrameType.TIME: "time",
+        FrameType.ACCELERATION: "acceleration",
+        FrameType.ANGULAR_VELOCITY: "angular_velocity",
+        FrameType.ANGLE: "angle",
+        FrameType.MAGNETIC_FIELD: "magnetic_field",
+        FrameType.PORT_STATUS: "port_status",
+        FrameType.BAROMETER_ALTITUDE: "pressure",
+        FrameType.LATITUDE_LONGITUDE: "gps",
+        FrameType.GROUND_SPEED: "velocity",
+        FrameType.QUATERNION: "quaternion",
+        FrameType.GPS_POSITION_ACCURACY: "gps_position_accuracy",
+    }
+
+    @staticmethod
+    def rate_to_hz(rate: int) -> float:
+        match rate:
+            case SamplingRate.RATE_0_2_HZ:
+                return 0.2
+            case SamplingRate.RATE_0_5_HZ:
+                return 0.5
+            case SamplingRate.RATE_1_HZ:
+                return 1.0
+            case SamplingRate.RATE_2_HZ:
+                return 2.0
+            case SamplingRate.RATE_5_HZ:
+                return 5.0
+            case SamplingRate.RATE_10_HZ:
+                return 10.0
+            case SamplingRate.RATE_20_HZ:
+                return 20.0
+            case SamplingRate.RATE_50_HZ:
+                return 50.0
+            case SamplingRate.RATE_100_HZ:
+                return 100.0
+            case SamplingRate.RATE_200_HZ:
+                return 200.0
+        return 0.0
 
     @staticmethod
     def baud_to_int(baudrate: int) -> int:
@@ -197,114 +690,432 @@ class SerialImu:
             #     return 921600
         return 0
 
-    def __init__(self, port: str = "/dev/ttyUSB0", baudrate: int = Baudrate.BAUD_115200, read_timeout=4):
+    def __init__(self, port: str = "/dev/ttyUSB0", baudrate: int = Baudrate.BAUD_115200, read_timeout=4, history_capacity: int = 256,
+                 attitude_filter: MahonyFilter | None = None,
+                 transport: serial.Serial | ReplaySerial | None = None, record_path: str | None = None):
         self.port: str = port
         self.baud: int = baudrate
         self.read_timeout: int = read_timeout
 
         baudrate_int = self.baud_to_int(baudrate)
-        self.ser: serial.Serial = serial.Serial(self.port, baudrate_int, timeout=self.read_timeout)
+        if transport is None:
+            transport = serial.Serial(self.port, baudrate_int, timeout=self.read_timeout)
 
-        print("Serial is Opened:", self.ser.is_open)
-
-        self.is_stopped: threading.Event = threading.Event()
-        self.is_stopped.clear()
+        super().__init__(transport, baudrate_int, history_capacity, record_path)
 
         # === IMU readings ===
-        # seconds
-        self.timestamp: float = 0.0
         # Celcius degree
         self.temperature: float = 0.0
         # (x, y, z) m/s^2
         self.acceleration: np.ndarray = np.zeros(3, dtype=np.float32)
-        # (x, y, z) deg/s
-        self.angular_velocity: np.ndarray = np.zeros(3, dtype=np.float32)
         # (yaw, pitch, roll) deg
         self.angle: np.ndarray = np.zeros(3, dtype=np.float32)
         # (x, y, z) μT
         self.magnetic_field: np.ndarray = np.zeros(3, dtype=np.float32)
-        # (w, x, y, z)
-        self.quaternion: np.ndarray = np.zeros(4, dtype=np.float32)
 
-        # self.__debug_last_time: float = time.perf_counter_ns()
+        # optional host-side orientation estimation
+        self.attitude_filter: MahonyFilter | None = attitude_filter
+        self._last_gyro_time: float = 0.0
+
+        # number of frames rejected by the checksum, each frame is counted once
+        self.n_checksum_errors: int = 0
+
+        # the default profile until `configure()` applies another one
+        self._set_profile(ImuProfile())
+
+        # === Per frame type statistics, indexed by the low nibble of the frame type ===
+        # plain lists, updated for every frame without the overhead of numpy scalars
+        # number of decoded frames
+        self.frame_counts: list[int] = [0] * 16
+        # time.monotonic() of the arrival of the latest frame, in seconds
+        self.frame_timestamps: list[float] = [0.0] * 16
+        # moving average of the time between frames, in seconds
+        self.frame_periods: list[float] = [0.0] * 16
+        # moving average and maximum of the time from the arrival to the decoding of a frame, in seconds
+        self.frame_latencies: list[float] = [0.0] * 16
+        self.frame_max_latencies: list[float] = [0.0] * 16
+
+        # number of samples decoded by `_parse_frames()` and staged in the history, which
+        # are published as one batch at the end of the parse
+        self._n_staged_samples: int = 0
 
-    def __read_frame(self) -> None:
+    def _parse_buffer(self, length: int, read_time: float) -> int:
         """
-        Parse a frame from the serial port.
+        Decode the complete frames in the receive buffer.
+
+        Incomplete bytes at the end are moved to the start of the buffer to be completed by
+        the next read.
+
+        Args:
+            length (int): Number of valid bytes in the buffer
+            read_time (float): time.monotonic() right after the last byte was read
+
+        Returns:
+            int: Number of bytes carried over to the next read
         """
-        start = self.ser.read(1)
-        start, = struct.unpack("<B", start)
-        if start != 0x55:
-            return
-        frame = self.ser.read(self.FRAME_LENGTH - 1)
+        if length < self.BULK_PARSE_SIZE:
+            start = self._parse_frames(length, read_time)
+        else:
+            start = self._parse_runs(length, read_time)
 
-        frame_type, data1, data2, data3, data4, sumcrc = struct.unpack("<BhhhhB", frame)
+        # carry the partial frame over
+        remaining = length - start
+        if remaining > 0 and start > 0:
+            self._buffer[:remaining] = self._buffer[start:length]
+        return remaining
 
-        # print(type, data1, data2, data3, data4, sumcrc)
-        if frame_type == FrameType.TIME:
-            _, year, month, day, hour, minute, second, millisecond = struct.unpack("<BBBBhB", frame)
+    def _resynchronize(self, start: int, length: int) -> int:
+        """
+        Returns:
+            int: Position of the next header byte after `start`, `length` if there is none
+        """
+        self.n_resyncs += 1
+        header = self._buffer.find(self.FRAME_HEADER, start + 1, length)
+        return length if header < 0 else header
 
-        elif frame_type == FrameType.ACCELERATION:
-            self.acceleration[0] = data1 * 16.0 / 32768.0  # g
-            self.acceleration[1] = data2 * 16.0 / 32768.0  # g
-            self.acceleration[2] = data3 * 16.0 / 32768.0  # g
-            self.temperature = data4 / 100.0  # Celsius
+    def _is_corrupted_frame(self, next_start: int, length: int) -> bool:
+        """
+        Tell a frame that failed the checksum from a header byte inside the payload of another frame.
 
-        elif frame_type == FrameType.ANGULAR_VELOCITY:
-            self.angular_velocity[0] = data1 * 2000.0 / 32768.0  # deg/s
-            self.angular_velocity[1] = data2 * 2000.0 / 32768.0  # deg/s
-            self.angular_velocity[2] = data3 * 2000.0 / 32768.0  # deg/s
+        A corrupted frame is followed by the next frame, while a misplaced header byte is
+        usually not. At the end of the buffer, the failed frame is taken as a corrupted frame.
+
+        Args:
+            next_start (int): Position right after the failed frame
+            length (int): Number of valid bytes in the buffer
 
-            # for debugging
-            # print(f"frequency: {1.0 / ((time.perf_counter_ns() - self.__debug_last_time) / 1e9)} Hz")
-            # self.__debug_last_time = time.perf_counter_ns()
+        Returns:
+            bool: True if the failed frame is a corrupted frame, to be counted and skipped
+        """
+        buffer = self._buffer
+        return (
+            length - next_start < 2
+            or (buffer[next_start] == self.FRAME_HEADER and buffer[next_start + 1] & 0xF0 == 0x50)
+        )
+
+    def _parse_frames(self, length: int, read_time: float) -> int:
+        """
+        Decode the complete frames in the receive buffer one by one.
+
+        A frame that fails the checksum is counted and skipped. When no frame starts at the
+        current position, the parser scans for the next header byte to resynchronize.
+        See `_is_corrupted_frame()` for how a corrupted frame is told from a header byte
+        inside a payload.
+
+        Args:
+            length (int): Number of valid bytes in the buffer
+            read_time (float): time.monotonic() right after the last byte was read
+
+        Returns:
+            int: Number of bytes consumed
+        """
+        buffer = self._buffer
+        frame_length = self.FRAME_LENGTH
+        checksum_index = frame_length - 1
+        start = 0
+        decode_time = self.clock()
+
+        while length - start >= frame_length:
+            if buffer[start] != self.FRAME_HEADER or buffer[start + 1] & 0xF0 != 0x50:
+                start = self._resynchronize(start, length)
+                continue
+
+            # the checksum is the low byte of the sum of the first 10 bytes
+            if sum(buffer[start:start + checksum_index]) & 0xFF != buffer[start + checksum_index]:
+                if self._is_corrupted_frame(start + frame_length, length):
+                    self.n_checksum_errors += 1
+                    start += frame_length
+                else:
+                    start = self._resynchronize(start, length)
+                continue
+
+            frame_type, x, y, z, w = self.FRAME_STRUCT.unpack_from(buffer, start + 1)
+            start += frame_length
+            # arrival time of the last byte of the frame, assuming the bytes arrived back to back
+            self._decode_values(frame_type, x, y, z, w, read_time - (length - start) * self.byte_time, decode_time)
+
+        if self._n_staged_samples > 0:
+            self.history.publish(self._n_staged_samples)
+            self._n_staged_samples = 0
+        return start
+
+    def _decode_values(self, frame_type: int, x: int, y: int, z: int, w: int, arrival_time: float, decode_time: float) -> None:
+        """
+        Update the readings and the statistics from a single frame, and stage the history sample.
+
+        Args:
+            frame_type (int): Frame type, see FrameType
+            x, y, z, w (int): Payload values
+            arrival_time (float): Estimated arrival time of the frame
+            decode_time (float): time.monotonic() of the decoding
+        """
+        if frame_type == FrameType.ANGULAR_VELOCITY:
+            angular_velocity = self.angular_velocity
+            angular_velocity[0] = x * (2000.0 / 32768.0)  # deg/s
+            angular_velocity[1] = y * (2000.0 / 32768.0)
+            angular_velocity[2] = z * (2000.0 / 32768.0)
+
+            if self.attitude_filter is not None:
+                dt = min(max(arrival_time - self._last_gyro_time, 0.0), 0.1)
+                self._last_gyro_time = arrival_time
+                self.attitude_filter.update(np.deg2rad(angular_velocity), self.acceleration, dt)
+                self.quaternion[:] = self.attitude_filter.quaternion
+                self.history.stage(self._n_staged_samples, arrival_time, self.attitude_filter.quaternion.tolist(), angular_velocity.tolist())
+                self._n_staged_samples += 1
+
+        elif frame_type == FrameType.QUATERNION:
+            if self.attitude_filter is None:
+                quaternion = [x * (1.0 / 32768.0), y * (1.0 / 32768.0), z * (1.0 / 32768.0), w * (1.0 / 32768.0)]
+                self.quaternion[0] = quaternion[0]
+                self.quaternion[1] = quaternion[1]
+                self.quaternion[2] = quaternion[2]
+                self.quaternion[3] = quaternion[3]
+                self.history.stage(self._n_staged_samples, arrival_time, quaternion, self.angular_velocity.tolist())
+                self._n_staged_samples += 1
+
+        elif frame_type == FrameType.ACCELERATION:
+            acceleration = self.acceleration
+            acceleration[0] = x * (16.0 / 32768.0)  # g
+            acceleration[1] = y * (16.0 / 32768.0)
+            acceleration[2] = z * (16.0 / 32768.0)
+            self.temperature = w / 100.0  # Celsius
 
         elif frame_type == FrameType.ANGLE:
-            self.angle[0] = data1 * 180.0 / 32768.0  # deg
-            self.angle[1] = data2 * 180.0 / 32768.0  # deg
-            self.angle[2] = data3 * 180.0 / 32768.0  # deg
+            self.angle[0] = x * (180.0 / 32768.0)  # deg
+            self.angle[1] = y * (180.0 / 32768.0)
+            self.angle[2] = z * (180.0 / 32768.0)
 
         elif frame_type == FrameType.MAGNETIC_FIELD:
-            self.magnetic_field[0] = data1 * 1.0 / 32768.0
-            self.magnetic_field[1] = data2 * 1.0 / 32768.0
-            self.magnetic_field[2] = data3 * 1.0 / 32768.0
+            self.magnetic_field[0] = x * (1.0 / 32768.0)
+            self.magnetic_field[1] = y * (1.0 / 32768.0)
+            self.magnetic_field[2] = z * (1.0 / 32768.0)
 
-        elif frame_type == FrameType.QUATERNION:
-            self.quaternion[0] = data1 * 1.0 / 32768.0
-            self.quaternion[1] = data2 * 1.0 / 32768.0
-            self.quaternion[2] = data3 * 1.0 / 32768.0
-            self.quaternion[3] = data4 * 1.0 / 32768.0
+        self.n_frames += 1
+        self._update_statistics(frame_type & 0x0F, 1, arrival_time, decode_time)
+        self.timestamp = arrival_time
 
-    def run(self) -> None:
+    def _parse_runs(self, length: int, read_time: float) -> int:
         """
-        Start the IMU reading loop.
+        Decode the complete frames in the receive buffer in bulk.
+
+        The frames are decoded in aligned runs that start with the header byte and a valid
+        frame type. Frames of a run that fail the checksum are counted and skipped, as in
+        `_parse_frames()`. When a run breaks, or its last frame is a misplaced header byte,
+        the parser scans for the next header byte to resynchronize.
+
+        Args:
+            length (int): Number of valid bytes in the buffer
+            read_time (float): time.monotonic() right after the last byte was read
+
+        Returns:
+            int: Number of bytes consumed
         """
-        self.start_time = time.time()
-        while not self.is_stopped.is_set():
-            self.__read_frame()
+        view = self._buffer_view
+        start = 0
 
-    def run_forever(self) -> None:
+        is_synchronized = True
+
+        while length - start >= self.FRAME_LENGTH:
+            if not is_synchronized or view[start] != self.FRAME_HEADER or view[start + 1] & 0xF0 != 0x50:
+                # skip to the next header byte
+                headers = np.flatnonzero(view[start + 1:length] == self.FRAME_HEADER)
+                self.n_resyncs += 1
+                if headers.size == 0:
+                    start = length
+                    break
+                start += 1 + int(headers[0])
+                is_synchronized = True
+                continue
+
+            n_frames = (length - start) // self.FRAME_LENGTH
+            frames = view[start:start + n_frames * self.FRAME_LENGTH].reshape(n_frames, self.FRAME_LENGTH)
+            misaligned = np.flatnonzero((frames[:, 0] != self.FRAME_HEADER) | (frames[:, 1] & 0xF0 != 0x50))
+            if misaligned.size > 0:
+                n_frames = int(misaligned[0])
+                frames = frames[:n_frames]
+
+            # the checksum is the low byte of the sum of the first 10 bytes
+            is_valid = frames[:, :self.FRAME_LENGTH - 1].sum(axis=1, dtype=np.uint8) == frames[:, self.FRAME_LENGTH - 1]
+
+            # every frame but the last is followed by another frame of the run, so a failed
+            # checksum means a corrupted frame. The last one may be a misplaced header byte.
+            if not is_valid[-1] and not self._is_corrupted_frame(start + n_frames * self.FRAME_LENGTH, length):
+                n_frames -= 1
+                is_valid = is_valid[:n_frames]
+                is_synchronized = False
+
+            n_valid = int(np.count_nonzero(is_valid))
+            self.n_checksum_errors += n_frames - n_valid
+
+            if n_valid > 0:
+                # arrival time of the last byte of each frame, assuming the bytes arrived back to back
+                frame_ends = start + self.FRAME_LENGTH * np.arange(1, n_frames + 1)
+                arrival_times = read_time - (length - frame_ends) * self.byte_time
+
+                self._decode_frames(start, n_frames, is_valid, arrival_times)
+            start += n_frames * self.FRAME_LENGTH
+
+        return start
+
+    def _decode_frames(self, offset: int, n_frames: int, is_valid: np.ndarray, arrival_times: np.ndarray) -> None:
         """
-        Start the IMU reading loop in a separate thread with high priority.
+        Decode a run of aligned frames, keeping the latest valid frame of each type.
+
+        Args:
+            offset (int): Byte offset of the first frame in the buffer
+            n_frames (int): Number of frames in the run
+            is_valid (np.ndarray): Checksum result of each frame
+            arrival_times (np.ndarray): Estimated arrival time of each frame
         """
-        # self.thread = threading.Thread(target=self.run, daemon=True)
-        self.thread = threading.Thread(target=self.run)
-        self.thread.start()
+        frames = np.frombuffer(self._buffer, dtype=self.FRAME_DTYPE, count=n_frames, offset=offset)
+        valid_indices = np.flatnonzero(is_valid)
+        frame_types = frames["type"][valid_indices]
+        self.n_frames += valid_indices.size
 
-        # Set thread priority to high
-        try:
-            import os
-            import psutil
-            process = psutil.Process(os.getpid())
-            process.nice(0)  # Set process priority to high (-20 is highest, 19 is lowest)
-        except (ImportError, PermissionError):
-            print("Warning: Could not set thread priority. Running with default priority.")
+        decode_time = self.clock()
 
-    def stop(self) -> None:
+        if self.attitude_filter is not None:
+            self._update_attitude(frames, valid_indices, frame_types, arrival_times)
+        else:
+            self._push_history(frames, valid_indices, frame_types, arrival_times)
+
+        # index of the last occurrence of each frame type, and the number of occurrences
+        unique_types, reverse_indices, counts = np.unique(frame_types[::-1], return_index=True, return_counts=True)
+        for frame_type, index, count in zip(unique_types, valid_indices[valid_indices.size - 1 - reverse_indices], counts):
+            frame_type = int(frame_type)
+            self._decode_frame(frame_type, frames["data"][index])
+            self._update_statistics(frame_type & 0x0F, int(count), float(arrival_times[index]), decode_time)
+
+        self.timestamp = float(arrival_times[valid_indices[-1]])
+
+    def _push_history(self, frames: np.ndarray, valid_indices: np.ndarray, frame_types: np.ndarray, arrival_times: np.ndarray) -> None:
         """
-        Stop the IMU reading loop.
+        Push every quaternion frame of a run into the history, paired with the latest
+        angular velocity frame received before it.
         """
-        self.is_stopped.set()
+        is_quaternion = frame_types == FrameType.QUATERNION
+        if not np.any(is_quaternion):
+            return
+
+        quaternion_indices = valid_indices[is_quaternion]
+        gyro_indices = valid_indices[frame_types == FrameType.ANGULAR_VELOCITY]
+
+        quaternions = frames["data"][quaternion_indices] * np.float32(1.0 / 32768.0)
+
+        # angular velocity frames of this run come first, then the one decoded before the run
+        gyro_data = np.empty((gyro_indices.size + 1, 3), dtype=np.float32)
+        gyro_data[:-1] = frames["data"][gyro_indices, 0:3] * np.float32(2000.0 / 32768.0)
+        gyro_data[-1] = self.angular_velocity
+        angular_velocities = gyro_data[np.searchsorted(gyro_indices, quaternion_indices) - 1]
+
+        self.history.extend(arrival_times[quaternion_indices], quaternions, angular_velocities)
+
+    def _update_attitude(self, frames: np.ndarray, valid_indices: np.ndarray, frame_types: np.ndarray, arrival_times: np.ndarray) -> None:
+        """
+        Run the attitude filter on every angular velocity frame of a run, with the latest
+        acceleration frame received before it, and push the estimates into the history.
+        """
+        is_motion = (frame_types == FrameType.ACCELERATION) | (frame_types == FrameType.ANGULAR_VELOCITY)
+        motion_indices = valid_indices[is_motion]
+        is_gyro = frame_types[is_motion] == FrameType.ANGULAR_VELOCITY
+        if not np.any(is_gyro):
+            return
+
+        n_gyro = int(np.count_nonzero(is_gyro))
+        scales = np.where(is_gyro, np.float32(2000.0 / 32768.0), np.float32(16.0 / 32768.0))
+        readings = frames["data"][motion_indices, 0:3] * scales[:, None]
+
+        quaternions = np.empty((n_gyro, 4), dtype=np.float32)
+        angular_velocities = readings[is_gyro]
+        timestamps = arrival_times[motion_indices[is_gyro]]
+
+        k = 0
+        for reading, gyro in zip(readings, is_gyro):
+            if not gyro:
+                self.acceleration[:] = reading
+                continue
+
+            timestamp = timestamps[k]
+            dt = min(max(timestamp - self._last_gyro_time, 0.0), 0.1)
+            self._last_gyro_time = timestamp
+
+            self.attitude_filter.update(np.deg2rad(reading), self.acceleration, dt)
+            quaternions[k] = self.attitude_filter.quaternion
+            k += 1
+
+        self.quaternion[:] = self.attitude_filter.quaternion
+        self.history.extend(timestamps, quaternions, angular_velocities)
+
+    def _update_statistics(self, slot: int, count: int, arrival_time: float, decode_time: float) -> None:
+        alpha = 0.05
+
+        if self.frame_counts[slot] > 0:
+            period = (arrival_time - self.frame_timestamps[slot]) / count
+            self.frame_periods[slot] += alpha * (period - self.frame_periods[slot])
+
+        latency = decode_time - arrival_time
+        self.frame_latencies[slot] += alpha * (latency - self.frame_latencies[slot])
+        self.frame_max_latencies[slot] = max(self.frame_max_latencies[slot], latency)
+
+        self.frame_counts[slot] += count
+        self.frame_timestamps[slot] = arrival_time
+
+    def get_sample_age(self, frame_type: int) -> float:
+        """
+        Args:
+            frame_type (int): Frame type, see FrameType
+
+        Returns:
+            float: Time since the latest frame of the given type arrived, in seconds. Infinite if none arrived yet.
+        """
+        slot = frame_type & 0x0F
+        if self.frame_counts[slot] == 0:
+            return float("inf")
+        return self.clock() - self.frame_timestamps[slot]
+
+    def get_statistics(self) -> dict[str, dict[str, float]]:
+        """
+        Returns:
+            dict[str, dict[str, float]]: Count, rate in Hz and latency in ms of every received frame type
+        """
+        statistics = {}
+        for name, frame_type in vars(FrameType).items():
+            if name.startswith("_"):
+                continue
+            slot = frame_type & 0x0F
+            if self.frame_counts[slot] == 0:
+                continue
+            statistics[name] = {
+                "count": self.frame_counts[slot],
+                "rate": 1.0 / self.frame_periods[slot] if self.frame_periods[slot] > 0 else 0.0,
+                "latency": self.frame_latencies[slot] * 1000,
+                "max_latency": self.frame_max_latencies[slot] * 1000,
+            }
+        return statistics
+
+    def _decode_frame(self, frame_type: int, data: np.ndarray) -> None:
+        """
+        Update the readings from the payload of a frame.
+
+        Args:
+            frame_type (int): Frame type, see FrameType
+            data (np.ndarray): Four int16 payload values
+        """
+        if frame_type == FrameType.ACCELERATION:
+            self.acceleration[:] = data[0:3] * (16.0 / 32768.0)  # g
+            self.temperature = data[3] / 100.0  # Celsius
+
+        elif frame_type == FrameType.ANGULAR_VELOCITY:
+            self.angular_velocity[:] = data[0:3] * (2000.0 / 32768.0)  # deg/s
+
+        elif frame_type == FrameType.ANGLE:
+            self.angle[:] = data[0:3] * (180.0 / 32768.0)  # deg
+
+        elif frame_type == FrameType.MAGNETIC_FIELD:
+            self.magnetic_field[:] = data[0:3] * (1.0 / 32768.0)
+
+        elif frame_type == FrameType.QUATERNION and self.attitude_filter is None:
+            self.quaternion[:] = data * (1.0 / 32768.0)
 
     def unlock(self) -> None:
         """
@@ -393,41 +1204,146 @@ class SerialImu:
         # wait for the baudrate to be set
         time.sleep(0.1)
 
-        # reopen the serial port with the new baudrate
-        del self.ser
+        # reconfigure the serial port with the new baudrate
+        self._set_port_baudrate(baudrate)
+
+    def _set_port_baudrate(self, baudrate: int) -> None:
+        self.baud = baudrate
         baudrate_int = self.baud_to_int(baudrate)
-        self.ser = serial.Serial(self.port, baudrate_int, timeout=self.read_timeout)
+        self.ser.baudrate = baudrate_int
+        self.byte_time = 10.0 / baudrate_int
+
+    def _set_profile(self, profile: ImuProfile) -> None:
+        self.sample_rate = self.rate_to_hz(profile.rate)
+        self.sample_length = len(profile.frame_types) * self.FRAME_LENGTH
+
+    def probe(self, duration: float = 0.25) -> dict[int, float]:
+        """
+        Listen to the IMU at the current baud rate.
+
+        Must not be called while the reading thread or an event loop is servicing the IMU.
+
+        Args:
+            duration (float): Listening time, in seconds
+
+        Returns:
+            dict[int, float]: Measured rate in Hz of every frame type received with a valid checksum
+        """
+        self.ser.reset_input_buffer()
+        self._buffer_length = 0
+        start_counts = list(self.frame_counts)
+
+        # a silent port must not block the read past the end of the probe
+        read_timeout = self.ser.timeout
+        deadline = time.monotonic() + duration
+        try:
+            while (time_left := deadline - time.monotonic()) > 0:
+                self.ser.timeout = time_left
+                data = self.ser.read(max(self.ser.in_waiting, 1))
+                if data:
+                    self.feed(data, self.clock())
+        finally:
+            self.ser.timeout = read_timeout
+
+        counts = [count - start_count for count, start_count in zip(self.frame_counts, start_counts)]
+        return {
+            frame_type: counts[frame_type & 0x0F] / duration
+            for frame_type in self.OUTPUT_CONTENT_ARGUMENTS if counts[frame_type & 0x0F] > 0
+        }
+
+    def detect_baudrate(self, candidates: list[int] | None = None, duration: float = 0.25) -> dict[int, float] | None:
+        """
+        Find the baud rate the IMU is streaming at, and switch the serial port to it.
+
+        Args:
+            candidates (list[int] | None): Baud rates to try first, see Baudrate. The other rates are tried afterwards.
+            duration (float): Listening time at each baud rate, in seconds
+
+        Returns:
+            dict[int, float] | None: Measured frame rates at the detected baud rate, None if the IMU was not found
+        """
+        all_baudrates = [value for name, value in vars(Baudrate).items() if name.startswith("BAUD_")]
+        ordered = list(dict.fromkeys([*(candidates or []), self.baud, *sorted(all_baudrates, reverse=True)]))
+
+        for baudrate in ordered:
+            self._set_port_baudrate(baudrate)
+            rates = self.probe(duration)
+            if rates:
+                return rates
+        return None
+
+    def configure(self, profile: ImuProfile, probe_duration: float = 0.25) -> bool:
+        """
+        Bring the IMU to the given output profile.
+
+        The current baud rate of the IMU is detected by probing. If the streamed frame
+        types, rate or baud rate differ from the profile, the IMU is unlocked, configured,
+        switched to the profile baud rate and saved, and the stream is checked again.
+        An IMU that is not detected at any baud rate is left untouched.
+
+        Must be called before the reading thread or an event loop services the IMU.
+
+        Args:
+            profile (ImuProfile): Output configuration to apply
+            probe_duration (float): Listening time of each probe, in seconds
+
+        Returns:
+            bool: True if the IMU streams exactly the profile frame types at the profile rate and baud rate
+        """
+        target_rate = self.rate_to_hz(profile.rate)
+        bandwidth = target_rate * len(profile.frame_types) * self.FRAME_LENGTH * 10
+        if bandwidth > self.baud_to_int(profile.baudrate):
+            print(f"Warning: IMU profile needs {bandwidth:.0f} bit/s, more than the {self.baud_to_int(profile.baudrate)} baud link")
+
+        def matches(rates: dict[int, float] | None) -> bool:
+            return (
+                rates is not None
+                and self.baud == profile.baudrate
+                and set(rates) == set(profile.frame_types)
+                and all(abs(rate - target_rate) <= 0.2 * target_rate for rate in rates.values())
+            )
+
+        rates = self.detect_baudrate([profile.baudrate], probe_duration)
+        if rates is None:
+            print("Warning: no IMU frames received at any baud rate, the IMU is not configured")
+            self._set_port_baudrate(profile.baudrate)
+            return False
+        if matches(rates):
+            print(f"IMU already configured at {self.baud_to_int(self.baud)} baud")
+            self._set_profile(profile)
+            return True
+        print(f"IMU detected at {self.baud_to_int(self.baud)} baud, streaming "
+              f"{', '.join(f'0x{frame_type:02X}: {rate:.0f} Hz' for frame_type, rate in rates.items())}")
+
+        self.unlock()
+        time.sleep(0.1)
+        self.set_output_content(**{
+            self.OUTPUT_CONTENT_ARGUMENTS[frame_type]: True for frame_type in profile.frame_types
+        })
+        time.sleep(0.1)
+        self.set_sampling_rate(profile.rate)
+        if self.baud != profile.baudrate:
+            self.set_baudrate(profile.baudrate)
+        time.sleep(0.1)
+        self.save()
+        time.sleep(0.1)
+
+        rates = self.probe(probe_duration)
+        if not matches(rates):
+            print(f"Warning: IMU configuration failed, streaming "
+                  f"{', '.join(f'0x{frame_type:02X}: {rate:.0f} Hz' for frame_type, rate in rates.items())}")
+            return False
+
+        print(f"IMU configured at {self.baud_to_int(self.baud)} baud")
+        self._set_profile(profile)
+        return True
 
 
 if __name__ == "__main__":
     imu = SerialImu(baudrate=Baudrate.BAUD_460800)
 
-    # change baudrate:
-    # imu.unlock()
-    # time.sleep(0.1)
-    # imu.set_baudrate(Baudrate.BAUD_115200)
-    # time.sleep(0.1)
-    # imu.save()
-
-    # set sampling rate:
-    # imu.unlock()
-    # imu.set_sampling_rate(SamplingRate.RATE_200_HZ)
-    # imu.save()
-
-    # # set output content:
-    # imu.unlock()
-    # time.sleep(0.1)
-    # imu.set_output_content(
-    #     acceleration=True,
-    #     angular_velocity=True,
-    #     quaternion=True,
-    # )
-    # time.sleep(0.1)
-    # imu.save()
-
-    # time.sleep(0.1)
-    # imu_reader.save()
-    # # time.sleep(0.2)
+    # detect the current settings and apply the output content, rate and baud rate if needed
+    imu.configure(ImuProfile())
 
     imu.run_forever()
 
@@ -444,4 +1360,8 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         imu.stop()
         imu.ser.close()
+        for name, stats in imu.get_statistics().items():
+            print(f"{name}: {stats['count']} frames, {stats['rate']:.1f} Hz, "
+                  f"latency {stats['latency']:.2f} ms (max {stats['max_latency']:.2f} ms)")
+        print(f"checksum errors: {imu.n_checksum_errors}, resyncs: {imu.n_resyncs}")
         print("IMU reader stopped")
@@ -0,0 +1,201 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+IMU Simulator
+
+Streams synthetic IMU frames into a pseudo-terminal, so that the IMU drivers can be run,
+tested and benchmarked without the hardware. The drivers open the slave side of the pty
+through `port` exactly like a USB serial device.
+
+The simulated IMU rotates about its z axis at a constant rate while gravity points along
+its z axis. The byte rate is limited to what the configured baud rate could carry, and
+the stream can be corrupted and split into partial writes to exercise the resynchronization
+and the carry-over of partial frames in the parsers.
+"""
+
+import math
+import os
+import pty
+import struct
+import threading
+import time
+import tty
+
+import numpy as np
+
+from berkeley_humanoid_lite_lowlevel.robot.imu import FrameType
+
+
+class PtyImuSimulator:
+    """
+    Pseudo-terminal that streams synthetic IMU frames.
+
+    Args:
+        protocol (str): "hiwonder" for the SerialImu frames, "float" for the FloatImu frames
+        baudrate (int): Simulated baud rate, in bit/s. The byte rate is limited to baudrate / 10.
+        rate (float): Sample rate, in Hz. 0 streams samples as fast as the baud rate allows.
+        frame_types (tuple[int, ...]): HiWonder frame types sent for every sample, see FrameType
+        corruption_rate (float): Probability that a byte of a sample is flipped
+        partial_writes (bool): Split every sample into writes of random size
+        yaw_rate (float): Simulated rotation rate about the z axis, in rad/s
+        seed (int): Seed of the random corruption and write splits
+    """
+    def __init__(
+        self,
+        protocol: str = "hiwonder",
+        baudrate: int = 460800,
+        rate: float = 200.0,
+        frame_types: tuple[int, ...] = (FrameType.ACCELERATION, FrameType.ANGULAR_VELOCITY, FrameType.QUATERNION),
+        corruption_rate: float = 0.0,
+        partial_writes: bool = False,
+        yaw_rate: float = 1.0,
+        seed: int = 0,
+    ):
+        if protocol not in ("hiwonder", "float"):
+            raise ValueError(f"Unknown IMU protocol: {protocol}")
+
+        self.protocol = protocol
+        self.baudrate = baudrate
+        self.rate = rate
+        self.frame_types = frame_types
+        self.corruption_rate = corruption_rate
+        self.partial_writes = partial_writes
+        self.yaw_rate = yaw_rate
+        self.rng = np.random.default_rng(seed)
+
+        self.master_fd, self.slave_fd = pty.openpty()
+        tty.setraw(self.master_fd)
+        tty.setraw(self.slave_fd)
+        # path to open with the IMU drivers
+        self.port: str = os.ttyname(self.slave_fd)
+
+        self.n_samples: int = 0
+        self.n_bytes: int = 0
+        self.n_corrupted_bytes: int = 0
+        # number of frames with at least one flipped byte
+        self.n_corrupted_frames: int = 0
+
+        self.is_stopped = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def hiwonder_frame(frame_type: int, data: tuple[int, int, int, int]) -> bytes:
+        frame = struct.pack("<BBhhhh", 0x55, frame_type, *data)
+        return frame + bytes([sum(frame) & 0xFF])
+
+    @staticmethod
+    def float_frame(quaternion: tuple[float, ...], angular_velocity: tuple[float, ...]) -> bytes:
+        return struct.pack("<BBH7f", 0x75, 0x65, 28, *quaternion, *angular_velocity)
+
+    def make_sample(self, t: float) -> bytes:
+        """
+        Encode the frames of the simulated IMU state at the given time.
+
+        Args:
+            t (float): Simulation time, in seconds
+
+        Returns:
+            bytes: Frames of one sample
+        """
+        half_yaw = 0.5 * self.yaw_rate * t
+        quaternion = (math.cos(half_yaw), 0.0, 0.0, math.sin(half_yaw))
+        angular_velocity = (0.0, 0.0, self.yaw_rate)
+
+        if self.protocol == "float":
+            return self.float_frame(quaternion, angular_velocity)
+
+        frames = []
+        for frame_type in self.frame_types:
+            match frame_type:
+                case FrameType.ACCELERATION:
+                    # 1 g along z, 25 Celsius
+                    data = (0, 0, 2048, 2500)
+                case FrameType.ANGULAR_VELOCITY:
+                    data = (0, 0, int(math.degrees(self.yaw_rate) * 32768.0 / 2000.0), 0)
+                case FrameType.ANGLE:
+                    yaw = math.degrees(math.remainder(self.yaw_rate * t, 2.0 * math.pi))
+                    data = (0, 0, int(yaw * 32768.0 / 180.0), 0)
+                case FrameType.QUATERNION:
+                    data = tuple(max(min(int(value * 32768.0), 32767), -32768) for value in quaternion)
+                case _:
+                    data = (0, 0, 0, 0)
+            frames.append(self.hiwonder_frame(frame_type, data))
+        return b"".join(frames)
+
+    @property
+    def frame_length(self) -> int:
+        return 32 if self.protocol == "float" else 11
+
+    @property
+    def n_frames(self) -> int:
+        """
+        Number of frames sent.
+        """
+        return self.n_samples * (1 if self.protocol == "float" else len(self.frame_types))
+
+    def _corrupt(self, sample: bytes) -> bytes:
+        flips = self.rng.random(len(sample)) < self.corruption_rate
+        if not np.any(flips):
+            return sample
+        corrupted = np.frombuffer(sample, dtype=np.uint8).copy()
+        corrupted[flips] ^= self.rng.integers(1, 256, size=int(np.count_nonzero(flips)), dtype=np.uint8)
+        self.n_corrupted_bytes += int(np.count_nonzero(flips))
+        self.n_corrupted_frames += len(np.unique(np.flatnonzero(flips) // self.frame_length))
+        return corrupted.tobytes()
+
+    def _write(self, data: bytes) -> None:
+        if not self.partial_writes:
+            os.write(self.master_fd, data)
+            return
+
+        view = memoryview(data)
+        while len(view) > 0:
+            n_bytes = int(self.rng.integers(1, len(view) + 1))
+            os.write(self.master_fd, view[:n_bytes])
+            view = view[n_bytes:]
+
+    def run(self, duration: float | None = None) -> None:
+        """
+        Stream frames in the calling thread until stop() is called or the duration has passed.
+
+        Args:
+            duration (float | None): Streaming time, in seconds. None to stream until stopped.
+        """
+        byte_time = 10.0 / self.baudrate
+        start_time = time.monotonic()
+
+        while not self.is_stopped.is_set():
+            now = time.monotonic() - start_time
+            if duration is not None and now >= duration:
+                break
+
+            sample = self.make_sample(now)
+            if self.corruption_rate > 0.0:
+                sample = self._corrupt(sample)
+
+            # wait until the previous bytes would have been transmitted, and for the next sample time
+            send_time = self.n_bytes * byte_time
+            if self.rate > 0.0:
+                send_time = max(send_time, self.n_samples / self.rate)
+            if send_time > now:
+                time.sleep(send_time - now)
+
+            self._write(sample)
+            self.n_samples += 1
+            self.n_bytes += len(sample)
+
+    def run_forever(self) -> None:
+        """
+        Start streaming frames in a separate thread.
+        """
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.is_stopped.set()
+        if self.thread:
+            self.thread.join()
+
+    def close(self) -> None:
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
@@ -0,0 +1,271 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Sensor I/O Event Loop
+
+Services several serial devices from a single thread with `selectors` (epoll on Linux).
+
+Each device is a non-blocking file descriptor. Reads drain all the bytes the kernel has
+queued in one system call and hand them to the device callback, and an optional
+coalescing time keeps a device out of the poll set after a read so that bytes arriving
+in quick succession are handled in one wake-up. Writes are queued from any thread and
+flushed by the loop as the descriptor becomes writable, so the control loop never blocks
+on a serial write. An eventfd wakes the loop up for new writes and for a prompt stop.
+
+A device whose read or write fails, whose callback raises, or which reaches the end of
+file is reported and removed from the loop, while the other devices keep being serviced.
+The owner checks `is_healthy()` to find out that a device is no longer updated.
+"""
+
+import collections
+import os
+import selectors
+import threading
+import time
+from typing import Callable
+
+
+class SensorDevice:
+    """
+    State of one device registered with the event loop.
+    """
+    def __init__(
+        self,
+        fd: int,
+        name: str,
+        on_read: Callable[[bytes, float], None] | None,
+        coalesce_time: float,
+        max_pending_writes: int,
+    ):
+        self.fd = fd
+        self.name = name
+        self.on_read = on_read
+        self.coalesce_time = coalesce_time
+
+        # queued writes, the oldest are dropped when the queue is full
+        self.write_queue: collections.deque[bytes] = collections.deque(maxlen=max_pending_writes)
+        # remainder of the write in progress, never dropped so that no partial frame is sent
+        self.pending_write: memoryview | None = None
+
+        # time.monotonic() until which the device is not polled for reading
+        self.read_resume_time: float = 0.0
+        # currently registered selector events
+        self.events: int = 0
+
+        self.n_reads: int = 0
+        self.n_bytes_read: int = 0
+        self.n_dropped_writes: int = 0
+
+        # reason the device was removed from the loop, None while it is serviced
+        self.error: str | None = None
+
+
+class SensorEventLoop:
+    """
+    Single-threaded event loop for non-blocking serial devices.
+
+    Args:
+        read_size (int): Maximum number of bytes read from a device in one system call
+    """
+    def __init__(self, read_size: int = 4096):
+        self.read_size = read_size
+
+        self.selector = selectors.DefaultSelector()
+        self.devices: dict[int, SensorDevice] = {}
+
+        self._wake_fd = os.eventfd(0, os.EFD_NONBLOCK)
+        self.selector.register(self._wake_fd, selectors.EVENT_READ)
+
+        self._is_stopped = threading.Event()
+        self._thread = None
+
+    def add_device(
+        self,
+        fileobj,
+        on_read: Callable[[bytes, float], None] | None = None,
+        coalesce_time: float = 0.0,
+        max_pending_writes: int = 16,
+        name: str | None = None,
+    ) -> int:
+        """
+        Register a device. Must be called before the loop is started.
+
+        Args:
+            fileobj: Object with a fileno() method, such as a serial.Serial, or a file descriptor
+            on_read (Callable[[bytes, float], None] | None): Called from the loop thread with the read
+                bytes and time.monotonic() after the read. None for a write-only device.
+            coalesce_time (float): Minimum time between two reads of the device, in seconds
+            max_pending_writes (int): Number of writes queued before the oldest one is dropped
+            name (str | None): Name used in the error reports, defaults to the file descriptor
+
+        Returns:
+            int: File descriptor of the device, used as its handle
+        """
+        fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+        os.set_blocking(fd, False)
+
+        device = SensorDevice(fd, name or f"fd {fd}", on_read, coalesce_time, max_pending_writes)
+        self.devices[fd] = device
+        self._update_events(device)
+        return fd
+
+    def write(self, fd: int, data: bytes) -> None:
+        """
+        Queue data to be written to a device. Safe to call from any thread.
+
+        Args:
+            fd (int): Handle returned by add_device()
+            data (bytes): Data to write
+        """
+        device = self.devices[fd]
+        if device.error is not None:
+            device.n_dropped_writes += 1
+            return
+        if len(device.write_queue) == device.write_queue.maxlen:
+            device.n_dropped_writes += 1
+        device.write_queue.append(data)
+        self.wake()
+
+    def is_healthy(self) -> bool:
+        """
+        Returns:
+            bool: False if a device was removed after an error, or the loop thread has died
+        """
+        if self._thread is not None and not self._thread.is_alive() and not self._is_stopped.is_set():
+            return False
+        return all(device.error is None for device in self.devices.values())
+
+    def get_failures(self) -> dict[str, str]:
+        """
+        Returns:
+            dict[str, str]: Reason of the removal of every device removed after an error
+        """
+        return {device.name: device.error for device in self.devices.values() if device.error is not None}
+
+    def wake(self) -> None:
+        os.eventfd_write(self._wake_fd, 1)
+
+    def run(self) -> None:
+        """
+        Run the event loop in the calling thread until stop() is called.
+        """
+        while not self._is_stopped.is_set():
+            now = time.monotonic()
+            timeout = None
+
+            for device in self.devices.values():
+                if device.read_resume_time > 0.0:
+                    if device.read_resume_time <= now:
+                        device.read_resume_time = 0.0
+                    else:
+                        remaining = device.read_resume_time - now
+                        timeout = remaining if timeout is None else min(timeout, remaining)
+                self._update_events(device)
+
+            for key, events in self.selector.select(timeout):
+                if key.fd == self._wake_fd:
+                    try:
+                        os.eventfd_read(self._wake_fd)
+                    except BlockingIOError:
+                        pass
+                    continue
+
+                device = self.devices[key.fd]
+                if events & selectors.EVENT_READ:
+                    self._read(device)
+                if events & selectors.EVENT_WRITE and device.error is None:
+                    self._flush(device)
+
+    def run_forever(self) -> None:
+        """
+        Start the event loop in a separate thread.
+        """
+        self._is_stopped.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the event loop. Returns as soon as the loop thread has exited.
+        """
+        self._is_stopped.set()
+        self.wake()
+        if self._thread:
+            self._thread.join()
+
+        self.selector.close()
+        os.close(self._wake_fd)
+
+    def _update_events(self, device: SensorDevice) -> None:
+        events = 0
+        if device.error is None:
+            if device.on_read is not None and device.read_resume_time == 0.0:
+                events |= selectors.EVENT_READ
+            if device.pending_write is not None or device.write_queue:
+                events |= selectors.EVENT_WRITE
+
+        if events == device.events:
+            return
+        if device.events == 0:
+            self.selector.register(device.fd, events)
+        elif events == 0:
+            self.selector.unregister(device.fd)
+        else:
+            self.selector.modify(device.fd, events)
+        device.events = events
+
+    def _remove(self, device: SensorDevice, error: str) -> None:
+        """
+        Report a failed device and stop servicing it.
+        """
+        print(f"Error: sensor device {device.name} {error}, it is no longer serviced")
+        device.error = error
+        device.write_queue.clear()
+        device.pending_write = None
+        device.read_resume_time = 0.0
+        self._update_events(device)
+
+    def _read(self, device: SensorDevice) -> None:
+        try:
+            data = os.read(device.fd, self.read_size)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._remove(device, f"read failed: {e}")
+            return
+        read_time = time.monotonic()
+        if not data:
+            # a readable descriptor without data has been closed, e.g. an unplugged adapter
+            self._remove(device, "reached the end of file")
+            return
+
+        device.n_reads += 1
+        device.n_bytes_read += len(data)
+        try:
+            device.on_read(data, read_time)
+        except Exception as e:
+            self._remove(device, f"read callback raised {type(e).__name__}: {e}")
+            return
+
+        if device.coalesce_time > 0.0:
+            device.read_resume_time = read_time + device.coalesce_time
+
+    def _flush(self, device: SensorDevice) -> None:
+        while True:
+            if device.pending_write is None:
+                if not device.write_queue:
+                    return
+                device.pending_write = memoryview(device.write_queue.popleft())
+
+            try:
+                n_written = os.write(device.fd, device.pending_write)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                self._remove(device, f"write failed: {e}")
+                return
+
+            if n_written < len(device.pending_write):
+                device.pending_write = device.pending_write[n_written:]
+                return
+            device.pending_write = None
@@ -0,0 +1,198 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Serial Record and Replay
+
+Transports with the subset of the `serial.Serial` interface used by the sensor drivers,
+to capture the raw byte stream of a serial sensor on the robot and feed it back into
+the same driver off the robot.
+
+Recording file format:
+    8 bytes magic "SERREC01"
+    repeated chunks of:
+        float64 time.monotonic() right after the read returned
+        uint32 number of bytes
+        the bytes returned by the read
+"""
+
+import struct
+import time
+
+import serial
+
+
+class RecordingSerial:
+    """
+    Serial port wrapper that writes every chunk it reads to a recording file.
+
+    Args:
+        ser (serial.Serial): Opened serial port
+        path (str): Path of the recording file
+    """
+    MAGIC = b"SERREC01"
+    CHUNK_HEADER = struct.Struct("<dI")
+
+    def __init__(self, ser: serial.Serial, path: str):
+        self.ser = ser
+        self.path = path
+
+        self._file = open(self.path, "wb")
+        self._file.write(self.MAGIC)
+
+    @property
+    def is_open(self) -> bool:
+        return self.ser.is_open
+
+    @property
+    def in_waiting(self) -> int:
+        return self.ser.in_waiting
+
+    @property
+    def baudrate(self) -> int:
+        return self.ser.baudrate
+
+    @baudrate.setter
+    def baudrate(self, baudrate: int) -> None:
+        self.ser.baudrate = baudrate
+
+    @property
+    def timeout(self) -> float | None:
+        return self.ser.timeout
+
+    @timeout.setter
+    def timeout(self, timeout: float | None) -> None:
+        self.ser.timeout = timeout
+
+    def fileno(self) -> int:
+        return self.ser.fileno()
+
+    def cancel_read(self) -> None:
+        self.ser.cancel_read()
+
+    def reset_input_buffer(self) -> None:
+        self.ser.reset_input_buffer()
+
+    def read(self, size: int = 1) -> bytes:
+        data = self.ser.read(size)
+        self.record(data, time.monotonic())
+        return data
+
+    def record(self, data: bytes, read_time: float) -> None:
+        """
+        Append a chunk to the recording, for bytes that were read from the port directly.
+
+        Args:
+            data (bytes): Bytes read from the port
+            read_time (float): time.monotonic() right after the read
+        """
+        if data and not self._file.closed:
+            self._file.write(self.CHUNK_HEADER.pack(read_time, len(data)))
+            self._file.write(data)
+
+    def write(self, data: bytes) -> int:
+        return self.ser.write(data)
+
+    def close_recording(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def close(self) -> None:
+        self.close_recording()
+        self.ser.close()
+
+
+class ReplaySerial:
+    """
+    Serial port replacement that returns the chunks of a recording.
+
+    Reads return the recorded chunks one by one, so the driver sees the same chunk
+    boundaries as on the robot. Writes are discarded.
+
+    In real-time mode, every chunk becomes available at the same time after the start
+    of the replay as it was read after the start of the recording, and `clock()` is
+    time.monotonic(). Otherwise the chunks are returned as fast as they are read, and
+    `clock()` returns the recorded time of the last returned chunk, so the timestamps
+    computed by the driver match the ones on the robot.
+
+    Args:
+        path (str): Path of the recording file
+        realtime (bool): Pace the chunks at the recorded times
+        timeout (float): Time a read blocks once the recording is exhausted, in seconds
+    """
+    def __init__(self, path: str, realtime: bool = True, timeout: float = 0.1):
+        self.path = path
+        self.realtime = realtime
+        self.timeout = timeout
+        self.is_open = True
+        self.baudrate = 0
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if data[:len(RecordingSerial.MAGIC)] != RecordingSerial.MAGIC:
+            raise ValueError(f"{self.path} is not a serial recording")
+
+        # (recorded time, chunk bytes)
+        self.chunks: list[tuple[float, memoryview]] = []
+        view = memoryview(data)
+        offset = len(RecordingSerial.MAGIC)
+        header_size = RecordingSerial.CHUNK_HEADER.size
+        while offset + header_size <= len(view):
+            timestamp, size = RecordingSerial.CHUNK_HEADER.unpack_from(view, offset)
+            offset += header_size
+            self.chunks.append((timestamp, view[offset:offset + size]))
+            offset += size
+
+        self._chunk_index = 0
+        # read position in the current chunk
+        self._chunk_offset = 0
+        # recorded time of the last returned chunk
+        self._chunk_time = self.chunks[0][0] if self.chunks else 0.0
+        # time.monotonic() - recorded time, set on the first read in real-time mode
+        self._time_offset: float | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self._chunk_index >= len(self.chunks)
+
+    @property
+    def in_waiting(self) -> int:
+        if self.is_finished:
+            return 0
+        timestamp, chunk = self.chunks[self._chunk_index]
+        if self.realtime and (self._time_offset is None or timestamp + self._time_offset > time.monotonic()):
+            return 0
+        return len(chunk) - self._chunk_offset
+
+    def clock(self) -> float:
+        if self.realtime:
+            return time.monotonic()
+        return self._chunk_time
+
+    def read(self, size: int = 1) -> bytes:
+        if self.is_finished:
+            time.sleep(self.timeout)
+            return b""
+
+        timestamp, chunk = self.chunks[self._chunk_index]
+
+        if self.realtime:
+            if self._time_offset is None:
+                self._time_offset = time.monotonic() - timestamp
+            delay = timestamp + self._time_offset - time.monotonic()
+            if delay > 0.0:
+                time.sleep(delay)
+
+        data = bytes(chunk[self._chunk_offset:self._chunk_offset + size])
+        self._chunk_offset += len(data)
+        self._chunk_time = timestamp
+
+        if self._chunk_offset >= len(chunk):
+            self._chunk_index += 1
+            self._chunk_offset = 0
+        return data
+
+    def write(self, data: bytes) -> int:
+        return len(data)
+
+    def close(self) -> None:
+        self.is_open = False
@@ -0,0 +1,177 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+Telemetry Logger
+
+Records the robot states, policy actions and joint targets of every control tick.
+
+Records are copied into a preallocated ring of fixed-dtype records, and a background
+thread writes the ring to disk one chunk at a time, so logging never blocks the control
+loop on file I/O. If the writer falls behind and the ring is full, new records are
+dropped and counted instead of stalling the loop.
+
+The output file is a flat array of records. A JSON sidecar file next to it stores the
+record dtype, so an uncompressed log can be opened directly with `np.memmap`, or with
+`TelemetryLogger.load()` which also handles compressed logs.
+"""
+
+import json
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+
+class TelemetryLogger:
+    """
+    Chunked binary logger for the control loop.
+
+    Args:
+        path (str): Path of the binary log file. The dtype description is written to `<path>.json`.
+        n_states (int): Size of the lowlevel state vector
+        n_actions (int): Size of the policy action vector
+        n_joints (int): Number of joints
+        chunk_size (int): Number of records written to disk at once
+        n_chunks (int): Number of chunks the ring can hold before records are dropped
+        compress (bool): Compress every chunk with zlib before writing it
+    """
+    def __init__(
+        self,
+        path: str,
+        n_states: int,
+        n_actions: int,
+        n_joints: int,
+        chunk_size: int = 1024,
+        n_chunks: int = 8,
+        compress: bool = False,
+    ):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.capacity = chunk_size * n_chunks
+        self.compress = compress
+
+        self.dtype = np.dtype([
+            ("timestamp", np.float64),
+            ("tick", np.uint64),
+            ("lowlevel_states", np.float32, (n_states,)),
+            ("actions", np.float32, (n_actions,)),
+            ("joint_position_target", np.float32, (n_joints,)),
+        ])
+
+        self._ring = np.zeros((self.capacity,), dtype=self.dtype)
+
+        # per-field views, so that logging a tick does not look up the fields by name
+        self._timestamps = self._ring["timestamp"]
+        self._ticks = self._ring["tick"]
+        self._lowlevel_states = self._ring["lowlevel_states"]
+        self._actions = self._ring["actions"]
+        self._joint_position_targets = self._ring["joint_position_target"]
+
+        # number of records logged and written to disk so far
+        self._write_index = 0
+        self._flush_index = 0
+        self.n_dropped = 0
+
+        self._file = open(self.path, "wb")
+        with open(self.path + ".json", "w") as f:
+            json.dump({
+                "dtype": np.lib.format.dtype_to_descr(self.dtype),
+                "compress": self.compress,
+                "start_time": time.time(),
+                "start_monotonic_time": time.monotonic(),
+            }, f, indent=4)
+
+        self._chunk_ready = threading.Event()
+        self._is_stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run_writer, daemon=True)
+        self._thread.start()
+
+    def log(self, lowlevel_states: np.ndarray, actions: np.ndarray, joint_position_target: np.ndarray) -> None:
+        """
+        Record one control tick.
+
+        Args:
+            lowlevel_states (np.ndarray): Observations returned by the robot
+            actions (np.ndarray): Actions returned by the policy
+            joint_position_target (np.ndarray): Joint position targets sent to the actuators
+        """
+        if self._write_index - self._flush_index >= self.capacity:
+            self.n_dropped += 1
+            return
+
+        slot = self._write_index % self.capacity
+        self._timestamps[slot] = time.monotonic()
+        self._ticks[slot] = self._write_index + self.n_dropped
+        self._lowlevel_states[slot] = lowlevel_states
+        self._actions[slot] = actions
+        self._joint_position_targets[slot] = joint_position_target
+
+        self._write_index += 1
+        if self._write_index % self.chunk_size == 0:
+            self._chunk_ready.set()
+
+    def stop(self) -> None:
+        """
+        Write the remaining records and close the log file.
+        """
+        self._is_stopped.set()
+        self._chunk_ready.set()
+        self._thread.join()
+
+        self._write_records(self._write_index - self._flush_index)
+        self._file.close()
+
+        if self.n_dropped > 0:
+            print(f"Warning: telemetry dropped {self.n_dropped} records")
+        print(f"Written {self._flush_index} telemetry records to {self.path}")
+
+    def _run_writer(self) -> None:
+        while not self._is_stopped.is_set():
+            self._chunk_ready.wait(timeout=1.0)
+            self._chunk_ready.clear()
+
+            while self._write_index - self._flush_index >= self.chunk_size:
+                self._write_records(self.chunk_size)
+
+    def _write_records(self, n_records: int) -> None:
+        if n_records <= 0:
+            return
+
+        # chunks start at a multiple of the chunk size, so they never wrap around the ring
+        start = self._flush_index % self.capacity
+        data = self._ring[start:start + n_records].tobytes()
+
+        if self.compress:
+            data = zlib.compress(data, level=1)
+            self._file.write(struct.pack("<I", len(data)))
+        self._file.write(data)
+        self._file.flush()
+
+        self._flush_index += n_records
+
+    @staticmethod
+    def load(path: str) -> np.ndarray:
+        """
+        Load a telemetry log.
+
+        Args:
+            path (str): Path of the binary log file
+
+        Returns:
+            np.ndarray: Structured array of records, memory-mapped if the log is not compressed
+        """
+        with open(path + ".json", "r") as f:
+            metadata = json.load(f)
+        dtype = np.lib.format.descr_to_dtype(metadata["dtype"])
+
+        if not metadata["compress"]:
+            return np.memmap(path, dtype=dtype, mode="r")
+
+        chunks = []
+        with open(path, "rb") as f:
+            while header := f.read(4):
+                size, = struct.unpack("<I", header)
+                chunks.append(np.frombuffer(zlib.decompress(f.read(size)), dtype=dtype))
+        return np.concatenate(chunks) if chunks else np.zeros((0,), dtype=dtype)
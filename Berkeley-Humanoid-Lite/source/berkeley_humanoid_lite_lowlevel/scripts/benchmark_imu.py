@@ -0,0 +1,96 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+benchmark_imu.py
+
+Measure the throughput and CPU usage of the IMU drivers against a simulated IMU.
+
+The simulator streams synthetic frames into a pseudo-terminal from a child process, and
+the driver under test reads the pty in this process, so the reported CPU time only
+contains the driver.
+
+Example:
+    python scripts/benchmark_imu.py --protocol hiwonder --rate 0 --duration 10
+"""
+
+import argparse
+import multiprocessing
+import signal
+import time
+
+from berkeley_humanoid_lite_lowlevel.robot.float_imu import FloatImu
+from berkeley_humanoid_lite_lowlevel.robot.imu import Baudrate, SerialImu
+from berkeley_humanoid_lite_lowlevel.robot.imu_simulator import PtyImuSimulator
+from berkeley_humanoid_lite_lowlevel.robot.sensor_io import SensorEventLoop
+
+
+parser = argparse.ArgumentParser(description="IMU driver benchmark")
+parser.add_argument("--protocol", type=str, default="hiwonder", choices=["hiwonder", "float"], help="IMU protocol")
+parser.add_argument("--baudrate", type=int, default=460800, help="Simulated baud rate")
+parser.add_argument("--rate", type=float, default=200.0, help="Sample rate in Hz, 0 for as fast as the baud rate allows")
+parser.add_argument("--duration", type=float, default=5.0, help="Measurement time in seconds")
+parser.add_argument("--corruption-rate", type=float, default=0.0, help="Probability that a streamed byte is flipped")
+parser.add_argument("--partial-writes", action="store_true", help="Split every sample into writes of random size")
+parser.add_argument("--event-loop", action="store_true", help="Service the driver from a SensorEventLoop")
+args = parser.parse_args()
+
+
+def run_simulator(simulator: PtyImuSimulator) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    simulator.run()
+
+
+simulator = PtyImuSimulator(
+    protocol=args.protocol,
+    baudrate=args.baudrate,
+    rate=args.rate,
+    corruption_rate=args.corruption_rate,
+    partial_writes=args.partial_writes,
+)
+
+if args.protocol == "hiwonder":
+    imu = SerialImu(port=simulator.port, baudrate=Baudrate.BAUD_460800, read_timeout=0.1)
+else:
+    imu = FloatImu(port=simulator.port, baudrate=args.baudrate, read_timeout=0.1)
+
+simulator_process = multiprocessing.get_context("fork").Process(target=run_simulator, args=(simulator,), daemon=True)
+simulator_process.start()
+
+loop = None
+if args.event_loop:
+    loop = SensorEventLoop()
+    imu.attach(loop)
+    loop.run_forever()
+else:
+    imu.run_forever()
+
+# let the stream settle before measuring
+time.sleep(0.5)
+
+start_frames = imu.n_frames
+start_cpu_time = time.process_time()
+start_time = time.perf_counter()
+
+time.sleep(args.duration)
+
+elapsed = time.perf_counter() - start_time
+cpu_time = time.process_time() - start_cpu_time
+n_frames = imu.n_frames - start_frames
+
+if loop:
+    loop.stop()
+else:
+    imu.stop()
+simulator_process.terminate()
+simulator_process.join()
+
+print(f"protocol: {args.protocol}, baud rate: {args.baudrate}, sample rate: {args.rate or 'max'} Hz, "
+      f"{'event loop' if args.event_loop else 'reader thread'}")
+print(f"decoded frames:     {n_frames} ({n_frames / elapsed:.0f} frames/s)")
+print(f"CPU usage:          {cpu_time / elapsed * 100:.2f} % of one core")
+print(f"CPU time per frame: {cpu_time / max(n_frames, 1) * 1e6:.2f} us")
+print(f"resyncs:            {imu.n_resyncs}")
+if isinstance(imu, SerialImu):
+    print(f"checksum errors:    {imu.n_checksum_errors}")
+else:
+    print(f"invalid frames:     {imu.n_invalid_frames}")
@@ -0,0 +1,383 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+benchmark_policy.py
+
+Measure the latency, allocations and memory of the policies through `RlController`, for
+every configuration and inference backend, and catch regressions against earlier results.
+
+Every cold start runs in its own forked child process, so that each one creates the
+inference session in a fresh process. The other phases of a configuration and backend run
+in one more child process, so that the peak RSS only contains that case.
+The measured phases are:
+    cold start: creating the controller, loading the policy and running the first update
+    warm-up: the first updates after loading
+    steady state: the updates after the warm-up
+
+Backends without a model for the configuration (no `<checkpoint>.int8.onnx`, no
+`<checkpoint>.pt`, or a graph the NumPy runner cannot run) are skipped.
+
+Example:
+    python scripts/benchmark_policy.py --output benchmark.json
+    python scripts/benchmark_policy.py --output benchmark_new.json --compare benchmark.json
+    python scripts/benchmark_policy.py --compare benchmark.json benchmark_new.json
+"""
+
+import argparse
+import contextlib
+import gc
+import glob
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import onnxruntime as ort
+from omegaconf import DictConfig, ListConfig, OmegaConf
+
+from berkeley_humanoid_lite_lowlevel.policy.quantization import quantized_checkpoint_path, simulate_lowlevel_states
+from berkeley_humanoid_lite_lowlevel.policy.rl_controller import NumpyPolicy, OnnxPolicy, RlController, TorchPolicy
+
+
+BACKENDS = ["onnxruntime", "onnxruntime-int8", "onnxruntime-fp16", "numpy", "torch"]
+
+# compared metrics, as (phase, statistic)
+COMPARED_METRICS = [
+    ("cold_start", "p50_us"),
+    ("steady_state", "p50_us"),
+    ("steady_state", "p99_us"),
+    ("memory", "allocated_bytes_per_step"),
+    ("memory", "peak_rss_mb"),
+]
+
+
+parser = argparse.ArgumentParser(description="Policy inference benchmark")
+parser.add_argument("--configs", type=str, nargs="+", default=None, help="Configuration files, defaults to configs/policy_*.yaml")
+parser.add_argument("--backends", type=str, nargs="+", default=BACKENDS, choices=BACKENDS, help="Inference backends")
+parser.add_argument("--cold-runs", type=int, default=5, help="Number of cold starts")
+parser.add_argument("--warmup-steps", type=int, default=50, help="Number of updates counted as warm-up")
+parser.add_argument("--steps", type=int, default=5000, help="Number of steady state updates")
+parser.add_argument("--alloc-steps", type=int, default=200, help="Number of updates traced for allocations")
+parser.add_argument("--timeout", type=float, default=600.0, help="Time after which a benchmark process is reported as hung, in seconds")
+parser.add_argument("--output", type=str, default=None, help="JSON file to write the results to")
+parser.add_argument("--compare", type=str, nargs="+", default=None, metavar="RESULTS",
+                    help="Baseline JSON to compare the results against, or a baseline and a results JSON to compare without running")
+parser.add_argument("--threshold", type=float, default=0.2, help="Relative increase reported as a regression")
+parser.add_argument("--min-latency-increase", type=float, default=5.0, help="Smallest latency increase reported as a regression, in us")
+args = parser.parse_args()
+
+
+def summarize(times: np.ndarray) -> dict:
+    """
+    Latency statistics.
+
+    Args:
+        times (np.ndarray): Durations, in seconds
+
+    Returns:
+        dict: Number of samples and p50, p99, max and mean latency, in microseconds
+    """
+    times_us = np.asarray(times, dtype=np.float64) * 1e6
+    return {
+        "n": int(times_us.size),
+        "p50_us": float(np.percentile(times_us, 50)),
+        "p99_us": float(np.percentile(times_us, 99)),
+        "max_us": float(np.max(times_us)),
+        "mean_us": float(np.mean(times_us)),
+    }
+
+
+def backend_cfg(cfg: DictConfig | ListConfig, backend: str) -> tuple[DictConfig | ListConfig, type] | None:
+    """
+    Configuration that makes `RlController` load the policy with a backend.
+
+    Args:
+        cfg (DictConfig | ListConfig): Policy configuration
+        backend (str): One of BACKENDS
+
+    Returns:
+        tuple[DictConfig | ListConfig, type] | None: Configuration and expected policy runner class,
+            None if there is no model for the backend
+    """
+    cfg = cfg.copy()
+    checkpoint_path = cfg.policy_checkpoint_path
+    cfg.policy_use_quantized = False
+    cfg.policy_backend = "onnxruntime"
+
+    match backend:
+        case "onnxruntime":
+            policy_class = OnnxPolicy
+        case "onnxruntime-int8" | "onnxruntime-fp16":
+            checkpoint_path = quantized_checkpoint_path(checkpoint_path, backend.split("-")[1])
+            policy_class = OnnxPolicy
+        case "numpy":
+            cfg.policy_backend = "numpy"
+            policy_class = NumpyPolicy
+        case "torch":
+            checkpoint_path = f"{os.path.splitext(checkpoint_path)[0]}.pt"
+            policy_class = TorchPolicy
+
+    if not os.path.exists(checkpoint_path):
+        return None
+    cfg.policy_checkpoint_path = checkpoint_path
+    return cfg, policy_class
+
+
+def run_cold_start(cfg: DictConfig | ListConfig, queue: multiprocessing.Queue) -> None:
+    """
+    Time the controller creation, the policy loading and the first update, and put the duration into the queue.
+    """
+    try:
+        lowlevel_states = simulate_lowlevel_states(cfg, 1)
+
+        start_time = time.perf_counter()
+        # the runners print the backend they use
+        with contextlib.redirect_stdout(io.StringIO()):
+            controller = RlController(cfg)
+            controller.load_policy()
+        controller.update(lowlevel_states[0])
+        queue.put({"time": time.perf_counter() - start_time})
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_case(cfg: DictConfig | ListConfig, policy_class: type, queue: multiprocessing.Queue) -> None:
+    """
+    Benchmark the updates of one configuration and backend after the cold start, and put the results into the queue.
+    """
+    try:
+        lowlevel_states = simulate_lowlevel_states(cfg, 1000)
+        n_states = len(lowlevel_states)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            controller = RlController(cfg)
+            controller.load_policy()
+        controller.update(lowlevel_states[0])
+
+        if not isinstance(controller.policy, policy_class):
+            queue.put({"skipped": f"the policy is run by {type(controller.policy).__name__}"})
+            return
+
+        warm_up_times = np.zeros((args.warmup_steps, ))
+        for i in range(args.warmup_steps):
+            start_time = time.perf_counter()
+            controller.update(lowlevel_states[(i + 1) % n_states])
+            warm_up_times[i] = time.perf_counter() - start_time
+
+        gc.collect()
+        steady_state_times = np.zeros((args.steps, ))
+        for i in range(args.steps):
+            start_time = time.perf_counter()
+            controller.update(lowlevel_states[i % n_states])
+            steady_state_times[i] = time.perf_counter() - start_time
+
+        # the tracer slows down the updates, so the allocations are measured in separate updates.
+        # allocations inside the ONNX Runtime and Torch libraries are not traced.
+        tracemalloc.start()
+        allocated_bytes = np.zeros((args.alloc_steps, ))
+        start_memory, _ = tracemalloc.get_traced_memory()
+        for i in range(args.alloc_steps):
+            tracemalloc.reset_peak()
+            step_memory, _ = tracemalloc.get_traced_memory()
+            controller.update(lowlevel_states[i % n_states])
+            _, peak_memory = tracemalloc.get_traced_memory()
+            allocated_bytes[i] = peak_memory - step_memory
+        end_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        queue.put({
+            "warm_up": summarize(warm_up_times),
+            "steady_state": summarize(steady_state_times),
+            "memory": {
+                # peak of the memory allocated while an update runs, above the memory before it
+                "allocated_bytes_per_step": float(np.mean(allocated_bytes)),
+                "max_allocated_bytes_per_step": float(np.max(allocated_bytes)),
+                # memory kept after the updates, non-zero for leaks and growing caches
+                "retained_bytes_per_step": (end_memory - start_memory) / max(args.alloc_steps, 1),
+                # ru_maxrss is in kilobytes on Linux
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            },
+        })
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_process(context: multiprocessing.context.BaseContext, target, target_args: tuple) -> dict:
+    """
+    Run a benchmark function in a child process.
+
+    Args:
+        context (multiprocessing.context.BaseContext): Multiprocessing context
+        target: Function that puts its results into the queue passed as its last argument
+        target_args (tuple): Arguments of the function before the queue
+
+    Returns:
+        dict: Results put by the function, or an error if the process died or hung
+    """
+    queue = context.Queue()
+    process = context.Process(target=target, args=(*target_args, queue))
+    process.start()
+    deadline = time.perf_counter() + args.timeout
+    try:
+        while True:
+            try:
+                return queue.get(timeout=1.0)
+            except queue_module.Empty:
+                pass
+            if process.exitcode is not None:
+                # the results may have been put just before the process exited
+                try:
+                    return queue.get(timeout=1.0)
+                except queue_module.Empty:
+                    return {"error": f"the benchmark process exited with code {process.exitcode}"}
+            if time.perf_counter() > deadline:
+                process.terminate()
+                return {"error": f"the benchmark process did not finish within {args.timeout} s"}
+    finally:
+        process.join()
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark() -> dict:
+    config_paths = args.configs or sorted(glob.glob("configs/policy_*.yaml"))
+    context = multiprocessing.get_context("fork")
+
+    results = []
+    for config_path in config_paths:
+        cfg = OmegaConf.load(config_path)
+        for backend in args.backends:
+            case = {"config": config_path, "backend": backend}
+
+            selected = backend_cfg(cfg, backend)
+            if selected is None:
+                print(f"{config_path} {backend}: skipped, no model")
+                continue
+            case_cfg, policy_class = selected
+            case["checkpoint"] = case_cfg.policy_checkpoint_path
+
+            cold_start_times = []
+            for _ in range(args.cold_runs):
+                cold_start = run_process(context, run_cold_start, (case_cfg, ))
+                if "error" in cold_start:
+                    case["error"] = cold_start["error"]
+                    break
+                cold_start_times.append(cold_start["time"])
+
+            if "error" not in case:
+                case.update(run_process(context, run_case, (case_cfg, policy_class)))
+            if cold_start_times:
+                case["cold_start"] = summarize(cold_start_times)
+
+            if "skipped" in case:
+                print(f"{config_path} {backend}: skipped, {case['skipped']}")
+                continue
+            if "error" in case:
+                print(f"{config_path} {backend}: failed, {case['error']}")
+            else:
+                print(f"{config_path} {backend}:")
+                for phase in ("cold_start", "warm_up", "steady_state"):
+                    stats = case[phase]
+                    print(f"    {phase + ':':<14} p50 {stats['p50_us']:10.1f} us   p99 {stats['p99_us']:10.1f} us   "
+                          f"max {stats['max_us']:10.1f} us")
+                memory = case["memory"]
+                print(f"    allocations:   {memory['allocated_bytes_per_step']:.0f} bytes per step, "
+                      f"{memory['retained_bytes_per_step']:.1f} bytes per step retained")
+                print(f"    peak RSS:      {memory['peak_rss_mb']:.1f} MB")
+            results.append(case)
+
+    return {
+        "metadata": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "host": platform.node(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "onnxruntime": ort.__version__,
+            "cold_runs": args.cold_runs,
+            "warmup_steps": args.warmup_steps,
+            "steps": args.steps,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict) -> int:
+    """
+    Print the changes of the compared metrics, and the regressions.
+
+    Args:
+        baseline (dict): Earlier results
+        current (dict): New results
+
+    Returns:
+        int: Number of regressions
+    """
+    baseline_cases = {(case["config"], case["backend"]): case for case in baseline["results"] if "error" not in case}
+
+    if baseline["metadata"].get("host") != current["metadata"].get("host"):
+        print("Warning: the results were measured on different hosts")
+
+    n_regressions = 0
+    for case in current["results"]:
+        key = (case["config"], case["backend"])
+        if key not in baseline_cases:
+            continue
+        if "error" in case:
+            print(f"{case['config']} {case['backend']}: REGRESSION, failed ({case['error']})")
+            n_regressions += 1
+            continue
+
+        print(f"{case['config']} {case['backend']}:")
+        for phase, statistic in COMPARED_METRICS:
+            old_value = baseline_cases[key][phase][statistic]
+            new_value = case[phase][statistic]
+            increase = new_value - old_value
+            relative_increase = increase / old_value if old_value else (float("inf") if increase > 0 else 0.0)
+
+            is_regression = relative_increase > args.threshold
+            if statistic.endswith("_us"):
+                is_regression = is_regression and increase > args.min_latency_increase
+            n_regressions += is_regression
+
+            print(f"    {phase + ' ' + statistic + ':':<40} {old_value:12.1f} -> {new_value:12.1f} "
+                  f"({relative_increase * 100:+.1f} %){'  REGRESSION' if is_regression else ''}")
+
+    return n_regressions
+
+
+if args.compare and len(args.compare) > 2:
+    parser.error("--compare takes a baseline, and optionally the results to compare")
+
+if args.compare and len(args.compare) == 2:
+    with open(args.compare[1], "r") as f:
+        current = json.load(f)
+else:
+    current = run_benchmark()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if args.compare:
+    with open(args.compare[0], "r") as f:
+        baseline = json.load(f)
+    n_regressions = compare(baseline, current)
+    print(f"{n_regressions} regressions (threshold {args.threshold * 100:.0f} %)")
+    if n_regressions:
+        raise SystemExit(1)
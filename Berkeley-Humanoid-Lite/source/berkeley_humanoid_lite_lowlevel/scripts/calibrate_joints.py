@@ -10,76 +10,76 @@ import time
 
 import numpy as np
 import yaml
+from loop_rate_limiters import RateLimiter
 
+import berkeley_humanoid_lite_lowlevel.recoil as recoil
 from berkeley_humanoid_lite_lowlevel.robot import Humanoid
 
 
+# joint position sampling rate
+SAMPLING_RATE = 500
+# console printing rate
+PRINT_RATE = 10
+
+
 robot = Humanoid()
 
-joint_axis_directions = np.array([
-    -1, +1, -1,
-    -1,
-    -1, +1,
-    -1, +1, +1,
-    +1,
-    +1, +1
-])
-
-
-ideal_values = np.array([
-    np.deg2rad(-(10)),
-    np.deg2rad(+(33.75)),
-    np.deg2rad(+(56.25)),
-    np.deg2rad(+(0)),
-    np.deg2rad(-(45)),
-    np.deg2rad(-(15)),
-
-    np.deg2rad(+(10)),
-    np.deg2rad(-(33.75)),
-    np.deg2rad(+(56.25)),
-    np.deg2rad(+(0)),
-    np.deg2rad(-(45)),
-    np.deg2rad(+(15)),
-])
+
+def read_joint_positions() -> np.ndarray:
+    readings = robot.actuators.read_parameters_f32([recoil.Parameter.POSITION_CONTROLLER_POSITION_MEASURED], timeout=0.005)[0]
+    return readings * robot.joint_axis_directions
 
 
 print("initial readings:")
-limit_readings = np.array([joint[0].read_position_measured(joint[1]) for joint in robot.joints]) * joint_axis_directions
+limit_readings = read_joint_positions()
 print([f"{reading:.2f}" for reading in limit_readings])
 
+# track the extreme on the limit side of each joint as a running maximum of the side-signed readings
+signed_limit_readings = robot.calibration_limit_sides * limit_readings
+
+rate = RateLimiter(frequency=SAMPLING_RATE, warn=False)
+n_samples = 0
+start_time = time.perf_counter()
+
 while robot.command_controller.commands.get("mode_switch") != 1:
-    joint_readings = np.array([joint[0].read_position_measured(joint[1]) for joint in robot.joints]) * joint_axis_directions
+    joint_readings = read_joint_positions()
+
+    # NaN readings from joints that did not respond in time are ignored
+    np.fmax(signed_limit_readings, robot.calibration_limit_sides * joint_readings, out=signed_limit_readings)
+    n_samples += 1
 
-    limit_readings[0] = min(limit_readings[0], joint_readings[0])
-    limit_readings[1] = max(limit_readings[1], joint_readings[1])
-    limit_readings[2] = max(limit_readings[2], joint_readings[2])
-    limit_readings[3] = min(limit_readings[3], joint_readings[3])
-    limit_readings[4] = min(limit_readings[4], joint_readings[4])
-    limit_readings[5] = min(limit_readings[5], joint_readings[5])
+    if n_samples % (SAMPLING_RATE // PRINT_RATE) == 0:
+        limit_readings = robot.calibration_limit_sides * signed_limit_readings
+        print(time.time(), [f"{reading:.2f}" for reading in limit_readings])
 
-    limit_readings[6] = max(limit_readings[6], joint_readings[6])
-    limit_readings[7] = min(limit_readings[7], joint_readings[7])
-    limit_readings[8] = max(limit_readings[8], joint_readings[8])
-    limit_readings[9] = min(limit_readings[9], joint_readings[9])
-    limit_readings[10] = min(limit_readings[10], joint_readings[10])
-    limit_readings[11] = max(limit_readings[11], joint_readings[11])
+    rate.sleep()
 
-    print(time.time(), [f"{reading:.2f}" for reading in limit_readings])
 
-    time.sleep(0.05)
+print(f"sampled {n_samples} times at {n_samples / (time.perf_counter() - start_time):.1f} Hz")
 
+limit_readings = robot.calibration_limit_sides * signed_limit_readings
+position_offsets = limit_readings - robot.calibration_limit_positions
 
 print("final readings at the limits:")
 print([f"{limit:.4f}" for limit in limit_readings])
 
 print("offsets:")
-print([f"{offset:.4f}" for offset in (limit_readings - ideal_values)])
+print([f"{offset:.4f}" for offset in position_offsets])
 
-calibration_data = {
-    "position_offsets": [float(offset) for offset in (limit_readings - ideal_values)],
-}
+# a joint that never answered has no limit reading, and its offset would be NaN
+is_missing = ~np.isfinite(position_offsets)
+if np.any(is_missing):
+    missing_joints = [robot.joints[i][2] for i in np.flatnonzero(is_missing)]
+    print(f"Error: no readings from {', '.join(missing_joints)}, calibration.yaml is not written")
+else:
+    calibration_data = {
+        "position_offsets": [float(offset) for offset in position_offsets],
+    }
 
-with open("calibration.yaml", "w") as f:
-    yaml.dump(calibration_data, f)
+    with open("calibration.yaml", "w") as f:
+        yaml.dump(calibration_data, f)
 
 robot.stop()
+
+if np.any(is_missing):
+    raise SystemExit(1)
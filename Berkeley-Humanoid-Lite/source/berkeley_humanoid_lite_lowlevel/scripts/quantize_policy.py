@@ -0,0 +1,115 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+quantize_policy.py
+
+Produce int8 and fp16 variants of an ONNX policy, and keep a variant only if its actions
+stay within a tolerance of the float32 policy.
+
+The policy observations used for the calibration and the comparison are generated by
+running the float32 policy over a recorded telemetry log, or over simulated states
+around the default pose when no log is given. The accepted int8 model is written to
+`<checkpoint>.int8.onnx` and is picked up by `RlController.load_policy` as long as the
+checkpoint does not change. The fp16 model is for benchmarking only and is never loaded
+for control.
+
+Example:
+    python scripts/quantize_policy.py --config configs/policy_biped_50hz.yaml --telemetry logs/walk.bin --static
+"""
+
+import argparse
+import os
+
+from omegaconf import OmegaConf
+
+from berkeley_humanoid_lite_lowlevel.policy.quantization import (
+    collect_observations,
+    compare_policies,
+    quantize_policy,
+    quantized_checkpoint_path,
+    simulate_lowlevel_states,
+)
+from berkeley_humanoid_lite_lowlevel.robot.telemetry import TelemetryLogger
+
+
+parser = argparse.ArgumentParser(description="Policy quantization")
+parser.add_argument("--config", type=str, default="./configs/policy_biped_50hz.yaml", help="Path to the configuration file")
+parser.add_argument("--checkpoint", type=str, default=None, help="ONNX policy, defaults to the policy of the configuration")
+parser.add_argument("--precision", type=str, nargs="+", default=["int8"], choices=["int8", "fp16"], help="Variants to produce")
+parser.add_argument("--static", action="store_true", help="Quantize the int8 activations statically, calibrated on the observations")
+parser.add_argument("--per-channel", action="store_true", help="Quantize the int8 weights per output channel")
+parser.add_argument("--telemetry", type=str, default=None, help="Telemetry log to take the observations from")
+parser.add_argument("--num-samples", type=int, default=4000, help="Number of simulated states when no telemetry log is given")
+parser.add_argument("--tolerance", type=float, default=0.05, help="Largest accepted absolute action error")
+parser.add_argument("--mean-tolerance", type=float, default=0.01, help="Largest accepted mean absolute action error")
+args = parser.parse_args()
+
+
+cfg = OmegaConf.load(args.config)
+if args.checkpoint:
+    cfg.policy_checkpoint_path = args.checkpoint
+checkpoint_path = cfg.policy_checkpoint_path
+
+if args.telemetry:
+    lowlevel_states = TelemetryLogger.load(args.telemetry)["lowlevel_states"]
+    print(f"Loaded {len(lowlevel_states)} states from {args.telemetry}")
+else:
+    lowlevel_states = simulate_lowlevel_states(cfg, args.num_samples)
+    print(f"Simulated {len(lowlevel_states)} states")
+
+observations = collect_observations(cfg, lowlevel_states)
+
+# interleave the trace, so that both halves cover the whole recording
+calibration_observations = observations[0::2]
+evaluation_observations = observations[1::2]
+
+action_indices = cfg.get("action_indices", list(range(cfg.num_actions)))
+
+n_rejected = 0
+for precision in args.precision:
+    output_path = quantized_checkpoint_path(checkpoint_path, precision)
+    candidate_path = output_path + ".candidate"
+
+    is_static = precision == "int8" and args.static
+    quantize_policy(
+        checkpoint_path,
+        candidate_path,
+        precision=precision,
+        calibration_observations=calibration_observations if is_static else None,
+        per_channel=args.per_channel,
+    )
+
+    try:
+        results = compare_policies(
+            checkpoint_path,
+            candidate_path,
+            evaluation_observations,
+            cfg.action_limit_lower,
+            cfg.action_limit_upper,
+        )
+    except Exception as e:
+        print(f"{precision}: the quantized policy cannot be run ({e}), rejected")
+        os.remove(candidate_path)
+        n_rejected += 1
+        continue
+
+    worst_joint = cfg.joints[action_indices[results["worst_joint"]]]
+    print(f"{precision}{' static' if is_static else ''}:")
+    print(f"    max error:  {results['max_error']:.5f} (tolerance {args.tolerance})")
+    print(f"    mean error: {results['mean_error']:.5f} (tolerance {args.mean_tolerance})")
+    print(f"    worst joint: {worst_joint}, mean error {results['worst_joint_mean_error']:.5f}")
+    print(f"    inference time: {results['candidate_inference_time'] * 1e6:.1f} us "
+          f"(float32 {results['reference_inference_time'] * 1e6:.1f} us)")
+
+    if results["max_error"] <= args.tolerance and results["mean_error"] <= args.mean_tolerance:
+        os.replace(candidate_path, output_path)
+        print(f"    accepted, written to {output_path}")
+        if precision == "fp16":
+            print("    the fp16 model is for benchmarking only, RlController.load_policy does not use it")
+    else:
+        os.remove(candidate_path)
+        n_rejected += 1
+        print("    rejected")
+
+if n_rejected:
+    raise SystemExit(1)
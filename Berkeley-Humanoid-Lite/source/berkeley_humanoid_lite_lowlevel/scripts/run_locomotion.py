@@ -1,9 +1,16 @@
 # Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
 
+import signal
+
+import numpy as np
 from cc.udp import UDP
 from loop_rate_limiters import RateLimiter
 
 from berkeley_humanoid_lite_lowlevel.robot import Humanoid
+from berkeley_humanoid_lite_lowlevel.robot.telemetry import TelemetryLogger
+from berkeley_humanoid_lite_lowlevel.policy.deadline import DeadlineMonitor
+from berkeley_humanoid_lite_lowlevel.policy.inference_worker import InferenceWorker
+from berkeley_humanoid_lite_lowlevel.policy.interpolation import ActionInterpolator
 from berkeley_humanoid_lite_lowlevel.policy.rl_controller import RlController
 from berkeley_humanoid_lite_lowlevel.policy.config import Cfg
 
@@ -20,23 +27,122 @@ udp = UDP(("0.0.0.0", 11000), ("172.28.0.5", 11000))
 controller = RlController(cfg)
 controller.load_policy()
 
-rate = RateLimiter(1 / cfg.policy_dt)
+# `kill -USR1 <pid>` switches to the next checkpoint of `policy_checkpoint_paths` without
+# stopping the control loop, or reloads the current checkpoint if the list is not set
+policy_checkpoint_paths = list(cfg.get("policy_checkpoint_paths", None) or [cfg.policy_checkpoint_path])
+
+
+def switch_policy(signum, frame) -> None:
+    if controller.policy_checkpoint_path in policy_checkpoint_paths:
+        index = (policy_checkpoint_paths.index(controller.policy_checkpoint_path) + 1) % len(policy_checkpoint_paths)
+    else:
+        index = 0
+    controller.load_policy_async(policy_checkpoint_paths[index])
+
+
+signal.signal(signal.SIGUSR1, switch_policy)
 
-robot = Humanoid()
+# with action interpolation, the joints are updated every control_dt with setpoints
+# interpolated between the policy actions, and the policy runs every `decimation` ticks
+interpolation = cfg.get("action_interpolation", "none")
+interpolator = None
+decimation = 1
+if interpolation != "none":
+    interpolator = ActionInterpolator(cfg.num_actions, cfg.policy_dt, cfg.control_dt,
+                                      mode=interpolation, cutoff_freq=cfg.get("cutoff_freq", None))
+    decimation = interpolator.decimation
+    print(f"Control frequency: {1 / cfg.control_dt} Hz, {interpolation} action interpolation")
+
+rate = RateLimiter(1 / cfg.policy_dt * decimation)
+
+robot = Humanoid(imu_type=cfg.get("imu_type", "hiwonder"), imu_sample_delay=cfg.get("imu_sample_delay", None))
+# keep the duration of the initialization motion independent of the loop rate
+robot.rl_init_steps *= decimation
 
 robot.enter_damping()
 
 obs = robot.reset()
 
+telemetry = None
+if cfg.get("telemetry_path", None):
+    telemetry = TelemetryLogger(cfg.telemetry_path, robot.n_lowlevel_states, cfg.num_actions, len(robot.joints),
+                                compress=cfg.get("telemetry_compress", False))
+
+# with pipelined inference, the policy runs on a worker thread while the joints are
+# updated, and its actions are applied one policy period later, see InferenceWorker
+worker = None
+if cfg.get("pipelined_inference", False):
+    worker = InferenceWorker(controller, robot.n_lowlevel_states, cfg.num_actions)
+    worker.start()
+    worker.submit(obs)
+    print(f"Pipelined inference, actions are delayed by {cfg.policy_dt} s")
+
+# with an inference budget, ticks whose inference does not finish in time use a fallback action
+deadline_monitor = None
+if cfg.get("inference_budget", None):
+    if worker:
+        print("Warning: inference_budget is ignored with pipelined_inference")
+    else:
+        deadline_monitor = DeadlineMonitor(
+            controller,
+            robot.n_lowlevel_states,
+            cfg.inference_budget,
+            fallback=cfg.get("inference_fallback", "hold"),
+            use_watchdog=cfg.get("inference_watchdog", True),
+        )
+        print(f"Inference budget: {cfg.inference_budget * 1000:.1f} ms, fallback: {deadline_monitor.fallback}")
+
+actions = np.zeros((cfg.num_actions, ), dtype=np.float32)
+setpoints = np.zeros((cfg.num_actions, ), dtype=np.float32)
+tick = 0
+
 try:
     while True:
-        actions = controller.update(obs)
-        obs = robot.step(actions)
-        udp.send_numpy(obs)
-
+        if tick % decimation == 0:
+            try:
+                if worker:
+                    # actions of the observations submitted on the previous policy tick, the worker
+                    # had a whole policy period already, so one more period is plenty
+                    if not worker.wait(actions, timeout=cfg.policy_dt):
+                        print("Error: the policy inference did not finish within a policy period, stopping")
+                        break
+                    worker.submit(obs)
+                elif deadline_monitor:
+                    actions[:] = deadline_monitor.update(obs)
+                else:
+                    actions[:] = controller.update(obs)
+            except Exception as e:
+                print(f"Error: the policy inference failed ({type(e).__name__}: {e}), stopping")
+                break
+            udp.send_numpy(obs)
+            if interpolator:
+                interpolator.push(actions)
+
+        if interpolator:
+            obs = robot.step(interpolator.sample(setpoints))
+        else:
+            obs = robot.step(actions)
+
+        if telemetry:
+            telemetry.log(obs, actions, robot.joint_position_target)
+
+        tick += 1
         rate.sleep()
 
 except KeyboardInterrupt:
+    pass
+
+finally:
+    if worker:
+        # a stuck inference cannot be interrupted, the worker thread is a daemon and is left behind
+        worker.stop(timeout=1.0)
+    if deadline_monitor:
+        deadline_monitor.stop(timeout=1.0)
+        print(f"Inference deadline misses: {deadline_monitor.n_deadline_misses} / {deadline_monitor.n_updates}, "
+              f"longest inference: {deadline_monitor.max_inference_time * 1000:.2f} ms")
+    if telemetry:
+        telemetry.stop()
+    # puts the joints into damping
     robot.stop()
 
 print("Stopped.")
@@ -0,0 +1,158 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+run_locomotion_multiprocess.py
+
+Same as run_locomotion.py, but runs the policy inference and the hardware I/O in two
+separate processes so that they do not compete for the same GIL.
+
+The I/O process owns the Humanoid (CAN buses, IMU and gamepad threads), and the policy
+process owns the RlController. Observations and actions are exchanged through shared
+memory rings. Set `io_cpu` and `policy_cpu` in the config file to pin each process to
+its own core.
+"""
+
+import multiprocessing
+import signal
+import time
+
+import numpy as np
+from cc.udp import UDP
+from loop_rate_limiters import RateLimiter
+
+from berkeley_humanoid_lite_lowlevel.policy.config import Cfg
+from berkeley_humanoid_lite_lowlevel.policy.multiprocess import SharedRing, set_cpu_affinity
+
+
+def run_policy(cfg: Cfg, observation_ring: SharedRing, action_ring: SharedRing) -> None:
+    # the I/O process handles Ctrl+C and tells us to exit by closing the observation ring
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    set_cpu_affinity(cfg.get("policy_cpu", None))
+
+    # torch and onnxruntime are only loaded in the policy process
+    from berkeley_humanoid_lite_lowlevel.policy.rl_controller import RlController
+
+    controller = RlController(cfg)
+    controller.load_policy()
+
+    observations = np.zeros((observation_ring.vector_size,), dtype=np.float32)
+
+    while not observation_ring.is_closed():
+        if not observation_ring.wait(timeout=0.1):
+            continue
+        if not observation_ring.read_latest(observations):
+            continue
+
+        actions = controller.update(observations)
+        action_ring.write(actions, tag=observation_ring.last_read_sequence)
+
+    observation_ring.close()
+    action_ring.close()
+
+
+# Load configuration
+cfg = Cfg.from_arguments()
+
+print(f"Policy frequency: {1 / cfg.policy_dt} Hz")
+
+# quaternion, angular velocity, joint positions, joint velocities, mode, velocity commands
+n_lowlevel_states = 4 + 3 + cfg.num_joints + cfg.num_joints + 1 + 3
+
+observation_ring = SharedRing(n_lowlevel_states)
+action_ring = SharedRing(cfg.num_actions)
+
+# fork the policy process before any hardware thread is started
+policy_process = multiprocessing.get_context("fork").Process(
+    target=run_policy,
+    args=(cfg, observation_ring, action_ring),
+)
+policy_process.start()
+
+set_cpu_affinity(cfg.get("io_cpu", None))
+
+from berkeley_humanoid_lite_lowlevel.robot import Humanoid  # noqa: E402
+from berkeley_humanoid_lite_lowlevel.robot.telemetry import TelemetryLogger  # noqa: E402
+
+udp = UDP(("0.0.0.0", 11000), ("172.28.0.5", 11000))
+
+rate = RateLimiter(1 / cfg.policy_dt)
+
+robot = Humanoid(imu_type=cfg.get("imu_type", "hiwonder"), imu_sample_delay=cfg.get("imu_sample_delay", None))
+
+robot.enter_damping()
+
+obs = robot.reset()
+
+telemetry = None
+if cfg.get("telemetry_path", None):
+    telemetry = TelemetryLogger(cfg.telemetry_path, robot.n_lowlevel_states, cfg.num_actions, len(robot.joints),
+                                compress=cfg.get("telemetry_compress", False))
+
+actions = np.zeros((cfg.num_actions,), dtype=np.float32)
+n_missed_actions = 0
+
+
+def wait_for_actions(observation_sequence: int, timeout: float) -> bool:
+    """
+    Wait for the actions computed from an observation.
+
+    Late actions computed from earlier observations are copied as well, but do not count as an answer.
+
+    Args:
+        observation_sequence (int): Sequence number of the observation in the observation ring
+        timeout (float): Maximum time to wait in seconds
+
+    Returns:
+        bool: True if the actions of the observation were copied into `actions`
+    """
+    deadline = time.perf_counter() + timeout
+    while not (action_ring.read_latest(actions) and action_ring.last_read_tag == observation_sequence):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 or not action_ring.wait(timeout=remaining):
+            return False
+    return True
+
+
+try:
+    # block until the policy process has loaded the model and answered the first observation
+    observation_sequence = observation_ring.write(obs)
+    while not wait_for_actions(observation_sequence, 1.0):
+        if not policy_process.is_alive():
+            raise RuntimeError(f"the policy process exited with code {policy_process.exitcode} before answering")
+        print("Waiting for the policy process...")
+
+    while True:
+        obs = robot.step(actions)
+        observation_sequence = observation_ring.write(obs)
+        udp.send_numpy(obs)
+
+        if telemetry:
+            telemetry.log(obs, actions, robot.joint_position_target)
+
+        # hold the previous actions if the policy process does not answer within one period
+        if not wait_for_actions(observation_sequence, cfg.policy_dt):
+            if not policy_process.is_alive():
+                print(f"Error: the policy process exited with code {policy_process.exitcode}, stopping")
+                break
+            n_missed_actions += 1
+            print(f"Warning: no actions from the policy process ({n_missed_actions} missed)")
+
+        rate.sleep()
+
+except KeyboardInterrupt:
+    pass
+
+finally:
+    if telemetry:
+        telemetry.stop()
+    observation_ring.close_writer()
+    policy_process.join(timeout=1.0)
+    if policy_process.is_alive():
+        policy_process.terminate()
+    # puts the joints into damping
+    robot.stop()
+
+    observation_ring.close(unlink=True)
+    action_ring.close(unlink=True)
+
+print("Stopped.")
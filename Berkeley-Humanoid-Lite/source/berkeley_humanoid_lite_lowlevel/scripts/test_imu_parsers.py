@@ -0,0 +1,213 @@
+# Copyright (c) 2025, The Berkeley Humanoid Lite Project Developers.
+
+"""
+test_imu_parsers.py
+
+Regression test of the IMU drivers against the simulated IMU, without the hardware.
+
+Both drivers read a pseudo-terminal fed by PtyImuSimulator with split writes, once clean
+and once with corrupted bytes. The decoded values are checked against the simulated
+state, the frame and error counts against the frames the simulator sent, and the recorded
+stream is parsed again in one piece and byte by byte, which must give the same counts
+and samples as the live read.
+
+Example:
+    python scripts/test_imu_parsers.py
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from berkeley_humanoid_lite_lowlevel.robot.float_imu import FloatImu
+from berkeley_humanoid_lite_lowlevel.robot.imu import Baudrate, ImuBase, ImuSampleHistory, SerialImu
+from berkeley_humanoid_lite_lowlevel.robot.imu_simulator import PtyImuSimulator
+from berkeley_humanoid_lite_lowlevel.robot.serial_transport import ReplaySerial
+
+
+# simulated streaming time of each run, in seconds
+DURATION = 0.5
+YAW_RATE = 1.0
+
+
+def stream(protocol: str, corruption_rate: float, record_path: str) -> tuple[PtyImuSimulator, ImuBase]:
+    """
+    Stream the simulated IMU into a driver reading on its own thread.
+
+    Returns:
+        tuple[PtyImuSimulator, ImuBase]: Stopped simulator and driver
+    """
+    simulator = PtyImuSimulator(
+        protocol=protocol,
+        baudrate=460800 if protocol == "hiwonder" else 1000000,
+        rate=0.0,
+        corruption_rate=corruption_rate,
+        partial_writes=True,
+        yaw_rate=YAW_RATE,
+        seed=1,
+    )
+    if protocol == "hiwonder":
+        imu = SerialImu(port=simulator.port, baudrate=Baudrate.BAUD_460800, read_timeout=0.05,
+                        history_capacity=64, record_path=record_path)
+    else:
+        imu = FloatImu(port=simulator.port, read_timeout=0.05, history_capacity=64, record_path=record_path)
+
+    imu.run_forever()
+    simulator.run(DURATION)
+    # let the driver read the last bytes
+    time.sleep(0.2)
+    imu.stop()
+    imu.thread.join()
+    simulator.close()
+    return simulator, imu
+
+
+def reparse(protocol: str, record_path: str, chunk_size: int | None) -> ImuBase:
+    """
+    Parse a recorded stream again, in chunks of the given size or in one piece.
+    """
+    replay = ReplaySerial(record_path, realtime=False)
+    data = b"".join(bytes(chunk) for _, chunk in replay.chunks)
+    if protocol == "hiwonder":
+        imu = SerialImu(baudrate=Baudrate.BAUD_460800, history_capacity=64, transport=replay)
+    else:
+        imu = FloatImu(history_capacity=64, transport=replay)
+
+    chunk_size = chunk_size or len(data)
+    for start in range(0, len(data), chunk_size):
+        imu.feed(data[start:start + chunk_size], 0.0)
+    return imu
+
+
+def counts(imu: ImuBase) -> dict[str, int]:
+    if isinstance(imu, SerialImu):
+        n_invalid_frames = imu.n_checksum_errors
+    else:
+        n_invalid_frames = imu.n_invalid_frames
+    return {"frames": imu.n_frames, "invalid_frames": n_invalid_frames, "resyncs": imu.n_resyncs, "samples": imu.history.count}
+
+
+def history_samples(history: ImuSampleHistory) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Quaternions and angular velocities in the history, from the oldest to the newest.
+    """
+    n_samples = min(history.count, history.capacity)
+    slots = np.arange(history.count - n_samples, history.count) % history.capacity
+    return history.quaternions[slots], history.angular_velocities[slots]
+
+
+def check_values(quaternions: np.ndarray, angular_velocities: np.ndarray, tolerance: float) -> None:
+    """
+    Check the samples against the simulated rotation about the z axis.
+    """
+    # the quaternion is (cos(yaw / 2), 0, 0, sin(yaw / 2))
+    np.testing.assert_allclose(np.linalg.norm(quaternions, axis=1), 1.0, atol=tolerance)
+    np.testing.assert_allclose(quaternions[:, 1:3], 0.0, atol=tolerance)
+    expected_angular_velocity = np.array([0.0, 0.0, np.rad2deg(YAW_RATE)], dtype=np.float32)
+    np.testing.assert_allclose(angular_velocities, np.broadcast_to(expected_angular_velocity, angular_velocities.shape),
+                               atol=2000.0 / 32768.0)
+
+
+def check_driver(protocol: str, corruption_rate: float) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        record_path = os.path.join(directory, f"{protocol}.rec")
+        simulator, imu = stream(protocol, corruption_rate, record_path)
+        live = counts(imu)
+        print(f"{protocol}, corruption rate {corruption_rate}: sent {simulator.n_frames} frames, "
+              f"{simulator.n_corrupted_frames} corrupted, {live}")
+
+        assert simulator.n_frames > 1000, "the simulator sent too few frames"
+        assert live["frames"] > 0.9 * simulator.n_frames, "the driver missed frames"
+
+        if corruption_rate == 0.0:
+            assert live["frames"] == simulator.n_frames
+            assert live["invalid_frames"] == 0
+            assert live["resyncs"] == 0
+        elif protocol == "hiwonder":
+            # every corrupted frame is lost, either rejected by its checksum or skipped by a resync
+            assert live["frames"] == simulator.n_frames - simulator.n_corrupted_frames
+            assert live["invalid_frames"] > 0 and live["resyncs"] > 0
+            assert live["invalid_frames"] + live["resyncs"] <= simulator.n_corrupted_frames
+        else:
+            # the frames carry no checksum, a corrupted frame is accepted if its values are plausible
+            assert simulator.n_frames - simulator.n_corrupted_frames <= live["frames"]
+            assert live["frames"] + live["invalid_frames"] <= simulator.n_frames
+            assert live["invalid_frames"] > 0 and live["resyncs"] > 0
+            assert live["invalid_frames"] + live["resyncs"] <= simulator.n_corrupted_frames
+
+        quaternions, angular_velocities = history_samples(imu.history)
+        if protocol == "hiwonder" or corruption_rate == 0.0:
+            check_values(quaternions, angular_velocities, tolerance=2e-4 if protocol == "hiwonder" else 1e-6)
+        else:
+            np.testing.assert_allclose(np.linalg.norm(quaternions, axis=1), 1.0, atol=FloatImu.QUATERNION_NORM_TOLERANCE)
+            assert np.all(np.abs(angular_velocities) <= 2000.0)
+
+        # the counts and samples do not depend on how the stream was split into reads
+        for chunk_size in (None, 1, 7):
+            reparsed = reparse(protocol, record_path, chunk_size)
+            assert counts(reparsed) == live, f"{counts(reparsed)} != {live} in chunks of {chunk_size}"
+            for live_values, reparsed_values in zip(history_samples(imu.history), history_samples(reparsed.history)):
+                np.testing.assert_array_equal(live_values, reparsed_values)
+
+
+def check_history() -> None:
+    """
+    Check the history ring across wrap-arounds, with bulk and staged writes.
+    """
+    capacity = 8
+    history = ImuSampleHistory(capacity)
+    expected = ImuSampleHistory(64)
+    rng = np.random.default_rng(0)
+
+    timestamp = 0.0
+    for n_samples in (3, 5, 6, 11, 1, 2):
+        timestamps = timestamp + 0.005 * np.arange(1, n_samples + 1)
+        quaternions = rng.standard_normal((n_samples, 4)).astype(np.float32)
+        quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+        angular_velocities = rng.standard_normal((n_samples, 3)).astype(np.float32)
+        timestamp = timestamps[-1]
+
+        if n_samples % 2:
+            history.extend(timestamps, quaternions, angular_velocities)
+        else:
+            for i in range(n_samples):
+                history.stage(i, timestamps[i], quaternions[i].tolist(), angular_velocities[i].tolist())
+            history.publish(n_samples)
+        expected.extend(timestamps, quaternions, angular_velocities)
+
+        for values, expected_values in zip(history_samples(history), history_samples(expected)):
+            np.testing.assert_array_equal(values, expected_values[-capacity:])
+
+    # halfway between the two newest samples
+    quaternion = np.zeros(4, dtype=np.float32)
+    angular_velocity = np.zeros(3, dtype=np.float32)
+    assert history.sample_at(timestamp - 0.0025, quaternion, angular_velocity)
+    quaternions, angular_velocities = history_samples(history)
+    np.testing.assert_allclose(angular_velocity, 0.5 * (angular_velocities[-2] + angular_velocities[-1]), atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(quaternion), 1.0, atol=1e-6)
+    # times after the newest sample are clamped to it
+    assert history.sample_at(timestamp + 1.0, quaternion, angular_velocity)
+    np.testing.assert_array_equal(quaternion, quaternions[-1])
+
+
+def test_history() -> None:
+    check_history()
+
+
+def test_serial_imu() -> None:
+    check_driver("hiwonder", 0.0)
+    check_driver("hiwonder", 0.002)
+
+
+def test_float_imu() -> None:
+    check_driver("float", 0.0)
+    check_driver("float", 0.002)
+
+
+if __name__ == "__main__":
+    test_history()
+    test_serial_imu()
+    test_float_imu()
+    print("OK")